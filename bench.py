@@ -0,0 +1,601 @@
+"""
+Micro-benchmarks for Penguin Checkers.
+
+    python bench.py movegen [--positions N] [--repeat R]
+    python bench.py parallel [--workers N] [--depth D] [--time-ms T]
+    python bench.py perft [--depth D] [--divide NAME]
+    python bench.py evaluate [--batch 1 64 4096]
+    python bench.py ordering [--depth D] [--positions N]
+    python bench.py quiescence [--games N] [--time-ms T]
+    python bench.py render [--frames N]
+    python bench.py sprites [--sizes 40 110]
+    python bench.py idle [--seconds S]
+
+movegen compares per-piece move generation through the precomputed
+MOVE_TABLES (Position.targets) against the old style of walking a
+direction list with bounds and dark-square checks on every call.
+
+parallel runs the root-splitting ParallelSearch with 1..N worker
+processes and reports time to reach a fixed depth and nodes/second
+under a fixed time budget, against the single-process AlphaBetaSearch.
+
+perft counts the move tree of each checkers.perft position to depth D,
+checks the counts against the stored numbers and reports nodes/second;
+it exits non-zero on a mismatch.
+
+evaluate compares the per-position cost of the scalar evaluate() with
+the NumPy batch evaluator at several batch sizes (needs numpy).
+
+ordering searches a position set to a fixed depth with only the table
+move first and with full move ordering (captures, killers, history),
+reporting nodes, time and the share of cutoffs made by the first move.
+
+quiescence plays a self-play match at equal time per move between the
+search with capture quiescence and the same search without it.
+
+render draws the game screen of main.py frame after frame (SDL's dummy
+video driver unless SDL_VIDEODRIVER is set; needs pygame) for an idle
+board and for a piece being dragged, redrawing the whole window against
+the dirty-rectangle renderer, and reports time and CPU per frame and the
+share of one core that would cost at 60 frames/second. It then counts
+the pygame objects each screen allocates per frame once warmed up:
+SysFont() lookups, Font.render() text Surfaces and other Surfaces.
+
+sprites times the penguin sprite rescale a window resize does, per
+size over a sweep like a drag-resize: smoothscale from the full source
+PNGs, from the mip chain, an in-memory cache hit, and a load from the
+disk cache (in a temporary directory). It also times what a launch
+spends on sprites: decoding the sources and scaling, against loading
+the start size from the disk cache.
+
+idle runs main.py's loop on each screen with no input (dummy video
+driver, needs pygame) and reports the CPU it uses: the fixed 60 FPS
+loop that redraws every frame against the event-driven loop that
+sleeps in pygame.event.wait() and draws only what changed.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import checkers as game
+from checkers.parallel import ParallelSearch
+from checkers.perft import PERFT_POSITIONS, diagram_position, perft, divide
+from checkers import batch_eval
+from checkers.players import SearchPlayer
+from checkers.selfplay import run_match
+
+
+################################################
+# SAMPLE POSITIONS
+################################################
+
+def random_positions(count, seed=1):
+    """Positions reached by random legal play (forced captures respected)."""
+    rng = random.Random(seed)
+    positions = []
+    pos = game.Position.initial()
+    color = game.WHITE
+    while len(positions) < count:
+        jumpers = pos.jumpers(color)
+        pieces = jumpers or pos.movers(color)
+        if not pieces:
+            pos = game.Position.initial()
+            color = game.WHITE
+            continue
+        moves = [(sq, t) for sq in game.iter_squares(pieces)
+                 for t in pos.targets(sq, only_jumps=bool(jumpers))]
+        src, dst = rng.choice(moves)
+        pos.move(src, dst)
+        color = game.BLACK if color == game.WHITE else game.WHITE
+        positions.append(pos.copy())
+    return positions
+
+
+################################################
+# REFERENCE: DIRECTION WALK
+################################################
+
+def direction_walk_targets(pos, sq, only_jumps=False):
+    """The pre-table algorithm: build directions, bounds/parity check each step."""
+    sr, sc = game.square_coords(sq)
+    color = pos.color_at(sq)
+    if color is None:
+        return []
+
+    def at(r, c):
+        return pos.color_at(game.square_index(r, c))
+
+    if pos.is_king(sq):
+        directions = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
+    else:
+        d = -1 if color == game.WHITE else 1
+        directions = [(d, -1), (d, 1)]
+
+    moves = []
+    for dr, dc in directions:
+        r, c = sr + dr, sc + dc
+        if not only_jumps:
+            if 0 <= r < 8 and 0 <= c < 8 and (r + c) % 2 == 1 and at(r, c) is None:
+                moves.append(game.square_index(r, c))
+        jr, jc = sr + 2 * dr, sc + 2 * dc
+        if 0 <= jr < 8 and 0 <= jc < 8 and (jr + jc) % 2 == 1:
+            middle = at(r, c)
+            if middle is not None and middle != color and at(jr, jc) is None:
+                moves.append(game.square_index(jr, jc))
+    return moves
+
+
+################################################
+# BENCHMARKS
+################################################
+
+def time_per_call(fn, cases, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for pos, sq in cases:
+            fn(pos, sq)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(cases)
+
+
+def bench_movegen(args):
+    positions = random_positions(args.positions)
+    cases = [(pos, sq) for pos in positions
+             for sq in game.iter_squares(pos.white | pos.black)]
+
+    for pos, sq in cases:
+        assert sorted(pos.targets(sq)) == sorted(direction_walk_targets(pos, sq))
+
+    walk = time_per_call(direction_walk_targets, cases, args.repeat)
+    table = time_per_call(lambda pos, sq: pos.targets(sq), cases, args.repeat)
+
+    print(f"{len(cases)} piece move generations over {len(positions)} positions")
+    print(f"  direction walk : {walk * 1e9:8.0f} ns/call")
+    print(f"  move tables    : {table * 1e9:8.0f} ns/call")
+    print(f"  speedup        : {walk / table:8.2f}x")
+
+
+def search_positions(count, seed=7):
+    """The start position plus midgame positions with a real choice of moves."""
+    positions = [(game.Position.initial(), game.WHITE)]
+    for i, pos in enumerate(random_positions(count * 10, seed)[5::10]):
+        if len(positions) > count:
+            break
+        color = game.BLACK if i % 2 == 0 else game.WHITE
+        if len(game.generate_moves(pos, color)) > 1:
+            positions.append((pos, color))
+    return positions
+
+
+def run_searches(engine, positions, time_ms, max_depth):
+    nodes = depth = 0
+    start = time.perf_counter()
+    for pos, color in positions:
+        engine.new_game()
+        info = engine.search(pos, color, time_ms=time_ms, max_depth=max_depth)
+        nodes += info["nodes"]
+        depth += info["depth"]
+    return time.perf_counter() - start, nodes, depth / len(positions)
+
+
+def bench_parallel(args):
+    positions = search_positions(args.positions)
+    print(f"{len(positions)} positions, {os.cpu_count()} CPUs, "
+          f"depth {args.depth} / {args.time_ms} ms per search")
+    print(f"  {'engine':<12} {'to depth':>10} {'speedup':>8} {'nodes/s':>10} {'avg depth':>9}")
+
+    base = None
+    for workers in range(1, args.workers + 1):
+        if workers == 1:
+            name, engine = "1 process", game.AlphaBetaSearch(tt_mb=args.tt_mb)
+        else:
+            name = f"{workers} workers"
+            engine = ParallelSearch(workers, tt_mb=args.tt_mb)
+        to_depth, _, _ = run_searches(engine, positions, 10 ** 7, args.depth)
+        elapsed, nodes, avg_depth = run_searches(engine, positions, args.time_ms, None)
+        if hasattr(engine, "close"):
+            engine.close()
+
+        base = base or to_depth
+        print(f"  {name:<12} {to_depth:9.2f}s {base / to_depth:7.2f}x "
+              f"{nodes / elapsed:10.0f} {avg_depth:9.1f}")
+
+
+def bench_perft(args):
+    if args.divide:
+        rows, color, known = PERFT_POSITIONS[args.divide]
+        for move, nodes in divide(diagram_position(rows), color, args.depth):
+            path = "-".join(game.algebraic_square(*game.square_coords(sq)) for sq in move.path)
+            print(f"  {path:<24} {nodes:>12}")
+        return
+
+    print(f"  {'position':<18} {'depth':>5} {'nodes':>12} {'nodes/s':>10}  check")
+    failed = False
+    total_nodes = total_time = 0
+    for name, (rows, color, known) in PERFT_POSITIONS.items():
+        for depth in range(1, args.depth + 1):
+            position = diagram_position(rows)
+            start = time.perf_counter()
+            nodes = perft(position, color, depth)
+            elapsed = time.perf_counter() - start
+            total_nodes += nodes
+            total_time += elapsed
+
+            if depth > len(known):
+                check = "-"
+            elif nodes == known[depth - 1]:
+                check = "ok"
+            else:
+                check = f"MISMATCH (expected {known[depth - 1]})"
+                failed = True
+            print(f"  {name:<18} {depth:>5} {nodes:>12} {nodes / elapsed:>10.0f}  {check}")
+    print(f"  {'total':<18} {'':>5} {total_nodes:>12} {total_nodes / total_time:>10.0f}")
+    if failed:
+        sys.exit(1)
+
+
+def bench_evaluate(args):
+    if not batch_eval.HAVE_NUMPY:
+        sys.exit("bench.py evaluate needs numpy")
+    pool = random_positions(max(args.batch))
+    colors = [game.WHITE if i % 2 == 0 else game.BLACK for i in range(len(pool))]
+
+    print(f"  {'batch':>6} {'scalar':>12} {'batch':>12} {'encoded':>12} {'speedup':>8}")
+    for size in args.batch:
+        positions, sides = pool[:size], colors[:size]
+        masks = batch_eval.encode_positions(positions)
+        white_to_move = batch_eval.np.array([c == game.WHITE for c in sides])
+        assert list(batch_eval.evaluate_batch(positions, sides)) == \
+            [game.evaluate(p, c) for p, c in zip(positions, sides)]
+
+        rounds = max(1, args.positions // size)
+        scalar = batched = encoded = None
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            for _ in range(rounds):
+                for p, c in zip(positions, sides):
+                    game.evaluate(p, c)
+            t = (time.perf_counter() - start) / (rounds * size)
+            scalar = t if scalar is None else min(scalar, t)
+
+            start = time.perf_counter()
+            for _ in range(rounds):
+                batch_eval.evaluate_batch(positions, sides)
+            t = (time.perf_counter() - start) / (rounds * size)
+            batched = t if batched is None else min(batched, t)
+
+            start = time.perf_counter()
+            for _ in range(rounds):
+                batch_eval.evaluate_masks(masks, white_to_move)
+            t = (time.perf_counter() - start) / (rounds * size)
+            encoded = t if encoded is None else min(encoded, t)
+
+        print(f"  {size:>6} {scalar * 1e9:>9.0f} ns {batched * 1e9:>9.0f} ns "
+              f"{encoded * 1e9:>9.0f} ns {scalar / batched:>7.2f}x")
+    print("  (batch includes encoding the Positions; encoded starts from the mask array)")
+
+
+def bench_ordering(args):
+    positions = search_positions(args.positions)
+    print(f"{len(positions)} positions, depth {args.depth}")
+    print(f"  {'ordering':<10} {'nodes':>10} {'time':>8} {'cutoffs':>9} {'first move':>10}")
+    base = None
+    for name, ordering in (("tt only", False), ("full", True)):
+        nodes = cutoffs = first = 0
+        start = time.perf_counter()
+        for pos, color in positions:
+            engine = game.AlphaBetaSearch(tt_mb=args.tt_mb, ordering=ordering)
+            info = engine.search(pos, color, time_ms=10 ** 7, max_depth=args.depth)
+            nodes += info["nodes"]
+            cutoffs += info["ordering"]["cutoffs"]
+            first += info["ordering"]["first_move_cutoffs"]
+        elapsed = time.perf_counter() - start
+        base = base or nodes
+        print(f"  {name:<10} {nodes:>10} {elapsed:>7.2f}s {cutoffs:>9} "
+              f"{first / max(1, cutoffs):>9.1%}   ({nodes / base:.2f}x nodes)")
+
+
+def bench_quiescence(args):
+    with_q = SearchPlayer(time_ms=args.time_ms)
+    without = SearchPlayer(time_ms=args.time_ms, quiescence_nodes=0)
+    print(f"{args.games} games, {args.time_ms} ms per move, "
+          f"{args.random_plies} random opening plies")
+    _, summary = run_match(with_q, without, args.games, args.seed, args.max_plies,
+                           args.random_plies, names=("quiescence", "no quiescence"))
+    for name, s in summary["players"].items():
+        score = (s["wins"] + s["draws"] / 2) / summary["games"]
+        print(f"  {name:<14} {s['wins']:>3} won {s['losses']:>3} lost {s['draws']:>3} drawn"
+              f"   score {score:.1%}")
+    print(f"  {summary['seconds']:.0f}s, average {summary['average_plies']:.1f} plies")
+
+
+def bench_render(args):
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import main as ui
+
+    ui.start_menu_active = False
+    ui.reset_game()
+    piece = next(p for p in ui.board_state if p.player == ui.get_current_turn()
+                 and ui.get_valid_moves(p))
+    home = piece.location
+
+    def drag_to(i):
+        # a small loop around the square the piece started on
+        x, y = home
+        step = i % 20
+        piece.update_location((x + step * ui.TILE_SIZE // 10, y - step * ui.TILE_SIZE // 20))
+
+    print(f"  {ui.SCREEN_WIDTH}x{ui.SCREEN_HEIGHT}, {args.frames} frames each, "
+          f"{ui.pygame.display.get_driver()} driver")
+    print(f"  {'renderer':<8} {'scene':<6} {'frame':>9} {'cpu':>9} {'cpu@60fps':>10} {'pixels':>10}")
+    for name, dirty in (("full", False), ("dirty", True)):
+        ui.DIRTY_RENDERING = dirty
+        for scene in ("idle", "drag"):
+            dragging = scene == "drag"
+            ui.selected_piece = piece if dragging else None
+            ui.valid_moves = ui.get_valid_moves(piece) if dragging else []
+            ui.dragging = dragging
+            ui.invalidate_frame()
+            ui.draw_frame()
+            for key in ui.render_stats:
+                ui.render_stats[key] = 0
+
+            wall = time.perf_counter()
+            cpu = time.process_time()
+            for i in range(args.frames):
+                if dragging:
+                    drag_to(i)
+                ui.draw_frame()
+            wall = (time.perf_counter() - wall) / args.frames
+            cpu = (time.process_time() - cpu) / args.frames
+            piece.update_location(home)
+            pixels = ui.render_stats["pixels"] / args.frames
+            print(f"  {name:<8} {scene:<6} {wall * 1e3:>6.3f} ms {cpu * 1e3:>6.3f} ms "
+                  f"{min(1.0, cpu * 60):>9.1%} {pixels:>10.0f}")
+    ui.selected_piece = None
+    ui.dragging = False
+    render_allocations(ui, args.frames)
+
+
+class CountingFont:
+    """A Font that counts its render() calls."""
+
+    def __init__(self, font, counts):
+        self._font = font
+        self._counts = counts
+
+    def render(self, *args):
+        self._counts["renders"] += 1
+        return self._font.render(*args)
+
+    def __getattr__(self, name):
+        return getattr(self._font, name)
+
+
+def render_allocations(ui, frames):
+    pygame = ui.pygame
+    counts = {"fonts": 0, "renders": 0, "surfaces": 0}
+    sys_font, surface = pygame.font.SysFont, pygame.Surface
+
+    def counting_sys_font(*args):
+        counts["fonts"] += 1
+        return CountingFont(sys_font(*args), counts)
+
+    def counting_surface(*args, **kwargs):
+        counts["surfaces"] += 1
+        return surface(*args, **kwargs)
+
+    screens = {
+        "board": {},
+        "game over": {"game_over": True, "game_winner": "White"},
+        "settings": {"settings_menu_active": True},
+        "start menu": {"start_menu_active": True},
+        "login": {"login_active": True},
+        "replay list": {"replay_select_active": True},
+        "replay": {"replay_active": True},
+    }
+    flags = {name for state in screens.values() for name in state}
+    ui.nodes_per_second = ui.nodes_per_second or 40000     # the settings menu shows it
+    pygame.font.SysFont, pygame.Surface = counting_sys_font, counting_surface
+    try:
+        print(f"\n  allocations per frame, {frames} frames after one warm-up frame")
+        print(f"  {'screen':<12} {'SysFont':>8} {'render':>8} {'Surface':>8}")
+        for name, state in screens.items():
+            for flag in flags:
+                setattr(ui, flag, False)
+            for flag, value in state.items():
+                setattr(ui, flag, value)
+            ui.invalidate_frame()
+            ui.draw_frame()
+            for key in counts:
+                counts[key] = 0
+            for _ in range(frames):
+                ui.draw_frame()
+            print(f"  {name:<12} {counts['fonts'] / frames:>8.2f} "
+                  f"{counts['renders'] / frames:>8.2f} {counts['surfaces'] / frames:>8.2f}")
+    finally:
+        pygame.font.SysFont, pygame.Surface = sys_font, surface
+        for flag in flags:
+            setattr(ui, flag, False)
+
+
+def bench_sprites(args):
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import main as ui
+
+    if not ui.sprite_hashes:
+        sys.exit("bench.py sprites needs the penguin PNGs")
+    sizes = range(args.sizes[0], args.sizes[1] + 1)
+
+    def per_size(fn):
+        start = time.perf_counter()
+        for size in sizes:
+            fn(size)
+        return (time.perf_counter() - start) / len(sizes)
+
+    def from_source(size):
+        for name in ui.PENGUIN_FILES:
+            ui.pygame.transform.smoothscale(ui.get_sprite_mips(name)[0], (size, size))
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        ui.SPRITE_CACHE_DIR = None
+        ui.SPRITE_CACHE_SIZE = len(sizes)
+        ui.sprite_cache.clear()
+        for name in ui.PENGUIN_FILES:
+            ui.get_sprite_mips(name)
+        results = [("source", per_size(from_source)),
+                   ("mip chain", per_size(ui.get_penguin_sprites)),
+                   ("memory hit", per_size(ui.get_penguin_sprites))]
+        ui.SPRITE_CACHE_DIR = cache_dir
+        ui.save_sprite_cache()
+        ui.sprite_cache.clear()
+        results.append(("disk cache", per_size(ui.get_penguin_sprites)))
+        assert ui.sprite_stats["loaded"] == 4 * len(sizes)
+
+        # A launch: nothing decoded yet, the start size on disk or not
+        size = max(1, int(ui.TILE_SIZE * 0.9))
+        launch = []
+        for name, cache in (("cold launch", None), ("warm launch", cache_dir)):
+            ui.SPRITE_CACHE_DIR = cache
+            ui.sprite_mips.clear()
+            ui.sprite_cache.clear()
+            start = time.perf_counter()
+            ui.get_penguin_sprites(size)
+            launch.append((name, time.perf_counter() - start))
+
+    print(f"  four sprites per resize, sizes {sizes.start}-{sizes.stop - 1} px")
+    base = results[0][1]
+    for name, seconds in results:
+        print(f"  {name:<11} {seconds * 1e3:>8.3f} ms  {base / seconds:>8.1f}x")
+    print(f"  at launch, {size} px sprites")
+    for name, seconds in launch:
+        print(f"  {name:<11} {seconds * 1e3:>8.3f} ms")
+
+
+IDLE_SCREENS = {
+    "start menu": {"start_menu_active": True},
+    "login": {"login_active": True},
+    "replay list": {"replay_select_active": True},
+    "replay": {"replay_active": True},
+    "board": {},
+    "settings": {"settings_menu_active": True},
+    "game over": {"game_over": True, "game_winner": "White"},
+}
+
+
+def run_idle_loop(ui, seconds, event_driven):
+    """main.py's loop with no input for `seconds`: (CPU share, iterations, frames drawn)."""
+    frames = iterations = 0
+    changed = True
+    end = time.perf_counter() + seconds
+    wall, cpu = time.perf_counter(), time.process_time()
+    while time.perf_counter() < end:
+        iterations += 1
+        if ui.update_ai():
+            changed = True
+        if changed:
+            ui.draw_frame()
+            frames += 1
+        if event_driven:
+            events = ui.next_events(changed)
+            changed = any(ui.event_changes_frame(e) for e in events)
+        else:
+            ui.clock.tick(60)
+            ui.pygame.event.get()
+            changed = True
+    return (time.process_time() - cpu) / (time.perf_counter() - wall), iterations, frames
+
+
+def bench_idle(args):
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import main as ui
+
+    ui.nodes_per_second = ui.nodes_per_second or 40000     # the settings menu shows it
+    flags = {name for state in IDLE_SCREENS.values() for name in state}
+    print(f"  {args.seconds:g}s per screen, no input, {ui.pygame.display.get_driver()} driver")
+    print(f"  {'':<12} {'fixed 60 fps':>24}   {'event-driven':>24}")
+    print(f"  {'screen':<12} {'cpu':>6} {'loops':>8} {'frames':>8}   "
+          f"{'cpu':>6} {'loops':>8} {'frames':>8}")
+    for name, state in IDLE_SCREENS.items():
+        results = []
+        for event_driven in (False, True):
+            ui.reset_game()
+            for flag in flags:
+                setattr(ui, flag, False)
+            for flag, value in state.items():
+                setattr(ui, flag, value)
+            ui.invalidate_frame()
+            results.append(run_idle_loop(ui, args.seconds, event_driven))
+        print(f"  {name:<12} " + "   ".join(f"{cpu:>6.1%} {loops:>8} {frames:>8}"
+                                            for cpu, loops, frames in results))
+    for flag in flags:
+        setattr(ui, flag, False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Penguin Checkers benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("movegen", help="per-piece move generation")
+    p.add_argument("--positions", type=int, default=2000)
+    p.add_argument("--repeat", type=int, default=5)
+    p.set_defaults(func=bench_movegen)
+
+    p = sub.add_parser("parallel", help="process-pool search scaling")
+    p.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    p.add_argument("--positions", type=int, default=4)
+    p.add_argument("--depth", type=int, default=8)
+    p.add_argument("--time-ms", type=int, default=1000)
+    p.add_argument("--tt-mb", type=int, default=16)
+    p.set_defaults(func=bench_parallel)
+
+    p = sub.add_parser("perft", help="move generation correctness and nodes/second")
+    p.add_argument("--depth", type=int, default=7)
+    p.add_argument("--divide", choices=sorted(PERFT_POSITIONS),
+                   help="per-root-move counts for one position")
+    p.set_defaults(func=bench_perft)
+
+    p = sub.add_parser("evaluate", help="scalar vs NumPy batch evaluation")
+    p.add_argument("--batch", type=int, nargs="+", default=[1, 64, 4096])
+    p.add_argument("--positions", type=int, default=20000,
+                   help="positions evaluated per timing at each batch size")
+    p.add_argument("--repeat", type=int, default=3)
+    p.set_defaults(func=bench_evaluate)
+
+    p = sub.add_parser("ordering", help="nodes to a fixed depth with/without move ordering")
+    p.add_argument("--positions", type=int, default=8)
+    p.add_argument("--depth", type=int, default=7)
+    p.add_argument("--tt-mb", type=int, default=16)
+    p.set_defaults(func=bench_ordering)
+
+    p = sub.add_parser("quiescence", help="self-play match, quiescence on vs off")
+    p.add_argument("--games", type=int, default=40)
+    p.add_argument("--time-ms", type=int, default=50)
+    p.add_argument("--seed", type=int, default=1)
+    p.add_argument("--max-plies", type=int, default=150)
+    p.add_argument("--random-plies", type=int, default=4)
+    p.set_defaults(func=bench_quiescence)
+
+    p = sub.add_parser("render", help="full-window vs dirty-rectangle frames (needs pygame)")
+    p.add_argument("--frames", type=int, default=600)
+    p.set_defaults(func=bench_render)
+
+    p = sub.add_parser("sprites", help="penguin sprite rescaling on resize (needs pygame)")
+    p.add_argument("--sizes", type=int, nargs=2, default=[40, 110], metavar=("MIN", "MAX"))
+    p.set_defaults(func=bench_sprites)
+
+    p = sub.add_parser("idle", help="CPU per screen with no input, fixed vs event-driven loop")
+    p.add_argument("--seconds", type=float, default=3.0)
+    p.set_defaults(func=bench_idle)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+"""
+Headless rules core for Penguin Checkers.
+
+Everything here is pure Python with no pygame or database dependency,
+so it can be imported by workers, servers, tests and benchmarks
+without opening a window. main.py is the pygame front-end over it.
+"""
+from .bitboard import (
+    WHITE, BLACK, opponent,
+    Position, square_index, square_coords, iter_squares,
+    step_mask, jump_mask,
+    MOVE_TABLES, JUMP_OVER, WHITE_MAN, BLACK_MAN, KING,
+)
+from .rules import (
+    Move, generate_moves, piece_moves, legal_moves, legal_turns, winner, color_to_move,
+)
+from .evaluate import evaluate
+from .search import AlphaBetaSearch
+from .parallel import ParallelSearch
+from .ttable import TranspositionTable
+from .zobrist import hash_masks
+from .notation import algebraic_square, parse_square, format_move, parse_move_token
+from .replay import (
+    REPLAYS_FILE, load_replay_list, load_replay_game, append_game_record,
+    extract_move_token, parse_move_entry, apply_move_entry, replay_positions,
+    replay_turns, replay_hops,
+)
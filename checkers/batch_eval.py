@@ -0,0 +1,99 @@
+"""
+Vectorised static evaluation of many positions at once with NumPy.
+
+evaluate() is linear in the pieces, so it equals a dot product of the
+piece planes (one 0/1 entry per square) with the piece-square tables in
+evaluate.py. A batch is encoded as an (N, 3) array of the white, black
+and king masks, split into (N, 4, 32) planes of men and kings per side
+and scored with one matrix-vector product; the results are identical to
+evaluate().
+
+Alpha-beta evaluates one leaf at a time, so the search keeps the scalar
+evaluator; this is for scoring whole games, replay archives and other
+large position sets.
+
+NumPy is optional: HAVE_NUMPY is False without it, and the functions
+here raise ImportError when called.
+"""
+from .bitboard import WHITE, BLACK, Position
+from .evaluate import WHITE_MAN_WEIGHTS, BLACK_MAN_WEIGHTS, KING_WEIGHTS
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HAVE_NUMPY = np is not None
+
+_weights = None
+
+
+def _weight_vector():
+    """Piece-square weights for the four planes, Black's negated, as one vector."""
+    global _weights
+    if _weights is None:
+        _weights = np.concatenate([WHITE_MAN_WEIGHTS, KING_WEIGHTS,
+                                   np.negative(BLACK_MAN_WEIGHTS), np.negative(KING_WEIGHTS)])
+        _weights = _weights.astype(np.float32)
+    return _weights
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("batch evaluation needs numpy (pip install numpy)")
+
+
+def encode_positions(positions):
+    """(N, 3) uint32 array of the white, black and king masks."""
+    _require_numpy()
+    return np.array([(p.white, p.black, p.kings) for p in positions], dtype="<u4").reshape(-1, 3)
+
+
+def position_planes(masks):
+    """
+    (N, 4, 32) uint8 planes of white men, white kings, black men and
+    black kings, square 0 first, from encode_positions() masks.
+    """
+    _require_numpy()
+    masks = np.asarray(masks, dtype="<u4")
+    white, black, kings = masks[:, 0], masks[:, 1], masks[:, 2]
+    pieces = np.stack([white & ~kings, white & kings, black & ~kings, black & kings], axis=1)
+    bits = np.unpackbits(pieces.astype("<u4").view(np.uint8), bitorder="little")
+    return bits.reshape(len(masks), 4, 32)
+
+
+def evaluate_masks(masks, white_to_move):
+    """
+    Scores for encoded positions, each for its side to move;
+    `white_to_move` is a bool or an (N,) bool array.
+    """
+    planes = position_planes(masks).reshape(-1, 128)
+    # float32 matrix products are exact here: every score is a small integer
+    score = (planes @ _weight_vector()).astype(np.int32)
+    return np.where(white_to_move, score, -score)
+
+
+def evaluate_batch(positions, colors):
+    """
+    evaluate() for every position at once. `colors` is one colour for
+    all of them or one per position.
+    """
+    _require_numpy()
+    if colors in (WHITE, BLACK):
+        white_to_move = colors == WHITE
+    else:
+        white_to_move = np.array([c == WHITE for c in colors], dtype=bool)
+    return evaluate_masks(encode_positions(positions), white_to_move)
+
+
+def game_scores(turns, start=None):
+    """
+    White's evaluation of the start position and of the position after
+    each turn (Moves, e.g. from replay_turns), as one batch.
+    """
+    position = start.copy() if start else Position.initial()
+    positions = [position.copy()]
+    for move in turns:
+        position.play(move.path)
+        positions.append(position.copy())
+    return evaluate_batch(positions, WHITE)
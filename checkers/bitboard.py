@@ -0,0 +1,386 @@
+"""
+Bitboard position and move generation for Penguin Checkers.
+
+Pure logic: no pygame, no files, no database. main.py's sprites mirror
+a Position from this module.
+"""
+from .zobrist import ZOBRIST, hash_masks
+
+################################################
+# SIDES
+################################################
+# The two sides are identified by the RGB colors the front-end draws
+# them with, so rules code and UI code can pass the same values around.
+WHITE = (255, 255, 255)
+BLACK = (35, 35, 35)
+
+
+def opponent(color):
+    return BLACK if color == WHITE else WHITE
+
+################################################
+# BITBOARD POSITION
+################################################
+# Only the 32 dark squares are playable. They are numbered 0..31 row by
+# row from the top (Black's side): square = row * 4 + col // 2.
+# A position is three 32-bit masks (white men+kings, black men+kings,
+# kings) and moves are found by shifting whole masks at once.
+#
+# One step down is +4 from either row parity, plus +5 from even rows or
+# +3 from odd rows; one step up mirrors that. A jump is two steps in the
+# same direction, so it is always +/-7 or +/-9.
+
+FULL_MASK = 0xFFFFFFFF
+
+UP_LEFT, UP_RIGHT, DOWN_LEFT, DOWN_RIGHT = range(4)
+DIRECTION_DELTAS = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+REVERSE_DIRECTION = (DOWN_RIGHT, DOWN_LEFT, UP_RIGHT, UP_LEFT)
+WHITE_MAN_DIRECTIONS = (UP_LEFT, UP_RIGHT)
+BLACK_MAN_DIRECTIONS = (DOWN_LEFT, DOWN_RIGHT)
+ALL_DIRECTIONS = (UP_LEFT, UP_RIGHT, DOWN_LEFT, DOWN_RIGHT)
+
+WHITE_PROMOTION_MASK = 0x0000000F    # row 0
+BLACK_PROMOTION_MASK = 0xF0000000    # row 7
+
+
+def square_index(r, c):
+    """Convert a dark board square (row, col) to its bitboard index 0..31."""
+    return r * 4 + c // 2
+
+
+def square_coords(sq):
+    """Convert a bitboard index 0..31 back to (row, col)."""
+    r = sq // 4
+    return r, (sq % 4) * 2 + (1 if r % 2 == 0 else 0)
+
+
+def iter_squares(mask):
+    """Yield the square index of every set bit in `mask`, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+try:
+    popcount = int.bit_count          # Python 3.10+
+except AttributeError:
+    def popcount(mask):
+        return bin(mask).count("1")
+
+
+def _shift(mask, amount):
+    if amount > 0:
+        return (mask << amount) & FULL_MASK
+    return mask >> -amount
+
+
+def _build_shift_tables():
+    """
+    For each direction, build the (source mask, shift) pairs for a single
+    step (one pair per row parity) and the (source mask, shift) for a jump.
+    Source masks only contain squares whose target stays on the board.
+    """
+    steps = []
+    jumps = []
+    for dr, dc in DIRECTION_DELTAS:
+        by_shift = {}
+        jump_mask = 0
+        jump_shift = 0
+        for sq in range(32):
+            r, c = square_coords(sq)
+            if 0 <= r + dr < 8 and 0 <= c + dc < 8:
+                amount = square_index(r + dr, c + dc) - sq
+                by_shift[amount] = by_shift.get(amount, 0) | (1 << sq)
+            if 0 <= r + 2 * dr < 8 and 0 <= c + 2 * dc < 8:
+                jump_mask |= 1 << sq
+                jump_shift = square_index(r + 2 * dr, c + 2 * dc) - sq
+        steps.append(tuple((m, a) for a, m in sorted(by_shift.items())))
+        jumps.append((jump_mask, jump_shift))
+    return tuple(steps), tuple(jumps)
+
+
+STEP_SHIFTS, JUMP_SHIFTS = _build_shift_tables()
+
+
+def step_mask(mask, direction):
+    """Move every square in `mask` one diagonal step in `direction`."""
+    out = 0
+    for sources, amount in STEP_SHIFTS[direction]:
+        out |= _shift(mask & sources, amount)
+    return out
+
+
+def jump_mask(mask, direction):
+    """Move every square in `mask` two diagonal steps in `direction`."""
+    sources, amount = JUMP_SHIFTS[direction]
+    return _shift(mask & sources, amount)
+
+
+# Per-square move tables, built once at import so that generating the
+# moves of a single piece is a table walk with no arithmetic, bounds
+# checks or parity tests.
+#
+#   MOVE_TABLES[kind][sq] -> ((step_sq, step_bit, land_sq, land_bit), ...)
+#
+# one entry per direction the piece kind may move in. step_sq is the
+# neighbouring square (also the square jumped over); land_sq/land_bit are
+# -1/0 when a jump that way would leave the board.
+WHITE_MAN, BLACK_MAN, KING = range(3)
+PIECE_KIND_DIRECTIONS = (WHITE_MAN_DIRECTIONS, BLACK_MAN_DIRECTIONS, ALL_DIRECTIONS)
+
+
+def _build_move_tables():
+    per_direction = []
+    for dr, dc in DIRECTION_DELTAS:
+        entries = []
+        for sq in range(32):
+            r, c = square_coords(sq)
+            if not (0 <= r + dr < 8 and 0 <= c + dc < 8):
+                entries.append(None)
+                continue
+            step = square_index(r + dr, c + dc)
+            if 0 <= r + 2 * dr < 8 and 0 <= c + 2 * dc < 8:
+                land = square_index(r + 2 * dr, c + 2 * dc)
+                entries.append((step, 1 << step, land, 1 << land))
+            else:
+                entries.append((step, 1 << step, -1, 0))
+        per_direction.append(entries)
+
+    tables = []
+    for directions in PIECE_KIND_DIRECTIONS:
+        tables.append(tuple(
+            tuple(per_direction[d][sq] for d in directions if per_direction[d][sq])
+            for sq in range(32)
+        ))
+    return tuple(tables)
+
+
+MOVE_TABLES = _build_move_tables()
+
+# (from, to) of every on-board jump -> the square jumped over
+JUMP_OVER = {
+    (sq, land): step
+    for sq, entries in enumerate(MOVE_TABLES[KING])
+    for step, _, land, _ in entries if land >= 0
+}
+
+
+class Position:
+    """
+    Pure-logic checkers position. This is the source of truth for the
+    rules; the Checker sprites in board_state only mirror it for drawing.
+    """
+    __slots__ = ("white", "black", "kings", "hash")
+
+    def __init__(self, white=0, black=0, kings=0, hash=None):
+        self.white = white
+        self.black = black
+        self.kings = kings
+        # Zobrist key, kept up to date incrementally by move()
+        self.hash = hash_masks(white, black, kings) if hash is None else hash
+
+    @classmethod
+    def initial(cls):
+        """Standard opening: Black on rows 0-2, White on rows 5-7."""
+        return cls(white=0xFFF00000, black=0x00000FFF, kings=0)
+
+    def copy(self):
+        return Position(self.white, self.black, self.kings, self.hash)
+
+    def rehash(self):
+        """Recompute the Zobrist key after editing the masks directly."""
+        self.hash = hash_masks(self.white, self.black, self.kings)
+
+    def __eq__(self, other):
+        return (isinstance(other, Position)
+                and self.white == other.white
+                and self.black == other.black
+                and self.kings == other.kings)
+
+    def __repr__(self):
+        return f"Position(white={self.white:#010x}, black={self.black:#010x}, kings={self.kings:#010x})"
+
+    # ---- queries ----
+    def own_and_opponent(self, color):
+        if color == WHITE:
+            return self.white, self.black
+        return self.black, self.white
+
+    def empty(self):
+        return ~(self.white | self.black) & FULL_MASK
+
+    def color_at(self, sq):
+        """WHITE, BLACK, or None if the square is empty."""
+        bit = 1 << sq
+        if self.white & bit:
+            return WHITE
+        if self.black & bit:
+            return BLACK
+        return None
+
+    def is_king(self, sq):
+        return bool(self.kings & (1 << sq))
+
+    def count(self, color):
+        own, _ = self.own_and_opponent(color)
+        return popcount(own)
+
+    def _directions(self, color, pieces):
+        """Yield (direction, pieces that may move that way) for `color`."""
+        men_dirs = WHITE_MAN_DIRECTIONS if color == WHITE else BLACK_MAN_DIRECTIONS
+        kings = pieces & self.kings
+        for d in ALL_DIRECTIONS:
+            if d in men_dirs:
+                yield d, pieces
+            elif kings:
+                yield d, kings
+
+    def movers(self, color):
+        """Mask of `color` pieces that have at least one simple (non-jump) move."""
+        own, _ = self.own_and_opponent(color)
+        empty = self.empty()
+        result = 0
+        for d, pieces in self._directions(color, own):
+            result |= pieces & step_mask(empty, REVERSE_DIRECTION[d])
+        return result
+
+    def jumpers(self, color):
+        """Mask of `color` pieces that have at least one capture available."""
+        own, opp = self.own_and_opponent(color)
+        empty = self.empty()
+        result = 0
+        for d, pieces in self._directions(color, own):
+            back = REVERSE_DIRECTION[d]
+            result |= pieces & step_mask(opp, back) & jump_mask(empty, back)
+        return result
+
+    def has_moves(self, color):
+        return bool(self.jumpers(color) or self.movers(color))
+
+    def targets(self, sq, only_jumps=False):
+        """
+        Landing squares for the piece on `sq`: simple steps (unless
+        only_jumps) and single captures. Forced-capture rules are applied
+        by the caller, as get_valid_moves always has.
+        """
+        bit = 1 << sq
+        if self.white & bit:
+            kind, opp = WHITE_MAN, self.black
+        elif self.black & bit:
+            kind, opp = BLACK_MAN, self.white
+        else:
+            return []
+        if self.kings & bit:
+            kind = KING
+
+        occupied = self.white | self.black
+        moves = []
+        for step, step_bit, land, land_bit in MOVE_TABLES[kind][sq]:
+            if not step_bit & occupied:
+                if not only_jumps:
+                    moves.append(step)
+            elif step_bit & opp and land_bit and not land_bit & occupied:
+                moves.append(land)
+        return moves
+
+    # ---- updates ----
+    def move(self, src, dst):
+        """
+        Move the piece on `src` to `dst`, removing the captured piece for a
+        jump and promoting on the far row. Returns the captured square or None.
+        """
+        src_bit = 1 << src
+        dst_bit = 1 << dst
+        h = self.hash
+
+        captured = JUMP_OVER.get((src, dst))
+        if captured is not None:
+            cap = 1 << captured
+            h ^= ZOBRIST[(1 if self.black & cap else 0) | (2 if self.kings & cap else 0)][captured]
+            cap_bit = ~cap & FULL_MASK
+            self.white &= cap_bit
+            self.black &= cap_bit
+            self.kings &= cap_bit
+
+        kind = 0
+        if self.kings & src_bit:
+            self.kings ^= src_bit | dst_bit
+            kind = 2
+
+        if self.white & src_bit:
+            self.white ^= src_bit | dst_bit
+            if dst_bit & WHITE_PROMOTION_MASK:
+                self.kings |= dst_bit
+        else:
+            kind |= 1
+            self.black ^= src_bit | dst_bit
+            if dst_bit & BLACK_PROMOTION_MASK:
+                self.kings |= dst_bit
+
+        h ^= ZOBRIST[kind][src]
+        if self.kings & dst_bit:
+            kind |= 2
+        self.hash = h ^ ZOBRIST[kind][dst]
+
+        return captured
+
+    def play(self, path):
+        """Play a complete move given as the squares its piece visits."""
+        for i in range(len(path) - 1):
+            self.move(path[i], path[i + 1])
+
+    def make_path(self, path):
+        """make_move() every hop of `path`; returns the tokens for unmake_path()."""
+        return [self.make_move(path[i], path[i + 1]) for i in range(len(path) - 1)]
+
+    def unmake_path(self, path, tokens):
+        for i in range(len(tokens) - 1, -1, -1):
+            self.unmake_move(path[i], path[i + 1], tokens[i])
+
+    def make_move(self, src, dst):
+        """
+        In-place move for search: like move(), but returns an undo token
+            (captured square or None, captured kind, promoted, previous hash)
+        that unmake_move() uses to restore the position bit for bit.
+        Captured kind uses the Zobrist kind bits (1 = black, 2 = king).
+        """
+        prev_hash = self.hash
+        was_king = self.kings >> src & 1
+        captured = JUMP_OVER.get((src, dst))
+        cap_kind = 0
+        if captured is not None:
+            cap_kind = (self.black >> captured & 1) | (self.kings >> captured & 1) << 1
+        self.move(src, dst)
+        promoted = not was_king and self.kings >> dst & 1
+        return captured, cap_kind, promoted, prev_hash
+
+    def unmake_move(self, src, dst, token):
+        """Undo make_move(src, dst) given the token it returned."""
+        captured, cap_kind, promoted, prev_hash = token
+        src_bit = 1 << src
+        dst_bit = 1 << dst
+
+        if self.white & dst_bit:
+            self.white ^= src_bit | dst_bit
+        else:
+            self.black ^= src_bit | dst_bit
+        if self.kings & dst_bit:
+            self.kings ^= dst_bit if promoted else src_bit | dst_bit
+
+        if captured is not None:
+            cap = 1 << captured
+            if cap_kind & 1:
+                self.black |= cap
+            else:
+                self.white |= cap
+            if cap_kind & 2:
+                self.kings |= cap
+
+        self.hash = prev_hash
+
+
+def sq_of(bit):
+    """Square index of a single-bit mask."""
+    return bit.bit_length() - 1
+
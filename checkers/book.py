@@ -0,0 +1,221 @@
+"""
+Opening book compiled from finished games.
+
+Games from the replay archive (and optionally PDN collections) are
+replayed turn by turn for their first `max_plies` turns. Every position
+reached at a turn boundary is counted with the game's result, keyed by
+its search key (Zobrist hash + side to move).
+
+The book file is an open-addressing hash table of fixed-size records,
+so a probe is one hash, one or two record reads, and nothing is parsed
+at startup; OpeningBook memory-maps the file.
+
+    header   MAGIC, slot count (power of two), entry count, max plies
+    slot     key u64, white wins u32, black wins u32, draws u32
+
+Compile with:
+
+    python -m checkers.book [--replays replays.json] [--pdn FILE ...]
+                            [--out book.bin] [--plies 20]
+"""
+import argparse
+import mmap
+import re
+import struct
+
+from .bitboard import WHITE, opponent, Position
+from .replay import REPLAYS_FILE, load_replay_list, replay_turns
+from .rules import generate_moves
+from .search import search_key
+
+BOOK_FILE = "book.bin"
+MAGIC = b"PCBOOK01"
+HEADER = struct.Struct("<8sIII")
+SLOT = struct.Struct("<QIII")
+MAX_LOAD = 0.5           # slots are at least twice the number of entries
+
+RESULTS = {"White": 0, "Black": 1}   # anything else counts as a draw
+
+
+################################################
+# GAME SOURCES
+################################################
+
+def replay_games(path=REPLAYS_FILE):
+    """(Moves, winner) for every game in the replay archive, up to any illegal move."""
+    for record in load_replay_list(path):
+        if isinstance(record, dict):
+            yield replay_turns(record.get("moves", [])), record.get("winner")
+
+
+_PDN_NOISE = re.compile(r"\{[^}]*\}|\([^)]*\)|\[[^\]]*\]|\d+\.+")
+_PDN_RESULT = re.compile(r'\[Result\s+"([^"]*)"\]')
+
+
+def pdn_square(number):
+    """
+    Square index of PDN square `number` (1-32). PDN puts the side that
+    moves first on 1-12; here the first mover (White) starts at the
+    bottom, so the board is turned around.
+    """
+    return 32 - number
+
+
+def _matches(move, squares):
+    """Does a PDN token's square list (ends plus any listed landings) fit `move`?"""
+    if move.path[0] != squares[0] or move.path[-1] != squares[-1]:
+        return False
+    landings = iter(move.path[1:-1])
+    return all(sq in landings for sq in squares[1:-1])
+
+
+def pdn_games(text):
+    """
+    (Moves, winner) for every game in PDN text. The Result tag's first
+    number is the first mover's (White here). Captures may list only the
+    start and end squares; the jump path is worked out from the board.
+    """
+    for chunk in re.split(r"(?=\[Event\s)", text):
+        if not chunk.strip():
+            continue
+        result = _PDN_RESULT.search(chunk)
+        winner = None
+        if result:
+            winner = {"1-0": "White", "2-0": "White", "0-1": "Black", "0-2": "Black"}.get(result.group(1))
+
+        position = Position.initial()
+        color = WHITE
+        turns = []
+        for token in _PDN_NOISE.sub(" ", chunk).split():
+            squares = re.split(r"[-x]", token)
+            if len(squares) < 2 or not all(s.isdigit() and 1 <= int(s) <= 32 for s in squares):
+                continue
+            squares = [pdn_square(int(s)) for s in squares]
+            moves = [m for m in generate_moves(position, color) if _matches(m, squares)]
+            if not moves:
+                break
+            position.play(moves[0].path)
+            turns.append(moves[0])
+            color = opponent(color)
+        yield turns, winner
+
+
+################################################
+# COMPILING
+################################################
+
+def count_positions(games, max_plies=20):
+    """{search key: [white wins, black wins, draws]} over the first max_plies turns."""
+    counts = {}
+    for turns, winner in games:
+        result = RESULTS.get(winner, 2)
+        position = Position.initial()
+        color = WHITE
+        last = min(len(turns), max_plies)
+        for ply in range(last + 1):
+            stats = counts.setdefault(search_key(position, color), [0, 0, 0])
+            stats[result] += 1
+            if ply == last:
+                break
+            position.play(turns[ply].path)
+            color = opponent(color)
+    return counts
+
+
+def write_book(counts, path=BOOK_FILE, max_plies=20):
+    slots = 1
+    while slots * MAX_LOAD < max(1, len(counts)):
+        slots *= 2
+    table = bytearray(HEADER.size + slots * SLOT.size)
+    HEADER.pack_into(table, 0, MAGIC, slots, len(counts), max_plies)
+    for key, (white, black, draws) in counts.items():
+        i = key & (slots - 1)
+        while SLOT.unpack_from(table, HEADER.size + i * SLOT.size)[0]:
+            i = (i + 1) & (slots - 1)
+        SLOT.pack_into(table, HEADER.size + i * SLOT.size, key, white, black, draws)
+    with open(path, "wb") as f:
+        f.write(table)
+    return len(counts)
+
+
+def compile_book(games, path=BOOK_FILE, max_plies=20):
+    """Count and write a book; returns the number of positions."""
+    return write_book(count_positions(games, max_plies), path, max_plies)
+
+
+################################################
+# PROBING
+################################################
+
+class OpeningBook:
+    """Read-only, memory-mapped view of a compiled book file."""
+
+    def __init__(self, path=BOOK_FILE):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.slots, self.entries, self.max_plies = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not an opening book")
+
+    def close(self):
+        self._map.close()
+
+    def probe(self, position, color):
+        """(white wins, black wins, draws) for the position, or None."""
+        key = search_key(position, color)
+        mask = self.slots - 1
+        i = key & mask
+        while True:
+            slot_key, white, black, draws = SLOT.unpack_from(self._map, HEADER.size + i * SLOT.size)
+            if slot_key == key:
+                return white, black, draws
+            if not slot_key:
+                return None
+            i = (i + 1) & mask
+
+    def choose_move(self, position, color, min_games=1):
+        """
+        The book Move with the best score for `color` (wins plus half the
+        draws, per game), or None when the book has nothing to offer.
+        Captures are left to the search.
+        """
+        if position.jumpers(color):
+            return None
+        mine = 0 if color == WHITE else 1
+        best = None
+        for move in generate_moves(position, color):
+            child = position.copy()
+            child.play(move.path)
+            stats = self.probe(child, opponent(color))
+            if not stats:
+                continue
+            games = sum(stats)
+            if games < min_games:
+                continue
+            rank = ((stats[mine] + stats[2] / 2) / games, games)
+            if best is None or rank > best[0]:
+                best = (rank, move)
+        return best[1] if best else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile the opening book")
+    parser.add_argument("--replays", default=REPLAYS_FILE)
+    parser.add_argument("--pdn", nargs="*", default=[])
+    parser.add_argument("--out", default=BOOK_FILE)
+    parser.add_argument("--plies", type=int, default=20)
+    args = parser.parse_args()
+
+    def games():
+        yield from replay_games(args.replays)
+        for name in args.pdn:
+            with open(name, encoding="utf-8", errors="replace") as f:
+                yield from pdn_games(f.read())
+
+    n = compile_book(games(), args.out, args.plies)
+    print(f"{n} positions written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Static evaluation of a Position for the search AI.
+
+Scores are in centi-men from the point of view of the side to move:
+positive is good for `color`. Every term is a popcount over a
+precomputed square mask, so evaluation never loops over pieces.
+"""
+from .bitboard import WHITE, popcount
+
+MAN_VALUE = 100
+KING_VALUE = 150
+ADVANCE_VALUE = 3        # per row a man has advanced
+BACK_ROW_VALUE = 8       # men still guarding the home row
+CENTER_VALUE = 5         # any piece on the four central squares of rows 3-4
+
+ROW_MASKS = tuple(0xF << (4 * r) for r in range(8))
+WHITE_BACK_ROW = ROW_MASKS[7]
+BLACK_BACK_ROW = ROW_MASKS[0]
+CENTER_MASK = 0x00066000            # c5, e5, d4, f4
+
+
+def _side_score(men, kings, back_row, advance_rows):
+    score = MAN_VALUE * popcount(men) + KING_VALUE * popcount(kings)
+    score += BACK_ROW_VALUE * popcount(men & back_row)
+    score += CENTER_VALUE * popcount((men | kings) & CENTER_MASK)
+    for rows_advanced, mask in advance_rows:
+        if men & mask:
+            score += ADVANCE_VALUE * rows_advanced * popcount(men & mask)
+    return score
+
+
+# (rows advanced, row mask) for each side's men
+_WHITE_ADVANCE = tuple((7 - r, ROW_MASKS[r]) for r in range(1, 7))
+_BLACK_ADVANCE = tuple((r, ROW_MASKS[r]) for r in range(1, 7))
+
+
+def _square_weights(value, advance, back_row):
+    """What one piece on each square adds to its side's score."""
+    weights = []
+    for sq in range(32):
+        bit = 1 << sq
+        weight = value + (CENTER_VALUE if bit & CENTER_MASK else 0)
+        if bit & back_row:
+            weight += BACK_ROW_VALUE
+        for rows_advanced, mask in advance:
+            if bit & mask:
+                weight += ADVANCE_VALUE * rows_advanced
+        weights.append(weight)
+    return tuple(weights)
+
+
+# Every term is per piece, so the evaluation is also a dot product of
+# piece-square tables with the four piece planes (see batch_eval.py)
+WHITE_MAN_WEIGHTS = _square_weights(MAN_VALUE, _WHITE_ADVANCE, WHITE_BACK_ROW)
+BLACK_MAN_WEIGHTS = _square_weights(MAN_VALUE, _BLACK_ADVANCE, BLACK_BACK_ROW)
+KING_WEIGHTS = _square_weights(KING_VALUE, (), 0)
+
+
+def evaluate(position, color):
+    """Static score of `position` for `color` (the side to move)."""
+    kings = position.kings
+    white = _side_score(position.white & ~kings, position.white & kings,
+                        WHITE_BACK_ROW, _WHITE_ADVANCE)
+    black = _side_score(position.black & ~kings, position.black & kings,
+                        BLACK_BACK_ROW, _BLACK_ADVANCE)
+    return white - black if color == WHITE else black - white
@@ -0,0 +1,151 @@
+"""
+Difficulty ladder: levels 1-10 defined by a search node budget and
+evaluation noise rather than by time, so a level plays the same moves
+on a slow machine as on a fast one.
+
+Time still matters for how long a move takes. calibrate() measures this
+machine's search speed once and caches it in CALIBRATION_FILE;
+level_time_ms() turns a level's node budget into the expected thinking
+time, and a time limit of a few times that keeps a level inside
+TARGET_LATENCY_MS when the machine is slower than expected.
+
+    python -m checkers.ladder [--recalibrate]
+"""
+import argparse
+import json
+import platform
+import random
+import time
+
+from .bitboard import WHITE, opponent, Position
+from .rules import generate_moves
+from .search import AlphaBetaSearch
+
+CALIBRATION_FILE = "calibration.json"
+CALIBRATION_VERSION = 1      # bump when the engine's speed changes a lot
+CALIBRATION_MS = 600
+
+# level: (node budget, evaluation noise in centi-men)
+LEVELS = {
+    1: (30, 200),
+    2: (80, 120),
+    3: (200, 80),
+    4: (500, 50),
+    5: (1200, 30),
+    6: (3000, 20),
+    7: (7000, 12),
+    8: (15000, 6),
+    9: (35000, 2),
+    10: (80000, 0),
+}
+MIN_LEVEL, MAX_LEVEL = min(LEVELS), max(LEVELS)
+
+TARGET_LATENCY_MS = 3000     # never think longer than this, whatever the machine
+LATENCY_MARGIN = 3           # time limit = this many times the expected time
+
+
+################################################
+# CALIBRATION
+################################################
+
+def calibration_positions(count=4, seed=12345):
+    """Fixed opening positions with a choice of moves, reached by seeded random play."""
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        position = Position.initial()
+        color = WHITE
+        for _ in range(10 + 2 * len(positions)):
+            moves = generate_moves(position, color)
+            if not moves:
+                break
+            position.play(rng.choice(moves).path)
+            color = opponent(color)
+        else:
+            if len(generate_moves(position, color)) > 1:
+                positions.append((position, color))
+    return positions
+
+
+def measure_nodes_per_second(duration_ms=CALIBRATION_MS):
+    """Search nodes per second on this machine, over fixed positions."""
+    positions = calibration_positions()
+    per_position = duration_ms / len(positions)
+    nodes = 0
+    elapsed = 0.0
+    for position, color in positions:
+        engine = AlphaBetaSearch()          # table allocation is not search time
+        start = time.perf_counter()
+        info = engine.search(position, color, time_ms=per_position)
+        elapsed += time.perf_counter() - start
+        nodes += info["nodes"]
+    return nodes / elapsed if elapsed else 0.0
+
+
+def _machine():
+    return f"{platform.node()}/{platform.machine()}/{platform.python_version()}"
+
+
+def load_calibration(path=CALIBRATION_FILE):
+    """The cached nodes/second for this machine, or None."""
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (not isinstance(data, dict) or data.get("version") != CALIBRATION_VERSION
+            or data.get("machine") != _machine()):
+        return None
+    nps = data.get("nodes_per_second")
+    return nps if isinstance(nps, (int, float)) and nps > 0 else None
+
+
+def calibrate(path=CALIBRATION_FILE, force=False):
+    """Nodes/second from the cache, measuring (and caching) it if needed."""
+    nps = None if force else load_calibration(path)
+    if nps is None:
+        nps = measure_nodes_per_second()
+        try:
+            with open(path, "w") as f:
+                json.dump({"version": CALIBRATION_VERSION, "machine": _machine(),
+                           "nodes_per_second": round(nps)}, f)
+        except OSError:
+            pass            # unwritable directory: measure again next time
+    return nps
+
+
+################################################
+# LEVELS
+################################################
+
+def clamp_level(level):
+    return max(MIN_LEVEL, min(MAX_LEVEL, int(level)))
+
+
+def level_time_ms(level, nodes_per_second):
+    """Expected thinking time for a level on a machine of this speed."""
+    nodes, _ = LEVELS[clamp_level(level)]
+    return 1000.0 * nodes / max(1.0, nodes_per_second)
+
+
+def level_time_limit_ms(level, nodes_per_second):
+    """The time limit a level searches under: a safety net behind its node budget."""
+    return min(TARGET_LATENCY_MS,
+               max(50.0, LATENCY_MARGIN * level_time_ms(level, nodes_per_second)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibrate the difficulty ladder")
+    parser.add_argument("--recalibrate", action="store_true")
+    parser.add_argument("--file", default=CALIBRATION_FILE)
+    args = parser.parse_args()
+
+    nps = calibrate(args.file, force=args.recalibrate)
+    print(f"{nps:.0f} nodes/s")
+    for level, (nodes, noise) in LEVELS.items():
+        print(f"  level {level:>2}: {nodes:>6} nodes, noise {noise:>3}, "
+              f"~{level_time_ms(level, nps):.0f} ms/move")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""
+Algebraic move notation used by the move log and replays.
+
+Squares are written file + rank ("a1".."h8") with rank 8 at the top of
+the board (row 0). A move is source, "-" or "x", destination: "c3-d4"
+for a step and "c3xe5" for a capture.
+"""
+
+FILES = "abcdefgh"
+
+
+def algebraic_square(r, c):
+    """Convert board (row, col) to a square name like "c3"."""
+    return f"{FILES[c]}{8 - r}"
+
+
+def parse_square(text):
+    """Convert a square name like "c3" back to board (row, col)."""
+    return 8 - int(text[1]), FILES.index(text[0])
+
+
+def format_move(sr, sc, dr, dc, is_jump):
+    """Notation for a single step or jump, e.g. "c3-d4" / "c3xe5"."""
+    sep = "x" if is_jump else "-"
+    return f"{algebraic_square(sr, sc)}{sep}{algebraic_square(dr, dc)}"
+
+
+def parse_move_token(token):
+    """
+    Convert "c3-d4" / "c3xe5" to (sr, sc, dr, dc). Only the first and last
+    squares are read, so older tokens with extra text in between still work.
+    """
+    sr, sc = parse_square(token[:2])
+    dr, dc = parse_square(token[-2:])
+    return sr, sc, dr, dc
@@ -0,0 +1,163 @@
+"""
+Root-splitting parallel search over a pool of worker processes.
+
+Python threads cannot run a CPU-bound search in parallel, so the root
+moves are dealt out round-robin to N processes. Each worker keeps its own
+AlphaBetaSearch (and transposition table) for the life of the pool, runs
+iterative deepening on its share of the root and reports every completed
+iteration. The results are merged at the deepest depth all workers
+reached, so scores are only ever compared at equal depth.
+
+The pool is started once, in the constructor, and reused for every move;
+call close() when done with it.
+"""
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_EXCEPTION
+
+from .search import AlphaBetaSearch, MATE_THRESHOLD, moves_from
+from .tablebase import Tablebase
+
+_POLL_SECONDS = 0.01     # how often the caller's stop event is checked
+
+# Per-process state, set up by _init_worker
+_engine = None
+_stop = None
+_game_id = None
+
+
+def _init_worker(max_depth, tt_mb, stop, tablebase):
+    global _engine, _stop
+    _engine = AlphaBetaSearch(max_depth=max_depth, tt_mb=tt_mb,
+                              tablebase=Tablebase(tablebase) if tablebase else None)
+    _stop = stop
+
+
+def _ping():
+    return True
+
+
+def _search_share(game_id, position, color, time_ms, max_depth, chain_sq, moves, max_nodes):
+    global _game_id
+    if game_id != _game_id:
+        _engine.new_game()
+        _game_id = game_id
+    return _engine.search(position, color, time_ms, max_depth, chain_sq,
+                          stop=_stop, root_moves=moves, max_nodes=max_nodes)
+
+
+def merge_root_results(results):
+    """
+    Combine the info dicts of workers that searched disjoint root subsets.
+    Returns (move, score, depth): the best move at the deepest depth every
+    worker completed. A worker that stopped early on a forced result keeps
+    that result at every greater depth.
+    """
+    finished = [r["iterations"] for r in results if r["iterations"]]
+    if not finished:
+        return None, 0, 0
+    open_ended = [its[-1][0] for its in finished if abs(its[-1][1]) < MATE_THRESHOLD]
+    depth = min(open_ended) if open_ended else max(its[-1][0] for its in finished)
+
+    best = None
+    for its in finished:
+        at_depth = [it for it in its if it[0] <= depth]
+        if at_depth and (best is None or at_depth[-1][1] > best[1]):
+            best = at_depth[-1]
+    return best[2], best[1], depth
+
+
+class ParallelSearch:
+    """
+    Drop-in replacement for AlphaBetaSearch (same search() signature and
+    info dict) that spreads the root over `workers` processes.
+    `start_method` picks the multiprocessing start method (None = platform
+    default). `tablebase` is the path of a tablebase file for the workers
+    to map.
+    """
+
+    def __init__(self, workers=2, max_depth=64, tt_mb=16, start_method=None,
+                 tablebase=None):
+        self.workers = max(1, workers)
+        self.max_depth = max_depth
+        self._game_id = 0
+        ctx = multiprocessing.get_context(start_method)
+        self._stop = ctx.Event()
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=ctx,
+                                        initializer=_init_worker,
+                                        initargs=(max_depth, tt_mb, self._stop, tablebase))
+        # Start every worker now, on the caller's thread, rather than on
+        # the first move
+        for f in [self.pool.submit(_ping) for _ in range(self.workers)]:
+            f.result()
+
+    def new_game(self):
+        """Workers drop their tables before their next search."""
+        self._game_id += 1
+
+    def close(self):
+        self._stop.set()
+        self.pool.shutdown(wait=True)
+
+    def search(self, position, color, time_ms=1000, max_depth=None, chain_sq=None,
+               stop=None, max_nodes=None):
+        """max_nodes is shared out evenly between the workers."""
+        start = time.perf_counter()
+        moves = moves_from(position, color, chain_sq)
+
+        info = {
+            "move": moves[0] if moves else None,
+            "score": 0,
+            "depth": 0,
+            "nodes": 0,
+            "qnodes": 0,
+            "time_ms": 0.0,
+            "iterations": [],
+            "tt": None,
+            "ordering": None,
+            "workers": 0,
+        }
+        if len(moves) > 1:
+            shares = [moves[i::self.workers] for i in range(min(self.workers, len(moves)))]
+            self._stop.clear()
+            share_nodes = max(1, max_nodes // len(shares)) if max_nodes else None
+            futures = [self.pool.submit(_search_share, self._game_id, position, color,
+                                        time_ms, max_depth or self.max_depth, chain_sq, share,
+                                        share_nodes)
+                       for share in shares]
+            pending = futures
+            while pending:
+                _, pending = wait(pending, timeout=_POLL_SECONDS,
+                                  return_when=FIRST_EXCEPTION)
+                if stop is not None and stop.is_set():
+                    self._stop.set()
+            results = [f.result() for f in futures]
+
+            move, score, depth = merge_root_results(results)
+            if move is not None:
+                info["move"], info["score"], info["depth"] = move, score, depth
+            info["nodes"] = sum(r["nodes"] for r in results)
+            info["qnodes"] = sum(r["qnodes"] for r in results)
+            info["workers"] = len(results)
+            tts = [r["tt"] for r in results if r["tt"]]
+            if tts:
+                probes = sum(t["probes"] for t in tts)
+                hits = sum(t["hits"] for t in tts)
+                info["tt"] = {
+                    "size_mb": sum(t["size_mb"] for t in tts),
+                    "probes": probes,
+                    "hits": hits,
+                    "stores": sum(t["stores"] for t in tts),
+                    "hit_rate": hits / probes if probes else 0.0,
+                    "fill": sum(t["fill"] for t in tts) / len(tts),
+                }
+            cutoffs = sum(r["ordering"]["cutoffs"] for r in results)
+            first = sum(r["ordering"]["first_move_cutoffs"] for r in results)
+            info["ordering"] = {
+                "cutoffs": cutoffs,
+                "first_move_cutoffs": first,
+                "first_move_rate": first / cutoffs if cutoffs else 0.0,
+            }
+
+        info["time_ms"] = (time.perf_counter() - start) * 1000.0
+        return info
@@ -0,0 +1,128 @@
+"""
+Perft: count the leaf nodes of the full move tree to a fixed depth.
+
+A depth is one complete turn (a multi-jump is one move), as in the
+published checkers perft tables. The counts depend on nothing but move
+generation and make/unmake, so they are the regression test for any
+change there, and nodes/second is the headline move generator benchmark.
+
+PERFT_POSITIONS holds the start position, with the published numbers,
+and a few positions that stress the awkward rules: a forced capture, a
+king with branching and circular capture chains, crowning on a capture
+(which ends the turn) and kings for the side moving second. Their counts
+were checked against an independent array-based generator.
+
+    python bench.py perft [--depth 7] [--divide NAME]
+"""
+from .bitboard import WHITE, BLACK, opponent, Position, square_index
+from .rules import generate_moves
+
+# Rows top (row 0, where White crowns) to bottom; pieces on dark squares
+# only: w/b men, W/B kings, anything else empty.
+PERFT_POSITIONS = {
+    "start": (
+        [".b.b.b.b",
+         "b.b.b.b.",
+         ".b.b.b.b",
+         "........",
+         "........",
+         "w.w.w.w.",
+         ".w.w.w.w",
+         "w.w.w.w."],
+        WHITE,
+        [7, 49, 302, 1469, 7361, 36768, 179740, 845931, 3963680, 18391564],
+    ),
+    "forced capture": (
+        ["........",
+         "..b.b...",
+         ".b.b....",
+         "....b...",
+         "...w....",
+         "w.w...w.",
+         ".w......",
+         "........"],
+        WHITE,
+        [1, 4, 14, 44, 151, 491, 1860],
+    ),
+    "multi-jump": (
+        ["........",
+         "..b.b.b.",
+         "........",
+         "..b.b...",
+         "...W....",
+         "..b.b...",
+         "........",
+         "........"],
+        WHITE,
+        [6, 48, 144, 1183, 2774, 17883, 51670],
+    ),
+    "crowning capture": (
+        [".....b..",
+         "..b.b...",
+         ".w.....b",
+         "........",
+         "...b....",
+         "..w.....",
+         ".......b",
+         "........"],
+        WHITE,
+        [2, 2, 3, 8, 15, 52, 130],
+    ),
+    "kings": (
+        ["...B....",
+         "........",
+         "...b.b..",
+         "..w.....",
+         ".W......",
+         "........",
+         ".b.b....",
+         "w.w....."],
+        BLACK,
+        [6, 21, 123, 281, 1451, 6045, 35052],
+    ),
+}
+
+
+def diagram_position(rows):
+    """Position from eight rows of text as in PERFT_POSITIONS."""
+    white = black = kings = 0
+    for r, row in enumerate(rows):
+        for c, ch in enumerate(row):
+            if ch not in "wWbB":
+                continue
+            if (r + c) % 2 == 0:
+                raise ValueError(f"piece on a light square at row {r}, col {c}")
+            bit = 1 << square_index(r, c)
+            if ch in "wW":
+                white |= bit
+            else:
+                black |= bit
+            if ch.isupper():
+                kings |= bit
+    return Position(white, black, kings)
+
+
+def perft(position, color, depth):
+    """Leaf nodes `depth` turns below `position` (leaves are counted, not visited)."""
+    if depth == 0:
+        return 1
+    moves = generate_moves(position, color)
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    other = opponent(color)
+    for move in moves:
+        tokens = position.make_path(move.path)
+        nodes += perft(position, other, depth - 1)
+        position.unmake_path(move.path, tokens)
+    return nodes
+
+
+def divide(position, color, depth):
+    """[(Move, perft below it)] for each root move, to find where two generators differ."""
+    result = []
+    for move in generate_moves(position, color):
+        tokens = position.make_path(move.path)
+        result.append((move, perft(position, opponent(color), depth - 1)))
+        position.unmake_path(move.path, tokens)
+    return result
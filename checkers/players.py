@@ -0,0 +1,138 @@
+"""
+Headless AI players: each chooses a complete Move for a position.
+
+    choose(position, color, ply=0)  -> Move or None
+    new_game(seed=None)             -> reset per-game state / random seed
+
+Searching players' choose() also takes a `stop` event.
+
+PLAYERS maps the names used on the command line to player classes; a
+new engine only needs to be added there. make_player() builds one from a
+spec such as "expert:time_ms=200,max_depth=6" or "level:level=7".
+"""
+import random
+
+from .bitboard import BLACK, square_coords
+from .ladder import LEVELS, TARGET_LATENCY_MS, clamp_level
+from .rules import generate_moves
+from .search import AlphaBetaSearch, QUIESCENCE_NODES
+
+
+class RandomPlayer:
+    """Any legal move (the game's EASY level)."""
+
+    name = "easy"
+
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)
+
+    def new_game(self, seed=None):
+        if seed is not None:
+            self.rng.seed(seed)
+
+    def choose(self, position, color, ply=0):
+        moves = generate_moves(position, color)
+        return self.rng.choice(moves) if moves else None
+
+
+class GreedyPlayer(RandomPlayer):
+    """
+    One-move heuristic (the game's HARD level): captures, advancing,
+    crowning and the centre, with a little noise so it varies.
+    """
+
+    name = "hard"
+
+    def score(self, position, color, move):
+        sr, sc = square_coords(move.src)
+        r, c = square_coords(move.dst)
+        king = position.is_king(move.src)
+
+        score = 10 * bin(move.captured).count("1")
+        score += (r - sr) if color == BLACK else (sr - r)
+        if not king and r == (7 if color == BLACK else 0):
+            score += 50
+        if 2 <= r <= 5 and 2 <= c <= 5:
+            score += 3
+        if king:
+            score += 5
+        return score + self.rng.uniform(0, 1)
+
+    def choose(self, position, color, ply=0):
+        moves = generate_moves(position, color)
+        if not moves:
+            return None
+        return max(moves, key=lambda move: self.score(position, color, move))
+
+
+class SearchPlayer:
+    """Alpha-beta search (the game's EXPERT level)."""
+
+    name = "expert"
+
+    def __init__(self, seed=None, time_ms=1000, max_depth=None, tt_mb=16, tablebase=None,
+                 ordering=True, quiescence_nodes=QUIESCENCE_NODES):
+        self.time_ms = time_ms
+        self.max_depth = max_depth
+        self.engine = AlphaBetaSearch(tt_mb=tt_mb, tablebase=tablebase, ordering=bool(ordering),
+                                      quiescence_nodes=quiescence_nodes)
+        self.last_info = None
+
+    def new_game(self, seed=None):
+        self.engine.new_game()
+
+    def choose(self, position, color, ply=0, stop=None):
+        self.last_info = self.engine.search(position, color, self.time_ms, self.max_depth,
+                                            stop=stop)
+        return self.last_info["move"]
+
+
+class LadderPlayer(SearchPlayer):
+    """
+    A difficulty-ladder level (see ladder.py): search limited by the
+    level's node budget, with its evaluation noise. `time_ms` is only a
+    safety net; the node budget normally ends the search first.
+    """
+
+    name = "level"
+
+    def __init__(self, seed=None, level=5, time_ms=TARGET_LATENCY_MS, tt_mb=4):
+        self.level = clamp_level(level)
+        self.max_nodes, noise = LEVELS[self.level]
+        self.time_ms = time_ms
+        self.max_depth = None
+        self.engine = AlphaBetaSearch(tt_mb=tt_mb, eval_noise=noise)
+        self.rng = random.Random(seed)
+        self.last_info = None
+
+    def new_game(self, seed=None):
+        if seed is not None:
+            self.rng.seed(seed)
+        self.engine.new_game()
+        self.engine.noise_seed = self.rng.getrandbits(64)
+
+    def choose(self, position, color, ply=0, stop=None):
+        self.last_info = self.engine.search(position, color, self.time_ms, stop=stop,
+                                            max_nodes=self.max_nodes)
+        return self.last_info["move"]
+
+
+PLAYERS = {cls.name: cls for cls in (RandomPlayer, GreedyPlayer, SearchPlayer, LadderPlayer)}
+
+
+def make_player(spec, seed=None):
+    """
+    Build a player from "name" or "name:key=value,...". Values are read
+    as ints where possible.
+    """
+    name, _, options = spec.partition(":")
+    if name not in PLAYERS:
+        raise ValueError(f"unknown player {name!r} (choose from {', '.join(PLAYERS)})")
+    kwargs = {}
+    for option in filter(None, options.split(",")):
+        key, _, value = option.partition("=")
+        try:
+            kwargs[key] = int(value)
+        except ValueError:
+            kwargs[key] = value
+    return PLAYERS[name](seed=seed, **kwargs)
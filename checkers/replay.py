@@ -0,0 +1,194 @@
+"""
+Replay archive (replays.json) reading/writing and headless playback.
+"""
+import json
+import os
+
+from .bitboard import WHITE, opponent, Position, square_index
+from .notation import algebraic_square, parse_move_token
+from .rules import generate_moves
+
+REPLAYS_FILE = "replays.json"
+
+
+################################################
+# ARCHIVE
+################################################
+
+def load_replay_list(path=REPLAYS_FILE):
+    # Ensure file exists
+    if not os.path.exists(path):
+        with open(path, "w") as f:
+            json.dump({"games": []}, f)
+
+    with open(path, "r") as f:
+        data = json.load(f)
+
+    # Support both:
+    #  - {"games": [ ... ]}
+    #  - [ ... ]   (old style)
+    if isinstance(data, list):
+        games = data
+    else:
+        games = data.get("games", [])
+
+    return games
+
+
+def load_replay_game(index, path=REPLAYS_FILE):
+    games = load_replay_list(path)
+    if 0 <= index < len(games):
+        return games[index]
+    return None
+
+
+def append_game_record(record, path=REPLAYS_FILE):
+    """Append one finished game record to the archive."""
+    append_game_records([record], path)
+
+
+def append_game_records(records, path=REPLAYS_FILE):
+    """Append finished game records to the archive in one read/write."""
+    # --- Make sure file exists and is valid JSON ---
+    if not os.path.exists(path):
+        with open(path, "w") as f:
+            json.dump({"games": []}, f)
+
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+    except Exception:
+        data = {"games": []}
+
+    if isinstance(data, list):
+        data = {"games": data}
+    if "games" not in data:
+        data["games"] = []
+
+    data["games"].extend(records)
+
+    with open(path, "w") as f:
+        json.dump(data, f, indent=4)
+
+
+################################################
+# MOVE ENTRIES
+################################################
+
+def extract_move_token(move_entry):
+    """
+    Accepts multiple historical formats and returns a move token like 'c3-d4' or 'e5xf4'.
+
+    Supported:
+      - "c3-d4" (string)
+      - {"move": "c3-d4", ...}
+      - {"start": [sr, sc], "end": [dr, dc]}
+    """
+    # Already a string like "c3-d4" or "e5xf4"
+    if isinstance(move_entry, str):
+        return move_entry
+
+    if isinstance(move_entry, dict):
+        # New format with 'move'
+        if "move" in move_entry:
+            return move_entry["move"]
+
+        # Old coordinate format
+        if "start" in move_entry and "end" in move_entry:
+            sr, sc = move_entry["start"]
+            dr, dc = move_entry["end"]
+            return f"{algebraic_square(sr, sc)}-{algebraic_square(dr, dc)}"
+
+    # Unknown format
+    return None
+
+
+def parse_move_entry(move_entry):
+    """(sr, sc, dr, dc) for any supported move entry, or None if unreadable."""
+    token = extract_move_token(move_entry)
+    if not token:
+        return None
+    try:
+        return parse_move_token(token)
+    except (ValueError, IndexError):
+        return None
+
+
+################################################
+# HEADLESS PLAYBACK
+################################################
+
+def apply_move_entry(position, move_entry):
+    """
+    Apply one recorded move to `position` in place. Returns False (and
+    leaves the position alone) if the entry is unreadable or its source
+    square is empty, which is how the UI replay skips bad entries.
+    """
+    coords = parse_move_entry(move_entry)
+    if coords is None:
+        return False
+    sr, sc, dr, dc = coords
+    src = square_index(sr, sc)
+    if position.color_at(src) is None:
+        return False
+    position.move(src, square_index(dr, dc))
+    return True
+
+
+def replay_turns(moves, crowning_ends_turn=True):
+    """
+    Validate a recorded game against the rules. Recorded hops are matched
+    against the legal Moves, a multi-jump being one hop per entry; returns
+    the complete Moves played before the first unreadable or illegal hop
+    (or a turn left unfinished at the end). crowning_ends_turn=False
+    checks games recorded when a man crowned mid-capture jumped on.
+    """
+    position = Position.initial()
+    color = WHITE
+    turns = []
+    candidates = None          # legal Moves still matching the current turn
+    hop = 0
+    for entry in moves:
+        coords = parse_move_entry(entry)
+        if coords is None:
+            break
+        sr, sc, dr, dc = coords
+        src, dst = square_index(sr, sc), square_index(dr, dc)
+
+        if candidates is None:
+            candidates = generate_moves(position, color, crowning_ends_turn)
+            hop = 0
+        candidates = [m for m in candidates
+                      if len(m.path) > hop + 1 and m.path[hop] == src and m.path[hop + 1] == dst]
+        if not candidates:
+            break
+        hop += 1
+        finished = [m for m in candidates if len(m.path) == hop + 1]
+        if finished:
+            turns.append(finished[0])
+            position.play(finished[0].path)
+            color = opponent(color)
+            candidates = None
+    return turns
+
+
+def replay_hops(moves):
+    """
+    How many recorded entries of a game replay legally: under the current
+    rules, or under the old crowning rule if that accepts more of it.
+    """
+    hops = 0
+    for crowning_ends_turn in (True, False):
+        turns = replay_turns(moves, crowning_ends_turn)
+        hops = max(hops, sum(len(move.path) - 1 for move in turns))
+        if hops == len(moves):
+            break
+    return hops
+
+
+def replay_positions(moves, start=None):
+    """Yield the position after each recorded move, starting from `start`."""
+    position = start.copy() if start else Position.initial()
+    for entry in moves:
+        apply_move_entry(position, entry)
+        yield position.copy()
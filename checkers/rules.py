@@ -0,0 +1,151 @@
+"""
+Game rules on top of the bitboard Position: forced captures, legal move
+lists and game-over detection, all in square indices 0..31.
+
+A capture continues with the same piece for as long as it can capture,
+except that a man reaching the far row is crowned and its turn ends.
+generate_moves() returns each complete turn as one Move. Games recorded
+before that rule let the new king jump on; crowning_ends_turn=False
+generates their moves for replay.
+"""
+from collections import namedtuple
+
+from .bitboard import (
+    WHITE, BLACK, iter_squares,
+    MOVE_TABLES, WHITE_MAN, BLACK_MAN, KING,
+    WHITE_PROMOTION_MASK, BLACK_PROMOTION_MASK,
+)
+
+
+class Move(namedtuple("Move", ["path", "captured"])):
+    """
+    One complete turn: `path` is the tuple of squares the piece visits
+    (source first, destination last) and `captured` the mask of the
+    pieces it takes (0 for a simple step).
+    """
+    __slots__ = ()
+
+    @property
+    def src(self):
+        return self.path[0]
+
+    @property
+    def dst(self):
+        return self.path[-1]
+
+    def hops(self):
+        """The move as [(src, dst), ...] single steps/jumps."""
+        return list(zip(self.path, self.path[1:]))
+
+
+def piece_moves(position, sq, only_jumps=False, crowning_ends_turn=True, distinct=True):
+    """
+    Complete moves for the piece on `sq`: every capture chain and, unless
+    only_jumps, its simple steps. Two chains with the same end square and
+    captured set are the same move; only the first route is kept unless
+    distinct=False, which the UI uses to offer the first hop of each. The
+    forced-capture rule across pieces is left to the caller, as with
+    Position.targets.
+    """
+    bit = 1 << sq
+    if position.white & bit:
+        kind, opp, promotion = WHITE_MAN, position.black, WHITE_PROMOTION_MASK
+    elif position.black & bit:
+        kind, opp, promotion = BLACK_MAN, position.white, BLACK_PROMOTION_MASK
+    else:
+        return []
+    if position.kings & bit:
+        kind, promotion = KING, 0
+
+    # The moving piece has left its square, so a king may pass back over it
+    occupied = (position.white | position.black) & ~bit
+    moves = []
+    _chains(MOVE_TABLES[kind], promotion, opp, occupied, (sq,), 0, moves,
+            set() if distinct else None, crowning_ends_turn)
+    if not only_jumps:
+        for step, step_bit, _, _ in MOVE_TABLES[kind][sq]:
+            if not step_bit & occupied:
+                moves.append(Move((sq, step), 0))
+    return moves
+
+
+def _chains(table, promotion, opp, occupied, path, captured, moves, seen, crowning_ends_turn):
+    extended = False
+    for step, step_bit, land, land_bit in table[path[-1]]:
+        # Captured pieces come off the board as they are jumped
+        if step_bit & opp & ~captured and land_bit and not land_bit & (occupied & ~captured):
+            extended = True
+            if land_bit & promotion and crowning_ends_turn:
+                _add_chain(path + (land,), captured | step_bit, moves, seen)
+            elif land_bit & promotion:
+                # Old rule: the new king carries on jumping
+                _chains(MOVE_TABLES[KING], 0, opp, occupied, path + (land,),
+                        captured | step_bit, moves, seen, crowning_ends_turn)
+            else:
+                _chains(table, promotion, opp, occupied, path + (land,),
+                        captured | step_bit, moves, seen, crowning_ends_turn)
+    if not extended and len(path) > 1:
+        _add_chain(path, captured, moves, seen)
+
+
+def _add_chain(path, captured, moves, seen):
+    if seen is None:
+        moves.append(Move(path, captured))
+        return
+    key = (path[-1], captured)
+    if key not in seen:
+        seen.add(key)
+        moves.append(Move(path, captured))
+
+
+def generate_moves(position, color, crowning_ends_turn=True):
+    """Every complete legal Move for `color`; captures only if any exist."""
+    jumpers = position.jumpers(color)
+    if jumpers:
+        return [move for sq in iter_squares(jumpers)
+                for move in piece_moves(position, sq, only_jumps=True,
+                                        crowning_ends_turn=crowning_ends_turn)]
+    return [move for sq in iter_squares(position.movers(color))
+            for move in piece_moves(position, sq)]
+
+
+def legal_moves(position, color):
+    """
+    All (src, dst) single steps/jumps `color` may play. If any capture is
+    available only captures are returned (forced-jump rule).
+    """
+    jumpers = position.jumpers(color)
+    pieces = jumpers or position.movers(color)
+    only_jumps = bool(jumpers)
+    return [(sq, dst)
+            for sq in iter_squares(pieces)
+            for dst in position.targets(sq, only_jumps)]
+
+
+def legal_turns(position, color):
+    """Every complete legal Move for `color` with the position it leads to."""
+    turns = []
+    for move in generate_moves(position, color):
+        child = position.copy()
+        child.play(move.path)
+        turns.append((move, child))
+    return turns
+
+
+def winner(position, color_to_move):
+    """
+    "White" / "Black" if the game is over with `color_to_move` on move
+    (no pieces left or no legal move), else None.
+    """
+    if not position.white:
+        return "Black"
+    if not position.black:
+        return "White"
+    if not position.has_moves(color_to_move):
+        return "White" if color_to_move == BLACK else "Black"
+    return None
+
+
+def color_to_move(turn):
+    """White moves on even turns, Black on odd ones."""
+    return WHITE if turn % 2 == 0 else BLACK
@@ -0,0 +1,404 @@
+"""
+Negamax alpha-beta search with iterative deepening under a time budget.
+
+Every node is a whole turn: a multi-jump is one Move from
+generate_moves(), so the tree never stops half way through a chain.
+A search may still start mid-chain (chain_sq) when the UI has already
+played part of a multi-jump; its root moves are then the rest of the
+chain.
+
+Results are cached in a TranspositionTable keyed by the position's
+Zobrist hash plus side to move; the stored move is its move_key(). The
+table belongs to the search object, so one AlphaBetaSearch kept for a
+whole game reuses the analysis from its previous moves.
+
+Moves are tried in order: the table's move, then captures by the
+number of pieces taken, then the two killer moves of the ply (quiet
+moves that last caused a cutoff at that distance from the root), then
+quiet moves by their history score (how much cutoff work each
+(src, dst) has done). The killers and history are kept for the life of
+the search object, the history halved at each new search.
+
+At depth 0 the search does not stop in the middle of an exchange: while
+the side to move must capture, the captures are searched (quiescence)
+and only a quiet position is evaluated. Captures are forced, so there
+is no standing pat; a cap on quiescence nodes per leaf keeps a long
+exchange from running away, after which the position is evaluated as is.
+
+With a Tablebase, any position it covers is scored exactly from the
+table instead of being searched.
+"""
+import time
+
+from .bitboard import BLACK, opponent, popcount
+from .evaluate import evaluate
+from .tablebase import WIN, LOSS
+from .rules import generate_moves, piece_moves
+from .ttable import TranspositionTable, EXACT, LOWER, UPPER
+from .zobrist import SIDE_KEY, CHAIN_KEYS
+
+WIN_SCORE = 100000
+INFINITY = 10 ** 9
+MATE_THRESHOLD = WIN_SCORE - 1000     # scores beyond this are forced wins/losses
+
+# Move ordering ranks (higher first); history scores stay far below KILLER_RANK
+TT_MOVE_RANK = 1 << 60
+CAPTURE_RANK = 1 << 50        # per piece captured
+KILLER_RANK = 1 << 40
+HISTORY_LIMIT = 1 << 30       # history is halved when a score reaches this
+MAX_PLY = 128
+QUIESCENCE_NODES = 256        # capture-search nodes allowed below each leaf
+
+
+class SearchTimeout(Exception):
+    """Raised inside the tree when the time budget runs out."""
+
+
+def search_key(position, color, chain_sq=None):
+    """Transposition key: position hash + side to move + pending multi-jump."""
+    key = position.hash
+    if color == BLACK:
+        key ^= SIDE_KEY
+    if chain_sq is not None:
+        key ^= CHAIN_KEYS[chain_sq]
+    return key
+
+
+def _score_to_tt(score, ply):
+    """Store win/loss scores relative to the node, not the root."""
+    if score >= MATE_THRESHOLD:
+        return score + ply
+    if score <= -MATE_THRESHOLD:
+        return score - ply
+    return score
+
+
+def _score_from_tt(score, ply):
+    if score >= MATE_THRESHOLD:
+        return score - ply
+    if score <= -MATE_THRESHOLD:
+        return score + ply
+    return score
+
+
+def moves_from(position, color, chain_sq=None):
+    """Legal Moves, or the rest of a multi-jump already under way on chain_sq."""
+    if chain_sq is not None:
+        return piece_moves(position, chain_sq, only_jumps=True)
+    return generate_moves(position, color)
+
+
+def move_key(move):
+    """
+    (src, dst, capture tag): what a table entry keeps for a Move. Two king
+    chains can share src and dst and differ only in what they capture,
+    so the captured mask, folded to 16 bits, tells them apart.
+    """
+    captured = move.captured
+    return move.path[0], move.path[-1], (captured ^ captured >> 16) & 0xFFFF
+
+
+def _tt_move_first(moves, tt_move):
+    """Move the Move matching a table entry's move_key() to the front."""
+    for i, move in enumerate(moves):
+        if move_key(move) == tt_move:
+            if i:
+                moves.insert(0, moves.pop(i))
+            return
+
+
+class AlphaBetaSearch:
+    """
+    Iterative-deepening negamax. search() returns an info dict:
+        {"move": Move or None, "score", "depth", "nodes", "qnodes",
+         "time_ms", "iterations", "tt", "ordering"}
+    where the move is the best one from the deepest completed iteration,
+    "iterations" lists (depth, score, move) for every completed iteration,
+    "tt" is the transposition table's stats() for this search and
+    "ordering" counts beta cutoffs and how many came from the first move
+    tried, and "qnodes" is how many of the nodes were quiescence nodes.
+    tt_mb=0 disables the table and ordering=False the killer, history and
+    capture ordering (the table move still goes first).
+    quiescence_nodes=0 turns quiescence off. `tablebase` is an optional
+    Tablebase.
+
+    eval_noise adds a pseudo-random amount in [-eval_noise, eval_noise]
+    to every evaluation (for weaker play). It is a function of the
+    position and noise_seed, so transpositions stay consistent; change
+    noise_seed between games for different mistakes.
+    """
+
+    def __init__(self, max_depth=64, tt_mb=16, tablebase=None, ordering=True,
+                 quiescence_nodes=QUIESCENCE_NODES, eval_noise=0, noise_seed=0):
+        self.max_depth = max_depth
+        self.tt = TranspositionTable(tt_mb) if tt_mb else None
+        self.tablebase = tablebase
+        self.ordering = ordering
+        self.quiescence_nodes = quiescence_nodes
+        self.eval_noise = eval_noise
+        self.noise_seed = noise_seed
+        self._evaluate = self._noisy_evaluate if eval_noise else evaluate
+        self.nodes = 0
+        self.qnodes = 0
+        self._q_left = 0
+        self.cutoffs = 0
+        self.first_cutoffs = 0
+        self.killers = [[None, None] for _ in range(MAX_PLY)]
+        self.history = [0] * (32 * 32)
+        self._deadline = 0.0
+        self._node_limit = INFINITY
+        self._stop = None
+
+    def new_game(self):
+        """Drop analysis that belongs to a previous game."""
+        if self.tt:
+            self.tt.clear()
+        self.killers = [[None, None] for _ in range(MAX_PLY)]
+        self.history = [0] * (32 * 32)
+
+    def ordering_stats(self):
+        return {
+            "cutoffs": self.cutoffs,
+            "first_move_cutoffs": self.first_cutoffs,
+            "first_move_rate": self.first_cutoffs / self.cutoffs if self.cutoffs else 0.0,
+        }
+
+    # ---- public ----
+    def search(self, position, color, time_ms=1000, max_depth=None, chain_sq=None,
+               stop=None, root_moves=None, max_nodes=None):
+        """
+        Search until time_ms, max_depth, max_nodes or a forced result.
+        `stop` is an optional threading.Event-like object; once set, the
+        search returns the best move of its last finished iteration.
+        `root_moves` restricts the root to a subset of the legal moves
+        (used to split the root between parallel workers). The first
+        iteration always finishes, whatever max_nodes says.
+        """
+        start = time.perf_counter()
+        self._deadline = start + time_ms / 1000.0
+        self._stop = stop
+        self.nodes = self.qnodes = 0
+        self.cutoffs = self.first_cutoffs = 0
+        self.history = [h >> 1 for h in self.history]
+        # The tree makes/unmakes moves in place; a timeout unwinds without
+        # unmaking, so never search the caller's own object
+        position = position.copy()
+        tt = self.tt
+        if tt:
+            tt.new_search()
+
+        if root_moves is None:
+            root_moves = moves_from(position, color, chain_sq)
+            split = False
+        else:
+            root_moves = list(root_moves)
+            split = True
+        root_key = search_key(position, color, chain_sq)
+        if tt and len(root_moves) > 1:
+            # Start from last turn's best guess for this position, if any
+            entry = tt.probe(root_key)
+            if entry:
+                _tt_move_first(root_moves, entry[3])
+
+        info = {
+            "move": root_moves[0] if root_moves else None,
+            "score": 0,
+            "depth": 0,
+            "nodes": 0,
+            "qnodes": 0,
+            "time_ms": 0.0,
+            "iterations": [],
+        }
+
+        # Nothing to think about with zero or one legal move, unless a
+        # parallel caller needs a score for its share of the root
+        if len(root_moves) > 1 or (split and root_moves):
+            for depth in range(1, (max_depth or self.max_depth) + 1):
+                self._node_limit = max_nodes if max_nodes and depth > 1 else INFINITY
+                try:
+                    score, root_moves = self._search_root(position, color, depth, root_moves)
+                except SearchTimeout:
+                    break
+                info["move"], info["score"], info["depth"] = root_moves[0], score, depth
+                info["iterations"].append((depth, score, root_moves[0]))
+                # A subset's best move is not the position's best move
+                if tt and not split:
+                    tt.store(root_key, depth, _score_to_tt(score, 0), EXACT,
+                             move_key(root_moves[0]))
+                if abs(score) >= MATE_THRESHOLD:
+                    break
+
+        info["nodes"] = self.nodes
+        info["qnodes"] = self.qnodes
+        info["time_ms"] = (time.perf_counter() - start) * 1000.0
+        info["tt"] = tt.stats() if tt else None
+        info["ordering"] = self.ordering_stats()
+        return info
+
+    # ---- tree ----
+    def _search_root(self, position, color, depth, root_moves):
+        """Search every root move; returns (best score, moves with the best first)."""
+        alpha = -INFINITY
+        best_index = 0
+        for i, move in enumerate(root_moves):
+            score = self._child_score(position, color, move, depth, alpha, INFINITY, 0)
+            if score > alpha:
+                alpha = score
+                best_index = i
+
+        ordered = [root_moves[best_index]] + root_moves[:best_index] + root_moves[best_index + 1:]
+        return alpha, ordered
+
+    def _child_score(self, position, color, move, depth, alpha, beta, ply):
+        path = move.path
+        tokens = position.make_path(path)
+        score = -self._negamax(position, opponent(color), depth - 1, -beta, -alpha, ply + 1)
+        position.unmake_path(path, tokens)
+        return score
+
+    def _order_moves(self, moves, tt_move, ply):
+        """Sort `moves` in place, most promising first."""
+        killers = self.killers[ply] if ply < MAX_PLY else ()
+        history = self.history
+
+        def rank(move):
+            key = move_key(move)
+            if key == tt_move:
+                return TT_MOVE_RANK
+            if move.captured:
+                return CAPTURE_RANK * popcount(move.captured)
+            if key in killers:
+                return KILLER_RANK
+            return history[key[0] * 32 + key[1]]
+
+        moves.sort(key=rank, reverse=True)
+
+    def _remember_cutoff(self, move, depth, ply):
+        """A quiet move refuted this node: make it a killer, credit its history."""
+        key = move_key(move)
+        if ply < MAX_PLY:
+            killers = self.killers[ply]
+            if killers[0] != key:
+                killers[1] = killers[0]
+                killers[0] = key
+        i = key[0] * 32 + key[1]
+        self.history[i] += depth * depth
+        if self.history[i] >= HISTORY_LIMIT:
+            self.history = [h >> 1 for h in self.history]
+
+    def _noisy_evaluate(self, position, color):
+        noise = self.eval_noise
+        h = ((search_key(position, color) ^ self.noise_seed) * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+        return evaluate(position, color) + (h >> 32) % (2 * noise + 1) - noise
+
+    def _visit(self):
+        """Count a node; every 1024 nodes check the clock and the stop event."""
+        self.nodes += 1
+        if self.nodes >= self._node_limit:
+            raise SearchTimeout()
+        if not self.nodes & 1023 and (time.perf_counter() > self._deadline
+                                      or (self._stop is not None and self._stop.is_set())):
+            raise SearchTimeout()
+
+    def _quiesce(self, position, color, alpha, beta, ply):
+        """Search forced captures until the side to move has none, then evaluate."""
+        self._visit()
+        self.qnodes += 1
+        if self._q_left <= 0 or not position.jumpers(color):
+            if not position.has_moves(color):
+                return -WIN_SCORE + ply      # no move: side to move loses
+            return self._evaluate(position, color)
+        return self._captures(position, color, alpha, beta, ply)
+
+    def _captures(self, position, color, alpha, beta, ply):
+        """The capture moves of a quiescence node, searched to quiet positions."""
+        self._q_left -= 1
+        moves = generate_moves(position, color)
+        if len(moves) > 1:
+            moves.sort(key=lambda move: popcount(move.captured), reverse=True)
+        other = opponent(color)
+        best = -INFINITY
+        for move in moves:
+            tokens = position.make_path(move.path)
+            score = -self._quiesce(position, other, -beta, -alpha, ply + 1)
+            position.unmake_path(move.path, tokens)
+            if score > best:
+                best = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+        return best
+
+    def _negamax(self, position, color, depth, alpha, beta, ply):
+        self._visit()
+
+        tb = self.tablebase
+        if tb is not None and tb.covers(position):
+            result = tb.probe(position, color)
+            if result is not None:
+                outcome, distance = result
+                if outcome == WIN:
+                    return WIN_SCORE - ply - distance
+                if outcome == LOSS:
+                    return -WIN_SCORE + ply + distance
+                return 0
+
+        if depth <= 0:
+            if self.quiescence_nodes and position.jumpers(color):
+                self._q_left = self.quiescence_nodes
+                return self._captures(position, color, alpha, beta, ply)
+            if not position.has_moves(color):
+                return -WIN_SCORE + ply      # no move: side to move loses
+            return self._evaluate(position, color)
+
+        tt = self.tt
+        tt_move = None
+        if tt:
+            key = search_key(position, color)
+            entry = tt.probe(key)
+            if entry:
+                tt_depth, tt_score, flag, tt_move = entry
+                if tt_depth >= depth:
+                    tt_score = _score_from_tt(tt_score, ply)
+                    if (flag == EXACT
+                            or (flag == LOWER and tt_score >= beta)
+                            or (flag == UPPER and tt_score <= alpha)):
+                        return tt_score
+
+        moves = generate_moves(position, color)
+        if not moves:
+            return -WIN_SCORE + ply          # no move: side to move loses
+        if self.ordering:
+            if len(moves) > 1:
+                self._order_moves(moves, tt_move, ply)
+        elif tt_move:
+            _tt_move_first(moves, tt_move)
+
+        alpha_orig = alpha
+        best = -INFINITY
+        best_move = None
+        for i, move in enumerate(moves):
+            score = self._child_score(position, color, move, depth, alpha, beta, ply)
+            if score > best:
+                best = score
+                best_move = move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        self.cutoffs += 1
+                        if i == 0:
+                            self.first_cutoffs += 1
+                        if not move.captured:
+                            self._remember_cutoff(move, depth, ply)
+                        break
+
+        if tt:
+            if best <= alpha_orig:
+                flag = UPPER
+            elif best >= beta:
+                flag = LOWER
+            else:
+                flag = EXACT
+            tt.store(key, depth, _score_to_tt(best, ply), flag, move_key(best_move))
+        return best
@@ -0,0 +1,175 @@
+"""
+Headless AI-vs-AI matches.
+
+Two players (see players.py) play N games with colours alternating each
+game. Every game is seeded from the match seed, so a match can be rerun
+exactly, and can start with a few random plies so deterministic engines
+do not replay the same game. A game still running after `max_plies`
+turns is a draw.
+
+Games are recorded in the replay archive format (the same records the
+game's save_game_record writes), one entry per hop, so the replay viewer
+can open them.
+
+    python -m checkers.selfplay easy hard [--games 100] [--seed 1]
+        [--max-plies 200] [--random-plies 0] [--out replays.json]
+
+A player is given as "name" or "name:key=value,...", e.g.
+"expert:time_ms=100,max_depth=6".
+"""
+import argparse
+import random
+import time
+
+from .bitboard import WHITE, opponent, Position, square_coords
+from .notation import format_move
+from .players import PLAYERS, RandomPlayer, make_player
+from .replay import append_game_records
+from .rules import winner
+
+DEFAULT_MAX_PLIES = 200
+
+
+def play_game(white, black, max_plies=DEFAULT_MAX_PLIES, seed=None, random_plies=0,
+              names=("White", "Black")):
+    """
+    Play one game between two players and return its replay record.
+    `random_plies` turns are played at random first (from `seed`).
+    """
+    rng = random.Random(seed)
+    opening = RandomPlayer(rng.random())
+    white.new_game(rng.random())
+    black.new_game(rng.random())
+
+    position = Position.initial()
+    color = WHITE
+    moves = []
+    result = None
+    for ply in range(max_plies):
+        result = winner(position, color)
+        if result:
+            break
+        player = opening if ply < random_plies else (white if color == WHITE else black)
+        move = player.choose(position, color, ply)
+
+        is_jump = bool(move.captured)
+        king = position.is_king(move.src)
+        hops = move.hops()
+        for n, (src, dst) in enumerate(hops):
+            sr, sc = square_coords(src)
+            dr, dc = square_coords(dst)
+            # Crowning always ends the turn, so only the last hop can crown
+            if n == len(hops) - 1:
+                position.play(move.path)
+                king = position.is_king(dst)
+            moves.append({
+                "turn": ply,
+                "piece_color": "W" if color == WHITE else "B",
+                "move": format_move(sr, sc, dr, dc, is_jump),
+                "king": king,
+            })
+        color = opponent(color)
+    else:
+        result = winner(position, color) or "Draw"
+
+    return {
+        "players": {"white": names[0], "black": names[1]},
+        "moves": moves,
+        "winner": result,
+        "timestamp": time.time(),
+    }
+
+
+def record_plies(record):
+    """Number of turns in a game record."""
+    return record["moves"][-1]["turn"] + 1 if record["moves"] else 0
+
+
+def run_match(first, second, games=10, seed=1, max_plies=DEFAULT_MAX_PLIES,
+              random_plies=0, names=None, on_game=None):
+    """
+    Play `games` games between two players, `first` taking White in the
+    even-numbered games. Returns (records, summary); `on_game(i, record)`
+    is called after each game.
+    """
+    names = names or (getattr(first, "name", "first"), getattr(second, "name", "second"))
+    if names[0] == names[1]:
+        names = (f"{names[0]} (1)", f"{names[1]} (2)")
+    stats = {name: {"wins": 0, "losses": 0, "draws": 0} for name in names}
+
+    rng = random.Random(seed)
+    records = []
+    plies = 0
+    start = time.perf_counter()
+    for i in range(games):
+        if i % 2 == 0:
+            white, black, labels = first, second, names
+        else:
+            white, black, labels = second, first, names[::-1]
+        record = play_game(white, black, max_plies, seed=rng.getrandbits(32),
+                           random_plies=random_plies, names=labels)
+        records.append(record)
+        plies += record_plies(record)
+
+        if record["winner"] == "White":
+            stats[labels[0]]["wins"] += 1
+            stats[labels[1]]["losses"] += 1
+        elif record["winner"] == "Black":
+            stats[labels[1]]["wins"] += 1
+            stats[labels[0]]["losses"] += 1
+        else:
+            for name in labels:
+                stats[name]["draws"] += 1
+        if on_game:
+            on_game(i, record)
+
+    elapsed = time.perf_counter() - start
+    summary = {
+        "games": games,
+        "players": stats,
+        "seconds": elapsed,
+        "games_per_second": games / elapsed if elapsed else 0.0,
+        "average_plies": plies / games if games else 0.0,
+    }
+    return records, summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play AI-vs-AI matches headlessly")
+    parser.add_argument("first", help=f"player spec ({', '.join(PLAYERS)})")
+    parser.add_argument("second", help="player spec")
+    parser.add_argument("--games", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--max-plies", type=int, default=DEFAULT_MAX_PLIES)
+    parser.add_argument("--random-plies", type=int, default=0,
+                        help="random turns at the start of each game")
+    parser.add_argument("--out", default=None,
+                        help="replay archive to append the games to")
+    parser.add_argument("--quiet", action="store_true")
+    args = parser.parse_args()
+
+    first = make_player(args.first, seed=args.seed)
+    second = make_player(args.second, seed=args.seed + 1)
+
+    def report(i, record):
+        if not args.quiet:
+            print(f"game {i + 1}: {record['players']['white']} (W) vs "
+                  f"{record['players']['black']} (B) -> {record['winner']} "
+                  f"in {record_plies(record)} plies")
+
+    records, summary = run_match(first, second, args.games, args.seed, args.max_plies,
+                                 args.random_plies, names=(args.first, args.second),
+                                 on_game=report)
+    if args.out:
+        append_game_records(records, args.out)
+
+    print()
+    for name, s in summary["players"].items():
+        print(f"{name:>24}: {s['wins']} won, {s['losses']} lost, {s['draws']} drawn")
+    print(f"{summary['games']} games in {summary['seconds']:.1f}s "
+          f"({summary['games_per_second']:.2f} games/s), "
+          f"average {summary['average_plies']:.1f} plies")
+
+
+if __name__ == "__main__":
+    main()
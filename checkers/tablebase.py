@@ -0,0 +1,391 @@
+"""
+Endgame tablebase: exact win/loss/draw and distance to win for every
+position with at most `max_pieces` pieces, built by retrograde analysis.
+
+Positions are grouped into slices by material, (white men, white kings,
+black men, black kings). Captures and promotions always leave a slice
+for one with fewer pieces or fewer men, so slices are solved in order of
+(pieces, men), and all slices of one level can be solved in parallel.
+Each solved slice is written to its own file in a work directory, which
+makes generation resumable; pack() joins them into one indexed file.
+
+Within a slice every complete turn is generated once, giving each
+position its count of replies and each reply its predecessors. Results
+then spread backwards from the lost positions in order of distance: a
+position with a losing reply is won, a position whose replies are all
+won (for the opponent) is lost, and whatever is never reached is drawn.
+
+Value bytes, from the side to move's point of view:
+    0            draw (also unused indices)
+    1..127       win in that many turns
+    0x80 | d     loss in d turns (0x80: no legal move)
+Distances saturate at 127.
+
+Packed file:
+    header   MAGIC, max pieces, slice count
+    index    wm, wk, bm, bk, data offset          one record per slice
+    data     per slice: white-to-move values, then black-to-move values
+
+Build with:
+
+    python -m checkers.tablebase [--pieces 4] [--workers N]
+                                 [--dir tb_work] [--out tablebase.bin]
+"""
+import argparse
+import itertools
+import math
+import mmap
+import os
+import re
+import struct
+import time
+from array import array
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from .bitboard import WHITE, BLACK, Position, iter_squares, popcount
+from .bitboard import WHITE_PROMOTION_MASK, BLACK_PROMOTION_MASK
+from .rules import legal_turns
+
+TABLEBASE_FILE = "tablebase.bin"
+WORK_DIR = "tb_work"
+MAGIC = b"PCTB0002"           # 0002: a crowning capture ends the turn
+HEADER = struct.Struct("<8sII")
+INDEX = struct.Struct("<4BQ")
+
+WIN, DRAW, LOSS = 1, 0, -1
+LOSS_FLAG = 0x80
+MAX_DISTANCE = 127
+
+_COMB = [[math.comb(n, k) for k in range(33)] for n in range(33)]
+_SLICE_NAME = re.compile(r"^(\d)(\d)(\d)(\d)\.slice$")
+
+
+################################################
+# INDEXING
+################################################
+
+def slice_size(sig):
+    """Index range of one side-to-move half of a slice."""
+    size = 1
+    for k in sig:
+        size *= _COMB[32][k]
+    return size
+
+
+def _rank(mask):
+    """Colex rank of a set of squares among all sets of its size."""
+    rank = 0
+    for i, sq in enumerate(iter_squares(mask)):
+        rank += _COMB[sq][i + 1]
+    return rank
+
+
+def position_index(position):
+    """(slice signature, index within the slice) of a position."""
+    kings = position.kings
+    masks = (position.white & ~kings, position.white & kings,
+             position.black & ~kings, position.black & kings)
+    sig = tuple(popcount(m) for m in masks)
+    index = 0
+    for mask, k in zip(masks, sig):
+        index = index * _COMB[32][k] + _rank(mask)
+    return sig, index
+
+
+def slice_signatures(max_pieces):
+    """Every slice with pieces on both sides, in the order they must be solved."""
+    sigs = [(wm, wk, bm, bk)
+            for wm, wk, bm, bk in itertools.product(range(max_pieces + 1), repeat=4)
+            if wm + wk and bm + bk and wm + wk + bm + bk <= max_pieces]
+    return sorted(sigs, key=lambda s: (sum(s), s[0] + s[2], s))
+
+
+def slice_positions(sig):
+    """Every legal placement of a slice's pieces (men never on their promotion row)."""
+    wm, wk, bm, bk = sig
+    white_men_squares = [sq for sq in range(32) if not WHITE_PROMOTION_MASK >> sq & 1]
+    black_men_squares = [sq for sq in range(32) if not BLACK_PROMOTION_MASK >> sq & 1]
+
+    def masks(squares, k, taken):
+        for combo in itertools.combinations(squares, k):
+            mask = 0
+            for sq in combo:
+                mask |= 1 << sq
+            if not mask & taken:
+                yield mask
+
+    for m1 in masks(white_men_squares, wm, 0):
+        for k1 in masks(range(32), wk, m1):
+            for m2 in masks(black_men_squares, bm, m1 | k1):
+                for k2 in masks(range(32), bk, m1 | k1 | m2):
+                    yield Position(white=m1 | k1, black=m2 | k2, kings=k1 | k2)
+
+
+################################################
+# RETROGRADE SOLVER
+################################################
+
+def _encode(loss, distance):
+    distance = min(distance, MAX_DISTANCE)
+    return LOSS_FLAG | distance if loss else distance
+
+
+def solve_slice(sig, lookup):
+    """
+    Values for one slice, white-to-move half first. `lookup(sig, side,
+    index)` must return the value byte of any position in an already
+    solved slice (side 0 = White to move).
+    """
+    size = slice_size(sig)
+    values = bytearray(2 * size)
+    resolved = bytearray(2 * size)
+    replies = array("H", bytes(4 * size))
+    edge_child = array("I")
+    edge_parent = array("I")
+    decided = defaultdict(list)         # distance -> nodes resolved at it
+    outside = defaultdict(list)         # distance -> (node, reply is lost) from other slices
+
+    for position in slice_positions(sig):
+        _, index = position_index(position)
+        for side, color in ((0, WHITE), (1, BLACK)):
+            node = side * size + index
+            turns = legal_turns(position, color)
+            replies[node] = len(turns)
+            if not turns:
+                values[node] = LOSS_FLAG
+                resolved[node] = 1
+                decided[0].append(node)
+                continue
+            for _, child in turns:
+                if not (child.white and child.black):
+                    outside[0].append((node, True))     # took the last piece
+                    continue
+                child_sig, child_index = position_index(child)
+                if child_sig == sig:
+                    edge_child.append((1 - side) * size + child_index)
+                    edge_parent.append(node)
+                    continue
+                value = lookup(child_sig, 1 - side, child_index)
+                if value:
+                    outside[value & MAX_DISTANCE].append((node, bool(value & LOSS_FLAG)))
+
+    # Predecessor lists, CSR style
+    start = array("I", bytes(4 * (2 * size + 1)))
+    for child in edge_child:
+        start[child + 1] += 1
+    for i in range(2 * size):
+        start[i + 1] += start[i]
+    fill = array("I", start)
+    parents = array("I", bytes(4 * len(edge_child)))
+    for child, parent in zip(edge_child, edge_parent):
+        parents[fill[child]] = parent
+        fill[child] += 1
+    del edge_child, edge_parent, fill
+
+    def settle(node, child_lost, distance):
+        """A reply of `node` is now known; returns True if that decides `node`."""
+        if resolved[node]:
+            return False
+        if child_lost:
+            values[node] = _encode(False, distance + 1)
+        else:
+            replies[node] -= 1
+            if replies[node]:
+                return False
+            values[node] = _encode(True, distance + 1)
+        resolved[node] = 1
+        return True
+
+    distance = 0
+    while distance <= max(list(decided) + list(outside), default=-1):
+        for node, child_lost in outside.pop(distance, ()):
+            if settle(node, child_lost, distance):
+                decided[distance + 1].append(node)
+        for child in decided.pop(distance, ()):
+            child_lost = bool(values[child] & LOSS_FLAG)
+            for i in range(start[child], start[child + 1]):
+                if settle(parents[i], child_lost, distance):
+                    decided[distance + 1].append(parents[i])
+        distance += 1
+    return values
+
+
+################################################
+# PROBING
+################################################
+
+class Tablebase:
+    """
+    Memory-mapped tablebase: a packed file, or a generation work
+    directory of per-slice files.
+    """
+
+    def __init__(self, path=TABLEBASE_FILE):
+        self.slices = {}          # sig -> (buffer, offset)
+        self._maps = []
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                match = _SLICE_NAME.match(name)
+                if match:
+                    sig = tuple(int(g) for g in match.groups())
+                    self.slices[sig] = (self._map(os.path.join(path, name)), 0)
+        else:
+            data = self._map(path)
+            magic, _, count = HEADER.unpack_from(data, 0)
+            if magic != MAGIC:
+                self.close()
+                raise ValueError(f"{path} is not a tablebase")
+            for i in range(count):
+                wm, wk, bm, bk, offset = INDEX.unpack_from(data, HEADER.size + i * INDEX.size)
+                self.slices[(wm, wk, bm, bk)] = (data, offset)
+        self.max_pieces = 0
+        for sig in self.slices:
+            self.max_pieces = max(self.max_pieces, sum(sig))
+
+    def _map(self, name):
+        with open(name, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(data)
+        return data
+
+    def close(self):
+        for data in self._maps:
+            data.close()
+        self._maps = []
+        self.slices = {}
+
+    def value(self, sig, side, index):
+        """Raw value byte, or None if the slice is not in the table."""
+        entry = self.slices.get(sig)
+        if entry is None:
+            return None
+        data, offset = entry
+        return data[offset + side * slice_size(sig) + index]
+
+    def covers(self, position):
+        return popcount(position.white | position.black) <= self.max_pieces
+
+    def probe_value(self, position, color):
+        if not (position.white and position.black):
+            own = position.white if color == WHITE else position.black
+            return LOSS_FLAG if not own else None
+        if not self.covers(position):
+            return None
+        sig, index = position_index(position)
+        return self.value(sig, 0 if color == WHITE else 1, index)
+
+    def probe(self, position, color):
+        """(WIN / DRAW / LOSS, turns to the end) for the side to move, or None."""
+        value = self.probe_value(position, color)
+        if value is None:
+            return None
+        if not value:
+            return DRAW, 0
+        if value & LOSS_FLAG:
+            return LOSS, value & MAX_DISTANCE
+        return WIN, value
+
+    def best_turn(self, position, color):
+        """
+        The best Move: the fastest win, else a draw, else the slowest
+        loss. None if the position is not covered.
+        """
+        if not self.covers(position):
+            return None
+        opponent = BLACK if color == WHITE else WHITE
+        best = None
+        for move, child in legal_turns(position, color):
+            result = self.probe(child, opponent)
+            if result is None:
+                return None
+            outcome, distance = result
+            # Their loss is our win: win fast, lose slowly
+            rank = (-outcome, -distance if outcome == LOSS else distance)
+            if best is None or rank > best[0]:
+                best = (rank, move)
+        return best[1] if best else None
+
+
+################################################
+# GENERATION
+################################################
+
+def slice_file(directory, sig):
+    return os.path.join(directory, "%d%d%d%d.slice" % sig)
+
+
+def _build_slice(directory, sig):
+    tables = Tablebase(directory)
+    try:
+        values = solve_slice(sig, tables.value)
+    finally:
+        tables.close()
+    name = slice_file(directory, sig)
+    with open(name + ".tmp", "wb") as f:
+        f.write(values)
+    os.replace(name + ".tmp", name)      # a slice file is only ever complete
+    return sig
+
+
+def generate(max_pieces=4, directory=WORK_DIR, workers=1, log=print):
+    """
+    Solve every slice up to max_pieces into `directory`, skipping slices
+    already there, so an interrupted run picks up where it stopped.
+    """
+    os.makedirs(directory, exist_ok=True)
+    levels = defaultdict(list)
+    for sig in slice_signatures(max_pieces):
+        levels[(sum(sig), sig[0] + sig[2])].append(sig)
+
+    pool = ProcessPoolExecutor(workers) if workers > 1 else None
+    try:
+        for level in sorted(levels):
+            todo = [sig for sig in levels[level] if not os.path.exists(slice_file(directory, sig))]
+            if not todo:
+                continue
+            start = time.perf_counter()
+            if pool:
+                list(pool.map(_build_slice, [directory] * len(todo), todo))
+            else:
+                for sig in todo:
+                    _build_slice(directory, sig)
+            log(f"{level[0]} pieces, {level[1]} men: {len(todo)} slices "
+                f"in {time.perf_counter() - start:.1f}s")
+    finally:
+        if pool:
+            pool.shutdown()
+
+
+def pack(directory=WORK_DIR, path=TABLEBASE_FILE, max_pieces=4):
+    """Join the slice files for up to max_pieces into one indexed file."""
+    sigs = [sig for sig in slice_signatures(max_pieces)
+            if os.path.exists(slice_file(directory, sig))]
+    offset = HEADER.size + len(sigs) * INDEX.size
+    with open(path + ".tmp", "wb") as out:
+        out.write(HEADER.pack(MAGIC, max_pieces, len(sigs)))
+        for sig in sigs:
+            out.write(INDEX.pack(*sig, offset))
+            offset += 2 * slice_size(sig)
+        for sig in sigs:
+            with open(slice_file(directory, sig), "rb") as f:
+                out.write(f.read())
+    os.replace(path + ".tmp", path)
+    return len(sigs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the endgame tablebase")
+    parser.add_argument("--pieces", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--dir", default=WORK_DIR)
+    parser.add_argument("--out", default=TABLEBASE_FILE)
+    args = parser.parse_args()
+
+    generate(args.pieces, args.dir, args.workers)
+    n = pack(args.dir, args.out, args.pieces)
+    print(f"{n} slices written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Fixed-size transposition table for the alpha-beta search.
+
+The table is two flat arrays of signed 64-bit ints (keys and packed
+entries), so its memory use is fixed by the size cap and no Python
+objects are allocated per entry. Each bucket has two slots:
+
+    slot 0  depth-preferred: only replaced by an equal or deeper search,
+            or by anything once the entry is from an older search
+    slot 1  always-replace: takes whatever slot 0 refused
+
+Packed entry layout (low bit first):
+    score + SCORE_OFFSET   18 bits
+    depth                   7 bits
+    flag                    2 bits  (EXACT / LOWER / UPPER bound)
+    move present            1 bit
+    move src, dst           5 + 5 bits
+    generation              8 bits
+    move capture tag       16 bits  (see search.move_key)
+"""
+from array import array
+
+EXACT, LOWER, UPPER = 0, 1, 2
+
+SLOT_BYTES = 16                  # one key + one packed entry
+SCORE_OFFSET = 1 << 17
+
+_DEPTH_SHIFT = 18
+_FLAG_SHIFT = 25
+_HAS_MOVE_SHIFT = 27
+_SRC_SHIFT = 28
+_DST_SHIFT = 33
+_GEN_SHIFT = 38
+_TAG_SHIFT = 46
+
+
+class TranspositionTable:
+
+    def __init__(self, size_mb=16):
+        self.size_mb = size_mb
+        self.buckets = max(1, int(size_mb * 1024 * 1024) // (2 * SLOT_BYTES))
+        self.slots = self.buckets * 2
+        self.keys = array("q", bytes(8 * self.slots))
+        self.data = array("q", bytes(8 * self.slots))
+        self.generation = 0
+        self.used = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    def clear(self):
+        """Forget everything (new game)."""
+        self.keys = array("q", bytes(8 * self.slots))
+        self.data = array("q", bytes(8 * self.slots))
+        self.generation = 0
+        self.used = 0
+        self.reset_stats()
+
+    def new_search(self):
+        """Age existing entries so the next search may overwrite them."""
+        self.generation = (self.generation + 1) & 0xFF
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    # ---- access ----
+    def probe(self, key):
+        """Return (depth, score, flag, move or None) for `key`, or None."""
+        self.probes += 1
+        i = (key % self.buckets) * 2
+        keys = self.keys
+        if keys[i] != key:
+            i += 1
+            if keys[i] != key:
+                return None
+        self.hits += 1
+        d = self.data[i]
+        move = None
+        if d >> _HAS_MOVE_SHIFT & 1:
+            move = (d >> _SRC_SHIFT & 31, d >> _DST_SHIFT & 31, d >> _TAG_SHIFT & 0xFFFF)
+        return ((d >> _DEPTH_SHIFT) & 127,
+                (d & 0x3FFFF) - SCORE_OFFSET,
+                (d >> _FLAG_SHIFT) & 3,
+                move)
+
+    def store(self, key, depth, score, flag, move):
+        self.stores += 1
+        packed = ((score + SCORE_OFFSET)
+                  | min(depth, 127) << _DEPTH_SHIFT
+                  | flag << _FLAG_SHIFT
+                  | self.generation << _GEN_SHIFT)
+        if move is not None:
+            packed |= (1 << _HAS_MOVE_SHIFT | move[0] << _SRC_SHIFT | move[1] << _DST_SHIFT
+                       | move[2] << _TAG_SHIFT)
+
+        i = (key % self.buckets) * 2
+        keys = self.keys
+        old = self.data[i]
+        if not (keys[i] == key
+                or keys[i] == 0
+                or depth >= (old >> _DEPTH_SHIFT) & 127
+                or (old >> _GEN_SHIFT) & 0xFF != self.generation):
+            i += 1
+        if keys[i] == 0:
+            self.used += 1
+        keys[i] = key
+        self.data[i] = packed
+
+    # ---- reporting ----
+    def hit_rate(self):
+        return self.hits / self.probes if self.probes else 0.0
+
+    def fill(self):
+        """Fraction of slots holding an entry."""
+        return self.used / self.slots
+
+    def stats(self):
+        return {
+            "size_mb": self.size_mb,
+            "probes": self.probes,
+            "hits": self.hits,
+            "stores": self.stores,
+            "hit_rate": self.hit_rate(),
+            "fill": self.fill(),
+        }
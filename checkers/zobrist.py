@@ -0,0 +1,33 @@
+"""
+Zobrist keys for Position hashing.
+
+A position's hash is the XOR of one random 63-bit key per occupied
+square and piece kind, so a move updates it with two or three XORs.
+Keys come from a fixed seed so hashes are stable across runs and
+processes (the opening book and shared tables rely on that).
+"""
+import random
+
+# Piece kinds for hashing: bit 0 = black, bit 1 = king
+WHITE_MAN_KEY, BLACK_MAN_KEY, WHITE_KING_KEY, BLACK_KING_KEY = range(4)
+
+_rng = random.Random(0x5EED_C4EC)
+
+ZOBRIST = tuple(tuple(_rng.getrandbits(63) for _ in range(32)) for _ in range(4))
+
+# XORed in by the search when Black is to move / a multi-jump must continue
+SIDE_KEY = _rng.getrandbits(63)
+CHAIN_KEYS = tuple(_rng.getrandbits(63) for _ in range(32))
+
+del _rng
+
+
+def hash_masks(white, black, kings):
+    """Full (non-incremental) hash of a position given its masks."""
+    h = 0
+    for sq in range(32):
+        bit = 1 << sq
+        if (white | black) & bit:
+            kind = (BLACK_MAN_KEY if black & bit else WHITE_MAN_KEY) | (2 if kings & bit else 0)
+            h ^= ZOBRIST[kind][sq]
+    return h
@@ -1,12 +1,31 @@
-
 import pygame
+import sys
+import threading
 import time
-import random
-import json
 import hashlib
-import os
 import datetime
 import sqlite3
+import multiprocessing
+import os
+from collections import OrderedDict
+
+from checkers import (
+    WHITE, BLACK, opponent,
+    Position, square_index, square_coords, iter_squares,
+    generate_moves, piece_moves,
+    algebraic_square, format_move,
+    load_replay_list, load_replay_game, append_game_record,
+    extract_move_token, parse_move_entry, replay_hops,
+)
+from checkers.bitboard import popcount
+from checkers.search import AlphaBetaSearch, move_key, search_key
+from checkers.parallel import ParallelSearch
+from checkers.players import RandomPlayer, GreedyPlayer, LadderPlayer
+from checkers.ladder import (
+    CALIBRATION_FILE, calibrate, clamp_level, level_time_ms, level_time_limit_ms,
+)
+from checkers.book import BOOK_FILE, OpeningBook
+from checkers.tablebase import TABLEBASE_FILE, Tablebase, DRAW
 
 pygame.init()
 
@@ -41,8 +60,7 @@ clock = pygame.time.Clock()
 BLUE_TILE = (0, 102, 204)
 WHITE_TILE = (255, 255, 255)
 
-BLACK = (35, 35, 35)
-WHITE = (255, 255, 255)
+# BLACK and WHITE (piece colors / side identifiers) come from checkers
 
 BLACK_BORDER = (70, 70, 70)
 WHITE_BORDER = (200, 200, 200)
@@ -53,11 +71,58 @@ HIGHLIGHT_GREEN = (0, 255, 0)
 HIGHLIGHT_RED = (255, 0, 0)
 HIGHLIGHT_GOLD = (255, 215, 0)
 
+################################################
+# FONTS + TEXT CACHE
+################################################
+# SysFont() searches the system fonts and Font.render() allocates a new
+# Surface, and the screens ask for the same fonts and labels every
+# frame. get_font() keeps one Font per (name, size); render_text() keeps
+# the most recent TEXT_CACHE_SIZE rendered labels. Sizes follow
+# UI_SCALE, so scale_window() clears both.
+
+TEXT_CACHE_SIZE = 256
+font_cache = {}             # (name, size) -> Font
+text_cache = OrderedDict()  # (font, text, antialias, color) -> Surface, least recent first
+text_cache_stats = {"fonts": 0, "renders": 0, "hits": 0}
+
+
+def get_font(size, name=None):
+    key = (name, size)
+    font = font_cache.get(key)
+    if font is None:
+        font = font_cache[key] = pygame.font.SysFont(name, size)
+        text_cache_stats["fonts"] += 1
+    return font
+
+
+def render_text(font, text, antialias, color):
+    """font.render(text, antialias, color), reusing the Surface for repeated labels."""
+    key = (font, text, antialias, color)
+    surface = text_cache.get(key)
+    if surface is not None:
+        text_cache.move_to_end(key)
+        text_cache_stats["hits"] += 1
+        return surface
+    surface = text_cache[key] = font.render(text, antialias, color)
+    text_cache_stats["renders"] += 1
+    if len(text_cache) > TEXT_CACHE_SIZE:
+        text_cache.popitem(last=False)
+    return surface
+
+
+def clear_text_caches():
+    font_cache.clear()
+    text_cache.clear()
+
 ################################################
 # GLOBAL GAME STATE
 ################################################
 board_state = []
 board_history = []
+position = None             # bitboard Position, the rules source of truth
+piece_grid = [[None] * 8 for _ in range(8)]   # (row, col) -> Checker sprite
+move_cache = None           # legal moves for the side to move, see get_move_cache()
+move_cache_stats = {"recomputes": 0, "hits": 0}
 
 turn = 0
 selected_piece = None
@@ -71,7 +136,7 @@ game_over = False
 game_winner = None
 show_menu = False
 drag_origin = None          # where a drag started
-pending_mode = None         # "pvp", "ai_easy", "ai_hard"
+pending_mode = None         # "pvp", "ai_easy", "ai_hard", "ai_expert"
 game_vs_ai = False          # False = PvP, True = vs AI
 game_moves = []             # list of recorded moves for replays
 replay_active = False       # active replay mode flag
@@ -84,6 +149,7 @@ menu_buttons = {
     "close": None,
     "easy": None,
     "hard": None,
+    "expert": None,
     "pvp": None,
     "pve": None,
     "quit": None
@@ -168,9 +234,6 @@ def verify_login(username: str, password: str):
     return True, "Login successful!"
 
 
-# Ensure the database exists when the module is imported
-init_db()
-
 
 ################################################
 # LOGIN SCREEN STATE
@@ -190,7 +253,32 @@ START_MENU_ACTIVE = True
 GAME_MODE = ""   # "pvp" or "pve"
 HUMAN_COLOR = WHITE
 AI_COLOR = BLACK
-AI_DIFFICULTY = "EASY"
+AI_DIFFICULTY = "LEVEL"     # "LEVEL" (AI_LEVEL of the ladder) or "EXPERT"; "EASY"/"HARD" still work
+AI_LEVEL = 2                # difficulty ladder level, MIN_LEVEL..MAX_LEVEL (see checkers.ladder)
+EASY_LEVEL = 2              # ladder levels behind the start menu's Easy and Hard buttons
+HARD_LEVEL = 6
+AI_CALIBRATION_FILE = CALIBRATION_FILE  # cached nodes/second, measured once per machine
+nodes_per_second = None     # this machine's search speed, see get_nodes_per_second()
+calibration_thread = None   # measuring nodes_per_second at launch, see start_calibration()
+AI_TIME_BUDGET_MS = 1000    # thinking time per move for the EXPERT search
+AI_TT_MB = 16               # transposition table memory cap for the EXPERT search
+AI_WORKERS = 1              # EXPERT search processes; >1 splits the root over a process pool
+search_engine = None        # EXPERT search engine, kept for the whole session
+search_engine_config = None # (workers, tt_mb) search_engine was built for
+AI_BOOK_FILE = BOOK_FILE    # opening book (python -m checkers.book); skipped if missing
+AI_BOOK_PLIES = 16          # EXPERT plays book moves for this many turns before searching
+opening_book = None         # memory-mapped OpeningBook, opened on first use
+AI_TABLEBASE_FILE = TABLEBASE_FILE  # endgame tables (python -m checkers.tablebase); skipped if missing
+TB_ADJUDICATE_DRAWS = True  # end the game once the tablebase says it is a dead draw
+tablebase = None            # memory-mapped Tablebase, opened on first use
+ai_player = None            # AI for the current game (kept so its search tables persist)
+ai_player_config = None     # (difficulty, level, color) ai_player was built for
+ai_job = None               # background AI search in progress, see start_ai_turn()
+AI_PONDER = True            # EXPERT searches the predicted reply during the human's turn
+AI_PONDER_PREDICT_MS = 100  # search used to predict the reply when the table has no move
+AI_PONDER_MAX_MS = 600000   # a ponder runs until the human moves (or this long)
+ponder_job = None           # background ponder in progress, see start_ponder()
+ponder_stats = {"hits": 0, "misses": 0}
 
 ################################################
 # REPLAY SYSTEM STATE
@@ -207,10 +295,28 @@ move_history = []
 ################################################
 # PENGUIN SPRITES
 ################################################
-BLACK_PENGUIN_BASE = None
-WHITE_PENGUIN_BASE = None
-BLACK_PENGUIN_KING_BASE = None
-WHITE_PENGUIN_KING_BASE = None
+# The source PNGs are large (400-550 px) and slow to decode, and a resize
+# needs all four at the new tile size. A source is decoded only when a
+# size is missing from both caches below, and halved into a mip chain
+# then; a size is scaled from the smallest level still at least that big.
+# The last SPRITE_CACHE_SIZE sizes stay in memory (resizing back and
+# forth costs nothing), and on exit save_sprite_cache() writes them to
+# SPRITE_CACHE_DIR as raw RGBA, keyed by a hash of the source and the
+# size, so a launch at a known size neither decodes nor scales.
+PENGUIN_FILES = {
+    "black": "BlackPenguinPiece.png",
+    "white": "WhitePenguinPiece.png",
+    "black_king": "BlackPenguinKingPiece.png",
+    "white_king": "WhitePenguinKingPiece.png",
+}
+SPRITE_CACHE_SIZE = 6       # sprite sizes kept in memory
+SPRITE_MIN_MIP = 32         # smallest mip level, in pixels
+SPRITE_CACHE_DIR = "sprite_cache"   # scaled sprites saved on exit; None = no disk cache
+
+sprite_hashes = {}          # name -> hash of the source PNG; empty if the PNGs are missing
+sprite_mips = {}            # name -> [source, 1/2, 1/4, ...], largest first, decoded on demand
+sprite_cache = OrderedDict()  # size -> {name: Surface}, least recent first
+sprite_stats = {"decoded": 0, "scaled": 0, "loaded": 0, "hits": 0}
 
 BLACK_PENGUIN = None
 WHITE_PENGUIN = None
@@ -218,24 +324,108 @@ BLACK_PENGUIN_KING = None
 WHITE_PENGUIN_KING = None
 
 try:
-    BLACK_PENGUIN_BASE = pygame.image.load("BlackPenguinPiece.png").convert_alpha()
-    WHITE_PENGUIN_BASE = pygame.image.load("WhitePenguinPiece.png").convert_alpha()
-    BLACK_PENGUIN_KING_BASE = pygame.image.load("BlackPenguinKingPiece.png").convert_alpha()
-    WHITE_PENGUIN_KING_BASE = pygame.image.load("WhitePenguinKingPiece.png").convert_alpha()
-except:
-    BLACK_PENGUIN_BASE = None
-    WHITE_PENGUIN_BASE = None
-    BLACK_PENGUIN_KING_BASE = None
-    WHITE_PENGUIN_KING_BASE = None
+    for name, path in PENGUIN_FILES.items():
+        with open(path, "rb") as f:
+            sprite_hashes[name] = hashlib.sha256(f.read()).hexdigest()[:16]
+except OSError:
+    sprite_hashes.clear()
+
+
+def get_sprite_mips(name):
+    """Mip chain of penguin `name`, decoding its PNG on first use."""
+    levels = sprite_mips.get(name)
+    if levels is None:
+        levels = [pygame.image.load(PENGUIN_FILES[name]).convert_alpha()]
+        w, h = levels[0].get_size()
+        while min(w, h) // 2 >= SPRITE_MIN_MIP:
+            w, h = w // 2, h // 2
+            levels.append(pygame.transform.smoothscale(levels[-1], (w, h)))
+        sprite_mips[name] = levels
+        sprite_stats["decoded"] += 1
+    return levels
+
+
+def scale_sprite(name, size):
+    """Sprite `name` at size x size, from the smallest mip level that is big enough."""
+    levels = get_sprite_mips(name)
+    source = next((level for level in reversed(levels) if min(level.get_size()) >= size),
+                  levels[0])
+    sprite_stats["scaled"] += 1
+    return pygame.transform.smoothscale(source, (size, size))
+
+
+def sprite_path(name, size):
+    return os.path.join(SPRITE_CACHE_DIR, f"{name}-{sprite_hashes[name]}-{size}.rgba")
+
+
+def load_cached_sprite(name, size):
+    """Sprite `name` at `size` from the disk cache, or None."""
+    if not SPRITE_CACHE_DIR:
+        return None
+    try:
+        with open(sprite_path(name, size), "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    if len(data) != size * size * 4:
+        return None
+    try:
+        sprite = pygame.image.frombytes(data, (size, size), "RGBA").convert_alpha()
+    except (pygame.error, ValueError):
+        return None         # unreadable cache file: scale from the source instead
+    sprite_stats["loaded"] += 1
+    return sprite
+
+
+def get_penguin_sprites(size):
+    """{name: Surface} of all four penguins at `size`, cached."""
+    sprites = sprite_cache.get(size)
+    if sprites is not None:
+        sprite_cache.move_to_end(size)
+        sprite_stats["hits"] += 1
+        return sprites
+    sprites = sprite_cache[size] = {
+        name: load_cached_sprite(name, size) or scale_sprite(name, size)
+        for name in sprite_hashes
+    }
+    if len(sprite_cache) > SPRITE_CACHE_SIZE:
+        sprite_cache.popitem(last=False)
+    return sprites
+
+
+def save_sprite_cache():
+    """Write the sprites in memory that are not on disk yet (called on exit)."""
+    if not SPRITE_CACHE_DIR:
+        return
+    try:
+        for size, sprites in sprite_cache.items():
+            for name, sprite in sprites.items():
+                path = sprite_path(name, size)
+                if not os.path.exists(path):
+                    os.makedirs(SPRITE_CACHE_DIR, exist_ok=True)
+                    with open(path, "wb") as f:
+                        f.write(pygame.image.tobytes(sprite, "RGBA"))
+    except OSError:
+        pass                # unwritable directory: scale again next launch
+
 
 def rescale_penguin_images():
     global BLACK_PENGUIN, WHITE_PENGUIN, BLACK_PENGUIN_KING, WHITE_PENGUIN_KING
     size = max(1, int(TILE_SIZE * 0.9))
-    if BLACK_PENGUIN_BASE:
-        BLACK_PENGUIN = pygame.transform.smoothscale(BLACK_PENGUIN_BASE, (size, size))
-        WHITE_PENGUIN = pygame.transform.smoothscale(WHITE_PENGUIN_BASE, (size, size))
-        BLACK_PENGUIN_KING = pygame.transform.smoothscale(BLACK_PENGUIN_KING_BASE, (size, size))
-        WHITE_PENGUIN_KING = pygame.transform.smoothscale(WHITE_PENGUIN_KING_BASE, (size, size))
+    sprites = None
+    if sprite_hashes:
+        try:
+            sprites = get_penguin_sprites(size)
+        except (pygame.error, ValueError):
+            # undecodable PNG: draw circles from now on, as without the files
+            sprite_hashes.clear()
+            sprite_mips.clear()
+            sprite_cache.clear()
+    if sprites:
+        BLACK_PENGUIN = sprites["black"]
+        WHITE_PENGUIN = sprites["white"]
+        BLACK_PENGUIN_KING = sprites["black_king"]
+        WHITE_PENGUIN_KING = sprites["white_king"]
     else:
         BLACK_PENGUIN = WHITE_PENGUIN = BLACK_PENGUIN_KING = WHITE_PENGUIN_KING = None
 
@@ -275,6 +465,7 @@ class Checker:
         self.player = player          # WHITE or BLACK
         self.direction = direction    # +1 or -1 (ignored if king)
         self.king = (status == "king")
+        self.row, self.col = pixel_to_board(location)   # board square, kept by piece_grid
         self.radius = TILE_SIZE // 3
         self.update_rect()
 
@@ -336,8 +527,14 @@ class Checker:
 def reset_game():
     global board_state, board_history, selected_piece, valid_moves
     global dragging, orig_pos, multi_jump, jump_occurred, turn
-    global game_over, game_winner, move_history, game_moves
-
+    global game_over, game_winner, move_history, game_moves, position
+    global ai_player
+
+    cancel_ai_turn()
+    position = Position.initial()
+    ai_player = None            # new game: fresh AI and search tables
+    clear_piece_grid()
+    invalidate_move_cache()
     board_state = []
     board_history = []
     move_history = []
@@ -352,23 +549,16 @@ def reset_game():
     game_over = False
     game_winner = None
 
-    for r in range(3):
-        for c in range(8):
-            if (r + c) % 2 == 1:
-                piece = Checker(location=board_to_pixel(r, c),
-                                status="normal",
-                                player=BLACK,
-                                direction=1)
-                board_state.append(piece)
-
-    for r in range(5, 8):
-        for c in range(8):
-            if (r + c) % 2 == 1:
-                piece = Checker(location=board_to_pixel(r, c),
-                                status="normal",
-                                player=WHITE,
-                                direction=-1)
-                board_state.append(piece)
+    # Sprites mirror the bitboard position
+    for sq in iter_squares(position.black | position.white):
+        r, c = square_coords(sq)
+        color = position.color_at(sq)
+        piece = Checker(location=board_to_pixel(r, c),
+                        status="king" if position.is_king(sq) else "normal",
+                        player=color,
+                        direction=1 if color == BLACK else -1)
+        board_state.append(piece)
+        place_piece(piece, r, c)
 
     save_game_state()
 
@@ -407,24 +597,7 @@ def save_game_record():
         "timestamp": time.time()
     }
 
-    # --- Make sure file exists and is valid JSON ---
-    if not os.path.exists("replays.json"):
-        with open("replays.json", "w") as f:
-            json.dump({"games": []}, f)
-
-    try:
-        with open("replays.json", "r") as f:
-            data = json.load(f)
-    except Exception:
-        data = {"games": []}
-
-    if "games" not in data:
-        data["games"] = []
-
-    data["games"].append(record)
-
-    with open("replays.json", "w") as f:
-        json.dump(data, f, indent=4)
+    append_game_record(record)
 
 def apply_replay_move():
     global replay_index, board_state, turn
@@ -436,20 +609,11 @@ def apply_replay_move():
     sr, sc = move["start"]
     dr, dc = move["end"]
 
-    piece = piece_at(sr, sc)
+    piece = move_piece_on_board(sr, sc, dr, dc)
     if not piece:
         replay_index += 1
         return
 
-    if abs(dr - sr) == 2:
-        jumped = piece_at((sr + dr) // 2, (sc + dc) // 2)
-        if jumped:
-            try:
-                board_state.remove(jumped)
-            except:
-                pass
-
-    piece.update_location(board_to_pixel(dr, dc))
     turn += 1
     replay_index += 1
 
@@ -457,10 +621,6 @@ def apply_replay_move():
 # ALGEBRAIC MOVE NOTATION
 ################################################
 
-def algebraic_square(r, c):
-    cols = "abcdefgh"
-    return f"{cols[c]}{8 - r}"
-
 def record_move(piece, sr, sc, dr, dc, jump):
     global move_history
 
@@ -485,15 +645,16 @@ def record_move(piece, sr, sc, dr, dc, jump):
 ################################################
 
 def get_all_player_moves(player_color):
-    moves = []
-    forced = get_forced_jump_pieces(player_color)
+    return first_hops(generate_moves(position, player_color))
 
-    pieces = forced if forced else [p for p in board_state if p.player == player_color]
-    for p in pieces:
-        valid = get_valid_moves(p, only_jumps=bool(forced))
-        for (r, c) in valid:
-            moves.append((p, (r, c)))
-    return moves
+def first_hops(moves):
+    """(piece, first landing) for each complete Move, without repeats."""
+    hops = []
+    for move in moves:
+        hop = (piece_at(*square_coords(move.path[0])), square_coords(move.path[1]))
+        if hop not in hops:
+            hops.append(hop)
+    return hops
 
 
 ################################################
@@ -501,12 +662,55 @@ def get_all_player_moves(player_color):
 ################################################
 
 def piece_at(r, c):
-    for p in board_state:
-        pr, pc = pixel_to_board(p.location)
-        if pr == r and pc == c:
-            return p
+    """Constant-time sprite lookup through piece_grid (None if empty/off-board)."""
+    if 0 <= r < 8 and 0 <= c < 8:
+        return piece_grid[r][c]
     return None
 
+def clear_piece_grid():
+    for row in piece_grid:
+        for c in range(8):
+            row[c] = None
+
+def place_piece(piece, r, c):
+    """Record `piece` on (r, c) in piece_grid and snap its sprite there."""
+    piece_grid[r][c] = piece
+    piece.row, piece.col = r, c
+    piece.update_location(board_to_pixel(r, c))
+
+def relayout_pieces():
+    """Re-snap every sprite to its square after TILE_SIZE / offsets change."""
+    for r in range(8):
+        for c in range(8):
+            piece = piece_grid[r][c]
+            if piece:
+                piece.update_location(board_to_pixel(r, c))
+
+def move_piece_on_board(sr, sc, dr, dc):
+    """
+    Apply a move to the bitboard position and mirror it on the sprites
+    (capture removal, new location, promotion). Returns the moved Checker,
+    or None if there is no piece on (sr, sc).
+    """
+    piece = piece_at(sr, sc)
+    if not piece or position.color_at(square_index(sr, sc)) is None:
+        return None
+
+    captured = position.move(square_index(sr, sc), square_index(dr, dc))
+    invalidate_move_cache()
+    if captured is not None:
+        cr, cc = square_coords(captured)
+        jumped = piece_grid[cr][cc]
+        piece_grid[cr][cc] = None
+        if jumped:
+            board_state.remove(jumped)
+
+    piece_grid[sr][sc] = None
+    place_piece(piece, dr, dc)
+    if position.is_king(square_index(dr, dc)) and not piece.king:
+        piece.make_king()
+    return piece
+
 def check_king_status(piece):
     r, c = pixel_to_board(piece.location)
     if piece.player == WHITE and r == 0:
@@ -518,14 +722,10 @@ def get_current_turn():
     return WHITE if turn % 2 == 0 else BLACK
 
 def save_game_state():
-    state = []
-    for piece in board_state:
-        new_piece = Checker(piece.location, piece.status, piece.player, piece.direction)
-        new_piece.king = piece.king
-        state.append(new_piece)
-
+    # The bitboard position is the whole board: three masks and a hash,
+    # so there is no need to copy every Checker sprite per turn
     board_history.append({
-        'board': state,
+        'position': position.copy(),
         'turn': turn,
         'jump_occurred': jump_occurred,
         'multi_jump': multi_jump,
@@ -542,39 +742,21 @@ def on_turn_end():
 ################################################
 
 def get_valid_moves(piece, only_jumps=False):
-    moves = []
-    sr, sc = pixel_to_board(piece.location)
-
-    # King or normal direction
-    directions = []
-    if piece.king:
-        directions = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
-    else:
-        directions = [(piece.direction, -1), (piece.direction, 1)]
-
-    # Check each direction
-    for dr, dc in directions:
-        r = sr + dr
-        c = sc + dc
-
-        # Simple move
-        if not only_jumps:
-            if 0 <= r < 8 and 0 <= c < 8 and piece_at(r, c) is None:
-                # Only allow landing on dark tiles
-                if (r + c) % 2 == 1:
-                    moves.append((r, c))
-
-        # Jump move
-        jr = sr + 2 * dr
-        jc = sc + 2 * dc
-        if 0 <= jr < 8 and 0 <= jc < 8:
-            middle = piece_at(sr + dr, sc + dc)
-            if middle and middle.player != piece.player and piece_at(jr, jc) is None:
-                # Must land on dark tile
-                if (jr + jc) % 2 == 1:
-                    moves.append((jr, jc))
+    """
+    Squares the piece may step or jump to next: the first hop of each of
+    its complete moves. A multi-jump is offered one hop at a time.
+    """
+    sr, sc = piece.row, piece.col
+    if piece_at(sr, sc) is not piece:
+        return []
 
-    return moves
+    landings = []
+    # Every route counts here: two chains to the same result may start differently
+    for move in piece_moves(position, square_index(sr, sc), only_jumps, distinct=False):
+        landing = square_coords(move.path[1])
+        if landing not in landings:
+            landings.append(landing)
+    return landings
 
 ################################################
 # FORCED JUMP LOGIC
@@ -582,13 +764,49 @@ def get_valid_moves(piece, only_jumps=False):
 
 def get_forced_jump_pieces(player_color):
     forced = []
-    for p in board_state:
-        if p.player == player_color:
-            moves = get_valid_moves(p, only_jumps=True)
-            if moves:
-                forced.append(p)
+    for sq in iter_squares(position.jumpers(player_color)):
+        p = piece_at(*square_coords(sq))
+        if p:
+            forced.append(p)
     return forced
 
+################################################
+# LEGAL MOVE CACHE
+################################################
+# Legal moves only change when a move is made, but the renderer, the click
+# handler and check_game_over all ask every frame/event. They read this
+# cache, which is rebuilt at most once per position: move_piece_on_board
+# and reset_game invalidate it, and it is also keyed on `turn`.
+
+def invalidate_move_cache():
+    """Drop the cached legal moves. Call whenever the position changes."""
+    global move_cache
+    move_cache = None
+
+def get_move_cache():
+    """
+    Return {"turn", "color", "forced", "turns", "moves"} for the side to
+    move, where "forced" are the sprites that must capture, "turns" the
+    complete legal Moves and "moves" their first hops as
+    get_all_player_moves() gives them. Recomputed only when invalid.
+    """
+    global move_cache
+    if move_cache is not None and move_cache["turn"] == turn:
+        move_cache_stats["hits"] += 1
+        return move_cache
+
+    color = get_current_turn()
+    turns = generate_moves(position, color)
+    move_cache = {
+        "turn": turn,
+        "color": color,
+        "forced": get_forced_jump_pieces(color),
+        "turns": turns,
+        "moves": first_hops(turns),
+    }
+    move_cache_stats["recomputes"] += 1
+    return move_cache
+
 ################################################
 # GAME OVER CHECK
 ################################################
@@ -596,8 +814,8 @@ def get_forced_jump_pieces(player_color):
 def check_game_over():
     global game_over, game_winner
 
-    white_left = any(p.player == WHITE for p in board_state)
-    black_left = any(p.player == BLACK for p in board_state)
+    white_left = position.count(WHITE) > 0
+    black_left = position.count(BLACK) > 0
 
     if not white_left:
         game_over = True
@@ -610,12 +828,20 @@ def check_game_over():
 
     # Check moves remaining
     if not game_over:
-        moves = get_all_player_moves(get_current_turn())
-        if not moves:
+        if not get_move_cache()["moves"]:
             game_over = True
             game_winner = "White" if get_current_turn() == BLACK else "Black"
             save_game_record()
 
+    # Few pieces left: stop kings shuffling forever in a known draw
+    if not game_over and TB_ADJUDICATE_DRAWS:
+        tb = get_tablebase()
+        result = tb.probe(position, get_current_turn()) if tb else None
+        if result and result[0] == DRAW:
+            game_over = True
+            game_winner = "Draw"
+            save_game_record()
+
 ################################################
 # BOARD LOGIC FOR SCALING
 ################################################
@@ -641,10 +867,7 @@ def scale_window(new_size):
     MENU_SCALE = UI_SCALE
 
     rescale_penguin_images()
-
-    for piece in board_state:
-        r, c = pixel_to_board(piece.location)
-        piece.update_location(board_to_pixel(r, c))
+    relayout_pieces()
 
 ################################################
 # LOGIC BOARD (debug helper)
@@ -652,12 +875,10 @@ def scale_window(new_size):
 
 def logic_board():
     board = [[None for _ in range(8)] for _ in range(8)]
-    for p in board_state:
-        r, c = pixel_to_board(p.location)
-        if p.king:
-            board[r][c] = ("Wk" if p.player == WHITE else "Bk")
-        else:
-            board[r][c] = ("W" if p.player == WHITE else "B")
+    for sq in iter_squares(position.white | position.black):
+        r, c = square_coords(sq)
+        label = "W" if position.color_at(sq) == WHITE else "B"
+        board[r][c] = label + "k" if position.is_king(sq) else label
     return board
 
 ################################################
@@ -677,21 +898,11 @@ def execute_move(piece, sr, sc, dr, dc):
 
     # is this a jump?
     is_jump = abs(dr - sr) == 2
+    was_king = piece.king
 
-    # Handle capture
-    if is_jump:
-        jumped = piece_at((sr + dr) // 2, (sc + dc) // 2)
-        if jumped and jumped in board_state:
-            board_state.remove(jumped)
-
-    # Move the piece
-    piece.update_location(board_to_pixel(dr, dc))
-
-    # Promote ONLY after a valid move, not while dragging
-    if piece.player == WHITE and dr == 0:
-        piece.make_king()
-    elif piece.player == BLACK and dr == 7:
-        piece.make_king()
+    # Capture + promotion are driven by the position; piece_grid still has
+    # the dragged sprite on its source square, whatever its pixel location
+    move_piece_on_board(sr, sc, dr, dc)
 
     # Log move
     record_move(piece, sr, sc, dr, dc, is_jump)
@@ -700,8 +911,9 @@ def execute_move(piece, sr, sc, dr, dc):
     jump_occurred = is_jump
     multi_jump = []
 
-    if is_jump:
-        # Only consider further jumps with this same piece
+    if is_jump and (was_king or not piece.king):
+        # Only consider further jumps with this same piece; being
+        # crowned ends the turn
         multi_jump = get_valid_moves(piece, only_jumps=True)
 
     if multi_jump:
@@ -739,80 +951,276 @@ def handle_drop(selected_piece, mouse_pos):
 
 
 ################################################
-# EASY AI
+# EASY / HARD AI (checkers.players)
 ################################################
 
 class easy_AI:
+    """Random legal moves; pick_jump follows the chosen multi-jump."""
     def __init__(self, color):
         self.color = color
+        self.player = RandomPlayer()
+        self.pending_hops = []  # rest of the multi-jump pick_move chose
+
+    def choose(self):
+        return self.player.choose(position, self.color, turn)
 
     def pick_move(self):
-        moves = get_all_player_moves(self.color)
-        if not moves:
+        move = self.choose()
+        if not move:
             return None
-        return random.choice(moves)
-
-################################################
-# HARD AI
-################################################
-
-class hard_AI:
+        (src, dst), *self.pending_hops = move.hops()
+        return piece_at(*square_coords(src)), square_coords(dst)
+
+    def pick_jump(self, piece, landings):
+        if self.pending_hops:
+            landing = square_coords(self.pending_hops.pop(0)[1])
+            if landing in landings:
+                return landing
+        return best_continuation(piece)
+
+class hard_AI(easy_AI):
+    """One-move heuristic (GreedyPlayer), perfect in tablebase endings."""
     def __init__(self, color):
-        self.color = color
+        super().__init__(color)
+        self.player = GreedyPlayer()
 
-    def evaluate_move(self, piece, r, c):
-        # Base score
-        score = 0
-        sr, sc = pixel_to_board(piece.location)
-        dr = r - sr
+    def choose(self):
+        # Endings the tablebase covers are played perfectly
+        return tablebase_turn(position, self.color) or super().choose()
 
-        # Prefer jumps
-        if abs(dr) == 2:
-            score += 10
-
-        # Prefer moving toward promotion
-        if piece.player == BLACK:
-            score += dr
-        else:
-            score -= dr
+################################################
+# DIFFICULTY LADDER (checkers.ladder)
+################################################
 
-        # Promote bonus
-        if piece.player == BLACK and r == 7:
-            score += 50
-        if piece.player == WHITE and r == 0:
-            score += 50
+class ladder_AI(easy_AI):
+    """
+    Ladder level 1-10: a search limited by the level's node budget, with
+    its evaluation noise, so it plays alike on any machine. Thinks in the
+    background worker like expert_AI.
+    """
+    def __init__(self, color, level):
+        super().__init__(color)
+        self.level = clamp_level(level)
+        self.player = LadderPlayer(level=self.level)
+        self.player.new_game()
+        self.timed = False          # time limit set on the first plan_moves
+
+    def plan_moves(self, pos, stop=None, ply=None):
+        # On the worker thread, which may wait for the launch calibration
+        if not self.timed:
+            self.player.time_ms = level_time_limit_ms(self.level, wait_nodes_per_second())
+            self.timed = True
+        move = self.player.choose(pos, self.color, ply, stop=stop)
+        return move.hops() if move else []
+
+def start_calibration():
+    """Measure (or read) this machine's search speed in a background thread."""
+    global calibration_thread
+
+    def work():
+        global nodes_per_second
+        nodes_per_second = calibrate(AI_CALIBRATION_FILE)
+        # Wake the event loop so a waiting "calibrating..." label is redrawn
+        pygame.event.post(pygame.event.Event(pygame.USEREVENT))
+
+    if nodes_per_second is None and calibration_thread is None:
+        calibration_thread = threading.Thread(target=work, name="calibration", daemon=True)
+        calibration_thread.start()
+
+def get_nodes_per_second():
+    """
+    This machine's search speed, measured once and then read from
+    AI_CALIBRATION_FILE; None while it is still being measured. Never
+    blocks, so the UI thread may call it every frame.
+    """
+    start_calibration()
+    return nodes_per_second
 
-        # Center control
-        if 2 <= r <= 5 and 2 <= c <= 5:
-            score += 3
+def wait_nodes_per_second():
+    """get_nodes_per_second(), waiting for the measurement. Not for the UI thread."""
+    start_calibration()
+    if calibration_thread is not None:
+        calibration_thread.join()
+    return nodes_per_second
 
-        # King bonus
-        if piece.king:
-            score += 5
+def set_ai_level(level):
+    """Play the difficulty ladder at `level`."""
+    global AI_DIFFICULTY, AI_LEVEL
+    AI_DIFFICULTY = "LEVEL"
+    AI_LEVEL = clamp_level(level)
 
-        # Slight randomness so it's not deterministic
-        score += random.uniform(0, 1)
+################################################
+# EXPERT AI (alpha-beta search)
+################################################
 
-        return score
+class expert_AI:
+    """
+    Iterative-deepening alpha-beta search within AI_TIME_BUDGET_MS, on
+    AI_WORKERS processes. The engine is shared for the session (see
+    get_search_engine); its tables are cleared when a new expert_AI is
+    built, so keep one instance per game (see get_ai_player).
+    """
+    def __init__(self, color, time_ms=None, tt_mb=None, workers=None):
+        self.color = color
+        self.time_ms = AI_TIME_BUDGET_MS if time_ms is None else time_ms
+        self.engine = get_search_engine(AI_WORKERS if workers is None else workers,
+                                        AI_TT_MB if tt_mb is None else tt_mb)
+        self.engine.new_game()
+        self.last_info = None   # search info, incl. "tt" hit rate / fill
+        self.pending_hops = []  # rest of the multi-jump pick_move chose
+
+    def _book_move(self, pos, ply):
+        if ply >= AI_BOOK_PLIES:
+            return None
+        book = get_opening_book()
+        move = book.choose_move(pos, self.color) if book else None
+        if move:
+            self.last_info = {"move": move, "book": True}
+        return move
+
+    def _choose(self, pos, ply, stop=None, chain_sq=None, time_ms=None):
+        """The Move to play: tablebase, then opening book, then search."""
+        if chain_sq is None:
+            move = tablebase_turn(pos, self.color)
+            if not move and ply is not None:
+                move = self._book_move(pos, ply)
+            if move:
+                return move
+        self.last_info = self.engine.search(pos, self.color, time_ms or self.time_ms,
+                                            chain_sq=chain_sq, stop=stop)
+        return self.last_info["move"]
 
     def pick_move(self):
-        moves = get_all_player_moves(self.color)
-        if not moves:
+        move = self._choose(position, turn)
+        if not move:
             return None
-
-        scored = []
-        for piece, (r, c) in moves:
-            scored.append((self.evaluate_move(piece, r, c), piece, (r, c)))
-
-        scored.sort(reverse=True, key=lambda x: x[0])
-        _, best_piece, best_move = scored[0]
-        return best_piece, best_move
+        (src, dst), *self.pending_hops = move.hops()
+        return piece_at(*square_coords(src)), square_coords(dst)
+
+    def pick_jump(self, piece, landings):
+        """Next landing of the multi-jump pick_move chose (searched if it ran out)."""
+        if self.pending_hops:
+            landing = square_coords(self.pending_hops.pop(0)[1])
+            if landing in landings:
+                return landing
+        move = self._choose(position, None, chain_sq=square_index(piece.row, piece.col))
+        if not move:
+            return best_continuation(piece)
+        return square_coords(move.path[1])
+
+    def plan_moves(self, pos, stop=None, ply=None, time_ms=None):
+        """
+        Thread-safe planning for the background worker: choose a Move
+        from `pos` (a private copy) and return it as [(src, dst), ...]
+        hops, a whole multi-jump included. Returns the best move found so
+        far once `stop` is set. `ply` is the turn number, for the book;
+        `time_ms` overrides the time budget (pondering runs until stopped).
+        """
+        move = self._choose(pos, ply, stop, time_ms=time_ms)
+        return move.hops() if move else []
+
+    def predict_reply(self, pos, stop=None):
+        """
+        The opponent's likely reply from `pos`: the move our last search
+        stored for it, else the result of a short search.
+        """
+        other = opponent(self.color)
+        moves = generate_moves(pos, other)
+        if len(moves) <= 1:
+            return moves[0] if moves else None
+        tt = getattr(self.engine, "tt", None)      # worker processes keep their own
+        entry = tt.probe(search_key(pos, other)) if tt else None
+        if entry:
+            for move in moves:
+                if move_key(move) == entry[3]:
+                    return move
+        return self.engine.search(pos, other, AI_PONDER_PREDICT_MS, stop=stop)["move"]
+
+def get_search_engine(workers, tt_mb):
+    """
+    The EXPERT search engine, rebuilt only when its settings change, so a
+    worker pool is started once and reused for every move and game.
+    """
+    global search_engine, search_engine_config
+    if search_engine is None or search_engine_config != (workers, tt_mb):
+        close_search_engine()
+        # Fork where possible: spawned workers would re-import this module
+        # and open a window each. But a fork copies only the calling thread,
+        # so a lock held by the calibration or AI thread stays held in the
+        # worker for good. The pool is forked at launch, before any thread
+        # starts (see __main__); a rebuild while threads run searches here.
+        fork = "fork" in multiprocessing.get_all_start_methods()
+        if workers > 1 and not (fork and threading.active_count() > 1):
+            search_engine = ParallelSearch(workers, tt_mb=tt_mb,
+                                           start_method="fork" if fork else None,
+                                           tablebase=AI_TABLEBASE_FILE if get_tablebase() else None)
+        else:
+            search_engine = AlphaBetaSearch(tt_mb=tt_mb, tablebase=get_tablebase())
+        search_engine_config = (workers, tt_mb)
+    return search_engine
+
+def close_search_engine():
+    """Shut down the worker pool, if the engine has one."""
+    global search_engine, search_engine_config
+    if hasattr(search_engine, "close"):
+        search_engine.close()
+    search_engine = None
+    search_engine_config = None
+
+def get_opening_book():
+    """The opening book, memory-mapped once; None if there is no book file."""
+    global opening_book
+    if opening_book is None:
+        try:
+            opening_book = OpeningBook(AI_BOOK_FILE)
+        except (OSError, ValueError):
+            opening_book = False    # don't retry every move
+    return opening_book or None
+
+def get_tablebase():
+    """The endgame tablebase, memory-mapped once; None if there is no file."""
+    global tablebase
+    if tablebase is None:
+        try:
+            tablebase = Tablebase(AI_TABLEBASE_FILE)
+        except (OSError, ValueError):
+            tablebase = False       # don't retry every move
+    return tablebase or None
+
+def tablebase_turn(pos, color):
+    """The tablebase's best Move for `color`, or None."""
+    tb = get_tablebase()
+    return tb.best_turn(pos, color) if tb else None
+
+def make_ai(difficulty, color, level=None):
+    if difficulty == "LEVEL":
+        return ladder_AI(color, AI_LEVEL if level is None else level)
+    if difficulty == "EASY":
+        return easy_AI(color)
+    if difficulty == "EXPERT":
+        return expert_AI(color)
+    return hard_AI(color)
+
+def get_ai_player():
+    """The AI for the current game; rebuilt when the difficulty, level or color changes."""
+    global ai_player, ai_player_config
+    config = (AI_DIFFICULTY, AI_LEVEL, AI_COLOR)
+    if ai_player is None or ai_player_config != config:
+        ai_player = make_ai(AI_DIFFICULTY, AI_COLOR, AI_LEVEL)
+        ai_player_config = config
+    return ai_player
 
 ################################################
 # AI TURN EXECUTION
 ################################################
 
 
+def best_continuation(piece):
+    """Next landing of an unplanned multi-jump: the chain taking the most pieces."""
+    chains = piece_moves(position, square_index(piece.row, piece.col), only_jumps=True)
+    best = max(chains, key=lambda move: popcount(move.captured))
+    return square_coords(best.path[1])
+
 def apply_ai_move(ai):
     global selected_piece, valid_moves
 
@@ -822,7 +1230,7 @@ def apply_ai_move(ai):
         return
 
     piece, (r, c) = move
-    sr, sc = pixel_to_board(piece.location)
+    sr, sc = piece.row, piece.col
 
     status = execute_move(piece, sr, sc, r, c)
 
@@ -831,28 +1239,179 @@ def apply_ai_move(ai):
         if not selected_piece or not valid_moves:
             break
 
-        # Simple choice: randomly pick next jump landing square
-        # (we could make this smarter later)
-        next_r, next_c = random.choice(valid_moves)
-        sr2, sc2 = pixel_to_board(selected_piece.location)
+        # Searching AIs choose the landing; others take the most pieces
+        if hasattr(ai, "pick_jump"):
+            next_r, next_c = ai.pick_jump(selected_piece, valid_moves)
+        else:
+            next_r, next_c = best_continuation(selected_piece)
+        sr2, sc2 = selected_piece.row, selected_piece.col
         status = execute_move(selected_piece, sr2, sc2, next_r, next_c)
 
 
 ################################################
-# MOVE LOGGING
+# BACKGROUND AI WORKER
 ################################################
+# AIs with plan_moves() think in a worker thread so the event loop keeps
+# drawing and handling input. The worker searches a copy of the position
+# and hands back the whole turn as (src, dst) squares; poll_ai_turn(),
+# called once per frame, starts the job and applies the result on the
+# main thread. cancel_ai_turn() (Reset, Menu, new game) stops the search
+# and drops the job, so a late result is never applied.
 
-def square_to_text(r, c):
-    # Convert board coordinates to algebraic notation (a1–h8)
-    file = "abcdefgh"[c]
-    rank = str(8 - r)
-    return file + rank
+AI_THREAD_SWITCH_INTERVAL = 0.001   # seconds; lets the UI thread grab the GIL sooner
 
-def record_move(piece, sr, sc, dr, dc, is_jump):
-    source = square_to_text(sr, sc)
-    dest = square_to_text(dr, dc)
+def ai_thinking():
+    return ai_job is not None
+
+def start_ai_turn(ai):
+    global ai_job
+    job = {"stop": threading.Event(), "plan": None}
+    snapshot = position.copy()
+    ply = turn
+
+    def work():
+        job["plan"] = ai.plan_moves(snapshot, job["stop"], ply)
+
+    job["thread"] = threading.Thread(target=work, name="ai-search", daemon=True)
+    job["switch_interval"] = sys.getswitchinterval()
+    sys.setswitchinterval(AI_THREAD_SWITCH_INTERVAL)
+    job["thread"].start()
+    ai_job = job
+
+def _finish_ai_job(job):
+    sys.setswitchinterval(job["switch_interval"])
+
+def cancel_ai_turn():
+    """Stop a background search or ponder (if any) and discard its result."""
+    global ai_job
+    cancel_ponder()
+    job = ai_job
+    if job is None:
+        return
+    ai_job = None
+    job["stop"].set()
+    # The search notices within ~1000 nodes (a parallel search within
+    # 10 ms); wait for it so two searches never share one engine's tables
+    job["thread"].join()
+    _finish_ai_job(job)
+
+def apply_ai_plan(plan):
+    """Play a planned turn [(src, dst), ...] through execute_move."""
+    status = None
+    for src, dst in plan:
+        sr, sc = square_coords(src)
+        piece = piece_at(sr, sc)
+        if not piece:
+            break
+        status = execute_move(piece, sr, sc, *square_coords(dst))
+        if status == "done" or game_over:
+            return
+
+    # Plan ran short of a multi-jump: finish it like apply_ai_move does
+    while status == "continue" and not game_over and selected_piece and valid_moves:
+        next_r, next_c = best_continuation(selected_piece)
+        status = execute_move(selected_piece, selected_piece.row, selected_piece.col,
+                              next_r, next_c)
+
+################################################
+# PONDERING
+################################################
+# While the human thinks, the AI guesses their reply (predict_reply) and
+# searches the position it leads to, with no time limit, in the same
+# kind of worker thread. When the human has moved, take_ponder_hit()
+# either keeps that search running as the AI's own (a hit: the time
+# already spent counts toward AI_TIME_BUDGET_MS, so a long think plays
+# at once) or stops it (a miss: the transposition table stays warm).
+
+def start_ponder(ai):
+    global ponder_job
+    job = {"stop": threading.Event(), "plan": None, "predicted": None,
+           "ply": turn + 1, "start": None}
+    snapshot = position.copy()
 
-    notation = f"{source}x{dest}" if is_jump else f"{source}-{dest}"
+    def work():
+        reply = ai.predict_reply(snapshot, job["stop"])
+        if reply is None or job["stop"].is_set():
+            return
+        snapshot.play(reply.path)
+        job["start"] = time.perf_counter()
+        job["predicted"] = snapshot.copy()
+        job["plan"] = ai.plan_moves(snapshot, job["stop"], job["ply"], AI_PONDER_MAX_MS)
+
+    job["thread"] = threading.Thread(target=work, name="ai-ponder", daemon=True)
+    job["switch_interval"] = sys.getswitchinterval()
+    sys.setswitchinterval(AI_THREAD_SWITCH_INTERVAL)
+    job["thread"].start()
+    ponder_job = job
+
+def cancel_ponder():
+    """Stop pondering (if any) and discard the result."""
+    global ponder_job
+    job = ponder_job
+    if job is None:
+        return
+    ponder_job = None
+    job["stop"].set()
+    # Wait it out: on a miss the AI's own search starts on the same engine
+    job["thread"].join()
+    _finish_ai_job(job)
+
+def take_ponder_hit(ai):
+    """
+    At the start of the AI's turn: if the ponder predicted this position,
+    make it the AI's search and return True; otherwise stop it.
+    """
+    global ponder_job, ai_job
+    job = ponder_job
+    if job is None:
+        return False
+    if job["predicted"] is None or job["ply"] != turn or job["predicted"] != position:
+        ponder_stats["misses"] += 1
+        cancel_ponder()
+        return False
+    ponder_stats["hits"] += 1
+    ponder_job = None
+    job["deadline"] = job["start"] + ai.time_ms / 1000.0
+    ai_job = job
+    return True
+
+def poll_ai_turn():
+    """
+    Once per frame in PvE: start the AI's search, or play its finished
+    move; on the human's turn, ponder.
+    """
+    global ai_job
+    if not game_vs_ai or game_over or settings_menu_active:
+        cancel_ponder()
+        return
+    if get_current_turn() != AI_COLOR:
+        if AI_PONDER and ponder_job is None and ai_job is None:
+            ai = get_ai_player()
+            if hasattr(ai, "predict_reply"):
+                start_ponder(ai)
+        return
+
+    ai = get_ai_player()
+    if not hasattr(ai, "plan_moves"):
+        apply_ai_move(ai)           # instant AIs just move
+        return
+
+    if ai_job is None:
+        if not take_ponder_hit(ai):
+            start_ai_turn(ai)
+    elif not ai_job["thread"].is_alive():
+        job, ai_job = ai_job, None
+        _finish_ai_job(job)
+        apply_ai_plan(job["plan"] or [])
+    elif "deadline" in ai_job and time.perf_counter() >= ai_job["deadline"]:
+        ai_job["stop"].set()        # a ponder hit has had its time
+
+################################################
+# MOVE LOGGING
+################################################
+
+def record_move(piece, sr, sc, dr, dc, is_jump):
+    notation = format_move(sr, sc, dr, dc, is_jump)
 
     move_record = {
         "turn": turn,
@@ -869,45 +1428,20 @@ def record_move(piece, sr, sc, dr, dc, is_jump):
 
 def snapshot_board():
     snap = []
-    for p in board_state:
-        r, c = pixel_to_board(p.location)
+    for sq in iter_squares(position.white | position.black):
+        r, c = square_coords(sq)
         snap.append({
             "row": r,
             "col": c,
-            "player": "W" if p.player == WHITE else "B",
-            "king": p.king
+            "player": "W" if position.color_at(sq) == WHITE else "B",
+            "king": position.is_king(sq)
         })
     return snap
 
 ################################################
 # REPLAY LOADING
 ################################################
-
-def load_replay_list():
-    # Ensure file exists
-    if not os.path.exists("replays.json"):
-        with open("replays.json", "w") as f:
-            json.dump({"games": []}, f)
-
-    with open("replays.json", "r") as f:
-        data = json.load(f)
-
-    # Support both:
-    #  - {"games": [ ... ]}
-    #  - [ ... ]   (old style)
-    if isinstance(data, list):
-        games = data
-    else:
-        games = data.get("games", [])
-
-    return games
-
-
-def load_replay_game(index):
-    games = load_replay_list()
-    if 0 <= index < len(games):
-        return games[index]
-    return None
+# load_replay_list / load_replay_game live in checkers.replay
 
 ################################################
 # REPLAY PLAYBACK ENGINE
@@ -927,75 +1461,28 @@ def start_replay(game_data):
         replay_active = False
         return
 
+    # Play back only what the rules accept: a corrupt or hand-edited
+    # record stops at its first illegal move instead of scrambling the board.
+    # Games saved before crowning ended a capture replay under the old rule.
     replay_active = True
-    replay_moves = moves
+    replay_moves = moves[:replay_hops(moves)]
     replay_index = 0
 
     reset_game()
 
 # --- Manual replay helpers ---
-def extract_move_token(move_entry):
-    """
-    Accepts multiple historical formats and returns a move token like 'c3-d4' or 'e5xf4'.
-
-    Supported:
-      - "c3-d4" (string)
-      - {"move": "c3-d4", ...}
-      - {"start": [sr, sc], "end": [dr, dc]}
-    """
-    # Already a string like "c3-d4" or "e5xf4"
-    if isinstance(move_entry, str):
-        return move_entry
-
-    if isinstance(move_entry, dict):
-        # New format with 'move'
-        if "move" in move_entry:
-            return move_entry["move"]
-
-        # Old coordinate format
-        if "start" in move_entry and "end" in move_entry:
-            sr, sc = move_entry["start"]
-            dr, dc = move_entry["end"]
-            return f"{algebraic_square(sr, sc)}-{algebraic_square(dr, dc)}"
-
-    # Unknown format
-    return None
-
 def apply_replay_move_index(idx):
     """Apply a single recorded move by index onto the current board."""
     if idx < 0 or idx >= len(replay_moves):
         return
 
-    move = replay_moves[idx]
-    token = extract_move_token(move)
-    if not token:
+    coords = parse_move_entry(replay_moves[idx])
+    if not coords:
         return
+    sr, sc, dr, dc = coords
 
-    # token like "c3-d4" or "e5xf4"
-    src = token[:2]
-    dst = token[-2:]
-
-    sr = 8 - int(src[1])
-    sc = "abcdefgh".index(src[0])
-    dr = 8 - int(dst[1])
-    dc = "abcdefgh".index(dst[0])
-
-    piece = piece_at(sr, sc)
-    if not piece:
-        return
-
-    # Handle capture (jump)
-    if abs(dr - sr) == 2:
-        jumped = piece_at((sr + dr) // 2, (sc + dc) // 2)
-        if jumped and jumped in board_state:
-            board_state.remove(jumped)
-
-    # Move the piece
-    piece.update_location(board_to_pixel(dr, dc))
-
-    # Promote if needed
-    if (piece.player == WHITE and dr == 0) or (piece.player == BLACK and dr == 7):
-        piece.king = True
+    # Move, capture and promote on the position and sprites together
+    move_piece_on_board(sr, sc, dr, dc)
 
 def reset_board_for_replay():
     """Reset the board to initial position, then apply moves up to replay_index."""
@@ -1010,7 +1497,7 @@ def reset_board_for_replay():
 
 
 def draw_replay_controls():
-    font = pygame.font.SysFont(None, int(32 * UI_SCALE))
+    font = get_font(int(32 * UI_SCALE))
 
     btn_h = int(45 * UI_SCALE)
     btn_w = int(140 * UI_SCALE)
@@ -1025,25 +1512,25 @@ def draw_replay_controls():
     # PREV
     pygame.draw.rect(screen, (100, 100, 200), btn_prev)
     pygame.draw.rect(screen, (150, 150, 255), btn_prev, 2)
-    screen.blit(font.render("Prev", True, (255, 255, 255)),
+    screen.blit(render_text(font, "Prev", True, (255, 255, 255)),
                 (btn_prev.centerx - 30, btn_prev.centery - 15))
 
     # NEXT
     pygame.draw.rect(screen, (100, 200, 100), btn_next)
     pygame.draw.rect(screen, (150, 255, 150), btn_next, 2)
-    screen.blit(font.render("Next", True, (255, 255, 255)),
+    screen.blit(render_text(font, "Next", True, (255, 255, 255)),
                 (btn_next.centerx - 30, btn_next.centery - 15))
 
     # RESTART
     pygame.draw.rect(screen, (200, 200, 100), btn_restart)
     pygame.draw.rect(screen, (255, 255, 150), btn_restart, 2)
-    screen.blit(font.render("Restart", True, (255, 255, 255)),
+    screen.blit(render_text(font, "Restart", True, (255, 255, 255)),
                 (btn_restart.centerx - 45, btn_restart.centery - 15))
 
     # EXIT
     pygame.draw.rect(screen, (200, 80, 80), btn_exit)
     pygame.draw.rect(screen, (255, 150, 150), btn_exit, 2)
-    screen.blit(font.render("Exit", True, (255, 255, 255)),
+    screen.blit(render_text(font, "Exit", True, (255, 255, 255)),
                 (btn_exit.centerx - 25, btn_exit.centery - 15))
 
     return btn_prev, btn_next, btn_restart, btn_exit
@@ -1055,36 +1542,15 @@ def replay_step():
         replay_active = False
         return
 
-    move = replay_moves[replay_index]
-    piece_color = WHITE if move["piece_color"] == "W" else BLACK
-
     # Convert algebraic notation to board coordinates
-    token = move["move"]
-    src = token[:2]
-    dst = token[-2:]
-
-    sr = 8 - int(src[1])
-    sc = "abcdefgh".index(src[0])
-    dr = 8 - int(dst[1])
-    dc = "abcdefgh".index(dst[0])
-
-    # Find piece at source
-    piece = piece_at(sr, sc)
-    if not piece:
+    coords = parse_move_entry(replay_moves[replay_index])
+    if not coords:
         replay_index += 1
         return
+    sr, sc, dr, dc = coords
 
-    # Perform move
-    if abs(dr - sr) == 2:  # jump
-        jumped = piece_at((sr + dr)//2, (sc + dc)//2)
-        if jumped:
-            board_state.remove(jumped)
-
-    piece.update_location(board_to_pixel(dr, dc))
-
-    # promote
-    if (piece.player == WHITE and dr == 0) or (piece.player == BLACK and dr == 7):
-        piece.make_king()
+    # Perform move (capture + promotion handled by the position)
+    move_piece_on_board(sr, sc, dr, dc)
 
     replay_index += 1
 
@@ -1109,9 +1575,9 @@ player2_user = None
 def draw_login_screen():
     screen.fill((30, 30, 30))
 
-    title_font = pygame.font.SysFont(None, int(60 * UI_SCALE))
-    field_font = pygame.font.SysFont(None, int(32 * UI_SCALE))
-    small_font = pygame.font.SysFont(None, int(24 * UI_SCALE))
+    title_font = get_font(int(60 * UI_SCALE))
+    field_font = get_font(int(32 * UI_SCALE))
+    small_font = get_font(int(24 * UI_SCALE))
 
     if pending_mode == "pvp":
         if login_stage == 1:
@@ -1123,7 +1589,7 @@ def draw_login_screen():
     else:
         title_text = "Login / Register"
 
-    title = title_font.render(title_text, True, (255, 255, 255))
+    title = render_text(title_font, title_text, True, (255, 255, 255))
 
     screen.blit(title, (SCREEN_WIDTH//2 - title.get_width()//2, 50))
 
@@ -1134,35 +1600,35 @@ def draw_login_screen():
     # Username
     user_rect = pygame.Rect(start_x, 150, box_w, box_h)
     pygame.draw.rect(screen, (200, 200, 200), user_rect, 2)
-    screen.blit(field_font.render("Username:", True, (200, 200, 200)),
+    screen.blit(render_text(field_font, "Username:", True, (200, 200, 200)),
                 (user_rect.x, user_rect.y - 30))
-    screen.blit(field_font.render(login_username, True, (255, 255, 255)),
+    screen.blit(render_text(field_font, login_username, True, (255, 255, 255)),
                 (user_rect.x + 8, user_rect.y + 5))
 
     # Password
     pass_rect = pygame.Rect(start_x, 230, box_w, box_h)
     pygame.draw.rect(screen, (200, 200, 200), pass_rect, 2)
-    screen.blit(field_font.render("Password:", True, (200, 200, 200)),
+    screen.blit(render_text(field_font, "Password:", True, (200, 200, 200)),
                 (pass_rect.x, pass_rect.y - 30))
     hidden = "*" * len(login_password)
-    screen.blit(field_font.render(hidden, True, (255, 255, 255)),
+    screen.blit(render_text(field_font, hidden, True, (255, 255, 255)),
                 (pass_rect.x + 8, pass_rect.y + 5))
 
     # Login button
     login_rect = pygame.Rect(start_x, 310, box_w, box_h)
     pygame.draw.rect(screen, (0, 140, 255), login_rect)
-    screen.blit(field_font.render("Login", True, (255, 255, 255)),
+    screen.blit(render_text(field_font, "Login", True, (255, 255, 255)),
                 (login_rect.centerx - 40, login_rect.centery - 15))
 
     # Register button
     reg_rect = pygame.Rect(start_x, 370, box_w, box_h)
     pygame.draw.rect(screen, (0, 180, 120), reg_rect)
-    screen.blit(field_font.render("Register", True, (255, 255, 255)),
+    screen.blit(render_text(field_font, "Register", True, (255, 255, 255)),
                 (reg_rect.centerx - 55, reg_rect.centery - 15))
 
     # Status message
     if login_message:
-        msg = small_font.render(login_message, True, (255, 180, 180))
+        msg = render_text(small_font, login_message, True, (255, 180, 180))
         screen.blit(msg, (SCREEN_WIDTH//2 - msg.get_width()//2, 430))
 
     return user_rect, pass_rect, login_rect, reg_rect
@@ -1178,11 +1644,11 @@ def draw_start_menu():
     screen.fill((40, 40, 40))
 
     # Title font and menu font scale with UI_SCALE
-    font_big = pygame.font.SysFont(None, int(72 * UI_SCALE))
-    font_small = pygame.font.SysFont(None, int(40 * UI_SCALE))
+    font_big = get_font(int(72 * UI_SCALE))
+    font_small = get_font(int(40 * UI_SCALE))
 
     # ----- Title -----
-    title_surf = font_big.render("Penguin Checkers", True, (255, 255, 255))
+    title_surf = render_text(font_big, "Penguin Checkers", True, (255, 255, 255))
     screen.blit(
         title_surf,
         (SCREEN_WIDTH // 2 - title_surf.get_width() // 2,
@@ -1200,19 +1666,22 @@ def draw_start_menu():
     btn_pvp    = pygame.Rect(x, first_y + 0 * (btn_h + spacing), btn_w, btn_h)
     btn_easy   = pygame.Rect(x, first_y + 1 * (btn_h + spacing), btn_w, btn_h)
     btn_hard   = pygame.Rect(x, first_y + 2 * (btn_h + spacing), btn_w, btn_h)
-    btn_replay = pygame.Rect(x, first_y + 3 * (btn_h + spacing), btn_w, btn_h)
+    btn_expert = pygame.Rect(x, first_y + 3 * (btn_h + spacing), btn_w, btn_h)
+    btn_replay = pygame.Rect(x, first_y + 4 * (btn_h + spacing), btn_w, btn_h)
 
     # ----- Button backgrounds -----
     pygame.draw.rect(screen, ( 80,  80, 200), btn_pvp)
     pygame.draw.rect(screen, ( 80, 200,  80), btn_easy)
     pygame.draw.rect(screen, (200,  80,  80), btn_hard)
+    pygame.draw.rect(screen, (150,  60, 160), btn_expert)
     pygame.draw.rect(screen, (100, 100, 100), btn_replay)
 
     # ----- Text surfaces -----
-    txt_pvp    = font_small.render("Human vs Human",      True, (255, 255, 255))
-    txt_easy   = font_small.render("Human vs AI (Easy)",  True, (255, 255, 255))
-    txt_hard   = font_small.render("Human vs AI (Hard)",  True, (255, 255, 255))
-    txt_replay = font_small.render("View Replays",        True, (255, 255, 255))
+    txt_pvp    = render_text(font_small, "Human vs Human",      True, (255, 255, 255))
+    txt_easy   = render_text(font_small, "Human vs AI (Easy)",  True, (255, 255, 255))
+    txt_hard   = render_text(font_small, "Human vs AI (Hard)",  True, (255, 255, 255))
+    txt_expert = render_text(font_small, "Human vs AI (Expert)", True, (255, 255, 255))
+    txt_replay = render_text(font_small, "View Replays",        True, (255, 255, 255))
 
     # Helper to center text in a rect
     def blit_center(text_surf, rect):
@@ -1225,12 +1694,14 @@ def draw_start_menu():
     blit_center(txt_pvp,    btn_pvp)
     blit_center(txt_easy,   btn_easy)
     blit_center(txt_hard,   btn_hard)
+    blit_center(txt_expert, btn_expert)
     blit_center(txt_replay, btn_replay)
 
     # Store for clicks
     menu_buttons["pvp"]    = btn_pvp
     menu_buttons["easy"]   = btn_easy
     menu_buttons["hard"]   = btn_hard
+    menu_buttons["expert"] = btn_expert
     menu_buttons["replay"] = btn_replay
 
 ################################################
@@ -1241,39 +1712,62 @@ settings_menu_active = False
 
 def draw_settings_menu():
     menu_w = int(400 * MENU_SCALE)
-    menu_h = int(300 * MENU_SCALE)
+    menu_h = int(340 * MENU_SCALE)
     x = (SCREEN_WIDTH - menu_w)//2
     y = (SCREEN_HEIGHT - menu_h)//2
 
     pygame.draw.rect(screen, (220, 220, 220), (x, y, menu_w, menu_h))
     pygame.draw.rect(screen, (100, 100, 100), (x, y, menu_w, menu_h), 4)
 
-    font = pygame.font.SysFont(None, int(40 * MENU_SCALE))
+    font = get_font(int(40 * MENU_SCALE))
 
-    title = font.render("Settings", True, (0, 0, 0))
+    title = render_text(font, "Settings", True, (0, 0, 0))
     screen.blit(title, (x + menu_w//2 - title.get_width()//2, y + 20))
 
     # Close button
     btn_close = pygame.Rect(x + menu_w - int(45 * MENU_SCALE), y + 10,
                             int(35 * MENU_SCALE), int(35 * MENU_SCALE))
     pygame.draw.rect(screen, (200, 50, 50), btn_close)
-    screen.blit(font.render("X", True, (255, 255, 255)),
+    screen.blit(render_text(font, "X", True, (255, 255, 255)),
                 (btn_close.centerx - 10, btn_close.centery - 18))
 
-    # AI difficulty: Easy
-    btn_easy = pygame.Rect(x + 50, y + 100, 120, 50)
-    pygame.draw.rect(screen, (100, 200, 100) if AI_DIFFICULTY == "EASY" else (60, 120, 60), btn_easy)
-    screen.blit(font.render("Easy", True, (0, 0, 0)), (btn_easy.x + 10, btn_easy.y + 5))
+    # AI difficulty: ladder level, - / +
+    on_ladder = AI_DIFFICULTY == "LEVEL"
+    btn_level_down = pygame.Rect(x + 50, y + 100, 50, 50)
+    btn_level_up = pygame.Rect(x + menu_w - 100, y + 100, 50, 50)
+    level_box = pygame.Rect(btn_level_down.right + 10, y + 100,
+                            btn_level_up.left - btn_level_down.right - 20, 50)
+    pygame.draw.rect(screen, (100, 200, 100) if on_ladder else (60, 120, 60), level_box)
+    for btn, label in ((btn_level_down, "-"), (btn_level_up, "+")):
+        pygame.draw.rect(screen, (160, 160, 160), btn)
+        text = render_text(font, label, True, (0, 0, 0))
+        screen.blit(text, (btn.centerx - text.get_width()//2, btn.centery - text.get_height()//2))
+    text = render_text(font, f"Level {AI_LEVEL}", True, (0, 0, 0))
+    screen.blit(text, (level_box.centerx - text.get_width()//2,
+                       level_box.centery - text.get_height()//2))
+
+    # Expected thinking time for the level on this machine
+    small = get_font(int(26 * MENU_SCALE))
+    nps = get_nodes_per_second()
+    if nps is None:
+        label = "calibrating..."
+    else:
+        label = f"about {level_time_ms(AI_LEVEL, nps) / 1000.0:.1f} s per move"
+    text = render_text(small, label, True, (60, 60, 60))
+    screen.blit(text, (x + menu_w//2 - text.get_width()//2, y + 165))
 
-    # AI difficulty: Hard
-    btn_hard = pygame.Rect(x + 50, y + 180, 120, 50)
-    pygame.draw.rect(screen, (200, 120, 120) if AI_DIFFICULTY == "HARD" else (120, 60, 60), btn_hard)
-    screen.blit(font.render("Hard", True, (0, 0, 0)), (btn_hard.x + 10, btn_hard.y + 5))
+    # AI difficulty: Expert (alpha-beta search)
+    btn_expert = pygame.Rect(x + 50, y + 260, 120, 50)
+    pygame.draw.rect(screen, (190, 130, 210) if AI_DIFFICULTY == "EXPERT" else (100, 60, 120), btn_expert)
+    screen.blit(render_text(font, "Expert", True, (0, 0, 0)),
+                (btn_expert.x + 10, btn_expert.y + 5))
 
     # store for click detection
     menu_buttons["settings_close"] = btn_close
-    menu_buttons["settings_easy"] = btn_easy
-    menu_buttons["settings_hard"] = btn_hard
+    menu_buttons["settings_level"] = level_box
+    menu_buttons["settings_level_down"] = btn_level_down
+    menu_buttons["settings_level_up"] = btn_level_up
+    menu_buttons["settings_expert"] = btn_expert
 
 
 ################################################
@@ -1284,20 +1778,8 @@ def draw_settings_menu():
 # TOP UI BAR + BUTTONS
 ################################################
 
-def draw_ui_buttons():
-    # Draw the gray UI bar across the top
-    pygame.draw.rect(screen, (50, 50, 50), (0, 0, SCREEN_WIDTH, UI_SPACE_HEIGHT))
-    pygame.draw.rect(screen, (100, 100, 100), (0, 0, SCREEN_WIDTH, UI_SPACE_HEIGHT), 4)
-
-    font_size = int(36 * UI_SCALE)
-    ui_font = pygame.font.SysFont(None, font_size)
-
-    # Turn indicator text on the left
-    turn_text = ui_font.render(f"Turn: {'White' if turn % 2 == 0 else 'Black'}",
-                               True, (255, 255, 255))
-    screen.blit(turn_text, (10 * UI_SCALE, 10 * UI_SCALE))
-
-    # Buttons on the right side of the bar
+def ui_button_rects():
+    """The (Menu, Reset, Replay) button rects in the top bar."""
     button_w = int(100 * UI_SCALE)
     button_h = int(40 * UI_SCALE)
     padding = int(10 * UI_SCALE)
@@ -1323,44 +1805,127 @@ def draw_ui_buttons():
         button_w,
         button_h
     )
+    return menu_button, reset_button, replay_button
+
+
+def draw_ui_chrome(surface):
+    """The static part of the top bar: background, border and buttons."""
+    pygame.draw.rect(surface, (50, 50, 50), (0, 0, SCREEN_WIDTH, UI_SPACE_HEIGHT))
+    pygame.draw.rect(surface, (100, 100, 100), (0, 0, SCREEN_WIDTH, UI_SPACE_HEIGHT), 4)
+
+    ui_font = get_font(int(36 * UI_SCALE))
+    menu_button, reset_button, replay_button = ui_button_rects()
 
     # Menu button visuals
-    pygame.draw.rect(screen, (50, 50, 150), menu_button)
-    pygame.draw.rect(screen, (100, 100, 200), menu_button, 2)
-    menu_text = ui_font.render("Menu", True, (255, 255, 255))
-    screen.blit(menu_text,
-                (menu_button.centerx - menu_text.get_width() // 2,
-                 menu_button.centery - menu_text.get_height() // 2))
+    pygame.draw.rect(surface, (50, 50, 150), menu_button)
+    pygame.draw.rect(surface, (100, 100, 200), menu_button, 2)
+    menu_text = render_text(ui_font, "Menu", True, (255, 255, 255))
+    surface.blit(menu_text,
+                 (menu_button.centerx - menu_text.get_width() // 2,
+                  menu_button.centery - menu_text.get_height() // 2))
 
     # Reset button visuals
-    pygame.draw.rect(screen, (150, 50, 50), reset_button)
-    pygame.draw.rect(screen, (200, 100, 100), reset_button, 2)
-    reset_text = ui_font.render("Reset", True, (255, 255, 255))
-    screen.blit(reset_text,
-                (reset_button.centerx - reset_text.get_width() // 2,
-                 reset_button.centery - reset_text.get_height() // 2))
+    pygame.draw.rect(surface, (150, 50, 50), reset_button)
+    pygame.draw.rect(surface, (200, 100, 100), reset_button, 2)
+    reset_text = render_text(ui_font, "Reset", True, (255, 255, 255))
+    surface.blit(reset_text,
+                 (reset_button.centerx - reset_text.get_width() // 2,
+                  reset_button.centery - reset_text.get_height() // 2))
 
     # Replay button visuals
-    pygame.draw.rect(screen, (50, 150, 50), replay_button)
-    pygame.draw.rect(screen, (100, 200, 100), replay_button, 2)
-    replay_text = ui_font.render("Replay", True, (255, 255, 255))
-    screen.blit(replay_text,
-                (replay_button.centerx - replay_text.get_width() // 2,
-                 replay_button.centery - replay_text.get_height() // 2))
+    pygame.draw.rect(surface, (50, 150, 50), replay_button)
+    pygame.draw.rect(surface, (100, 200, 100), replay_button, 2)
+    replay_text = render_text(ui_font, "Replay", True, (255, 255, 255))
+    surface.blit(replay_text,
+                 (replay_button.centerx - replay_text.get_width() // 2,
+                  replay_button.centery - replay_text.get_height() // 2))
 
-    return menu_button, reset_button, replay_button
+
+def draw_ui_buttons():
+    # Bar and buttons from the cached background, then the live text
+    draw_background((0, 0, SCREEN_WIDTH, UI_SPACE_HEIGHT))
+
+    font_size = int(36 * UI_SCALE)
+    ui_font = get_font(font_size)
+
+    # Turn indicator text on the left
+    turn_text = render_text(ui_font, f"Turn: {'White' if turn % 2 == 0 else 'Black'}",
+                               True, (255, 255, 255))
+    screen.blit(turn_text, (10 * UI_SCALE, 10 * UI_SCALE))
+
+    # AI search running in the background
+    if ai_thinking():
+        thinking_text = render_text(ui_font, "Thinking...", True, (255, 215, 0))
+        screen.blit(thinking_text,
+                    (10 * UI_SCALE + turn_text.get_width() + 20 * UI_SCALE, 10 * UI_SCALE))
+
+    return ui_button_rects()
 
 
 ################################################
-# SCALING
+# BOARD BACKGROUND (pre-rendered)
 ################################################
-def draw_board():
+# The tiles and the top bar chrome only change when the window is
+# resized, so they are drawn once into an off-screen Surface the size of
+# the window and blitted from there: one blit per frame (or per dirty
+# rect) instead of 64 draw.rect calls. scale_window() drops it on
+# VIDEORESIZE and get_board_background() rebuilds it at the new size.
+# Layers drawn over the board (pieces, highlights, text) composite onto
+# this.
+
+board_background = None     # Surface of the window: black margins, tiles, top bar chrome
+background_stats = {"builds": 0}
+
+
+def render_board_background():
+    surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+    surface.fill((0, 0, 0))
     for row in range(ROWS):
         for col in range(ROWS):
             x = BOARD_OFFSET_X + col * TILE_SIZE
             y = UI_SPACE_HEIGHT + row * TILE_SIZE
             color = WHITE_TILE if (row + col) % 2 == 0 else BLUE_TILE
-            pygame.draw.rect(screen, color, (x, y, TILE_SIZE, TILE_SIZE))
+            pygame.draw.rect(surface, color, (x, y, TILE_SIZE, TILE_SIZE))
+    draw_ui_chrome(surface)
+    background_stats["builds"] += 1
+    return surface
+
+
+def get_board_background():
+    global board_background
+    if board_background is None:
+        board_background = render_board_background()
+    return board_background
+
+
+def invalidate_board_background():
+    global board_background
+    board_background = None
+
+
+def draw_background(area=None):
+    """Blit the background, or the part of it under `area` (x, y, w, h)."""
+    if area is None:
+        screen.blit(get_board_background(), (0, 0))
+    else:
+        screen.blit(get_board_background(), area[:2], pygame.Rect(area))
+
+
+################################################
+# SCALING
+################################################
+def draw_board(area=None):
+    """Draw the tiles, or only the part overlapping `area` (x, y, w, h)."""
+    board = (BOARD_OFFSET_X, UI_SPACE_HEIGHT, BOARD_SIZE, BOARD_SIZE)
+    if area:
+        x = max(board[0], area[0])
+        y = max(board[1], area[1])
+        w = min(board[0] + board[2], area[0] + area[2]) - x
+        h = min(board[1] + board[3], area[1] + area[3]) - y
+        if w <= 0 or h <= 0:
+            return
+        board = (x, y, w, h)
+    draw_background(board)
 
 
 def draw_all_pieces():
@@ -1371,10 +1936,6 @@ def scale_window(new_size):
     global SCREEN_WIDTH, SCREEN_HEIGHT, TILE_SIZE, BOARD_SIZE, BOARD_OFFSET_X
     global UI_SPACE_HEIGHT, screen, UI_SCALE, MENU_SCALE
 
-    old_tile = TILE_SIZE
-    old_offset_x = BOARD_OFFSET_X
-    old_ui = UI_SPACE_HEIGHT
-
     SCREEN_WIDTH, SCREEN_HEIGHT = new_size
     SCREEN_HEIGHT = max(SCREEN_HEIGHT, 500)
 
@@ -1390,19 +1951,14 @@ def scale_window(new_size):
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.RESIZABLE)
 
     rescale_penguin_images()
+    invalidate_board_background()
+    clear_text_caches()
 
-    # reposition pieces
-    for p in board_state:
-        x, y = p.location
-        old_col = int((x - old_offset_x) // old_tile)
-        old_row = int((y - old_ui) // old_tile)
-        if 0 <= old_row < 8 and 0 <= old_col < 8:
-            new_x = BOARD_OFFSET_X + old_col * TILE_SIZE + TILE_SIZE//2
-            new_y = UI_SPACE_HEIGHT + old_row * TILE_SIZE + TILE_SIZE//2
-            p.location = (new_x, new_y)
-            p.radius = TILE_SIZE//3
-            p.update_rect()
+    # reposition pieces from the square index (also fixes a piece that is
+    # mid-drag, whose pixel location says nothing about its square)
+    relayout_pieces()
 
+    invalidate_frame()
     pygame.display.flip()
 
 
@@ -1412,10 +1968,10 @@ def scale_window(new_size):
 
 def draw_replay_file_list():
     screen.fill((20, 20, 20))
-    font_big = pygame.font.SysFont(None, int(60 * UI_SCALE))
-    font_small = pygame.font.SysFont(None, int(32 * UI_SCALE))
+    font_big = get_font(int(60 * UI_SCALE))
+    font_small = get_font(int(32 * UI_SCALE))
 
-    title = font_big.render("Replay Files", True, (255, 255, 255))
+    title = render_text(font_big, "Replay Files", True, (255, 255, 255))
     screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 40))
 
     # Exit / Back button (top-right)
@@ -1428,7 +1984,7 @@ def draw_replay_file_list():
     pygame.draw.rect(screen, (180, 50, 50), exit_rect)
     pygame.draw.rect(screen, (250, 120, 120), exit_rect, 2)
 
-    exit_text = font_small.render("Back", True, (255, 255, 255))
+    exit_text = render_text(font_small, "Back", True, (255, 255, 255))
     screen.blit(
         exit_text,
         (exit_rect.centerx - exit_text.get_width() // 2,
@@ -1453,7 +2009,7 @@ def draw_replay_file_list():
 
         label = f"{idx + 1}: {white_name} vs {black_name} (winner: {winner})"
 
-        screen.blit(font_small.render(label, True, (255, 255, 255)),
+        screen.blit(render_text(font_small, label, True, (255, 255, 255)),
                     (rect.x + 10, rect.y + 15))
 
         buttons.append((rect, idx))
@@ -1463,7 +2019,7 @@ def draw_replay_file_list():
     return buttons, exit_rect
 
 def draw_replay_exit_button():
-    font = pygame.font.SysFont(None, int(32 * UI_SCALE))
+    font = get_font(int(32 * UI_SCALE))
     w = int(150 * UI_SCALE)
     h = int(50 * UI_SCALE)
     x = SCREEN_WIDTH - w - 20
@@ -1473,25 +2029,289 @@ def draw_replay_exit_button():
     pygame.draw.rect(screen, (180, 50, 50), rect)
     pygame.draw.rect(screen, (250, 120, 120), rect, 2)
 
-    text = font.render("Exit Replay", True, (255, 255, 255))
+    text = render_text(font, "Exit Replay", True, (255, 255, 255))
     screen.blit(text, (rect.centerx - text.get_width()//2,
                        rect.centery - text.get_height()//2))
     return rect
 
 
+
+################################################
+# FRAME RENDERING (dirty rectangles)
+################################################
+# The game board is only repainted where something changed. board_scene()
+# lists what the board screen shows as {key: (rect, state)}: each piece,
+# the move/forced/selected highlights and the top bar. An item that
+# appeared, disappeared or changed state marks its old and new rects
+# dirty; those are repainted (clipped) and pushed with display.update(),
+# so an idle board costs nothing and a drag repaints two piece-sized
+# areas. Menus, replays, the settings menu and the game-over overlay
+# still draw the whole window and flip; invalidate_frame() forces a full
+# repaint (resize).
+
+DIRTY_RENDERING = True      # False: redraw the whole window every frame
+last_scene = None           # board_scene() on screen, None = repaint everything
+render_stats = {"frames": 0, "full": 0, "rects": 0, "pixels": 0}
+game_over_overlay = None    # (window size, Surface) for the game-over dimming
+
+
+def invalidate_frame():
+    global last_scene
+    last_scene = None
+
+
+def piece_bounds(location):
+    """(x, y, w, h) covering a piece drawn at `location` and its highlight ring."""
+    half = max(TILE_SIZE // 2, TILE_SIZE // 3 + 6) + 1
+    x, y = location
+    return (int(x) - half, int(y) - half, 2 * half, 2 * half)
+
+
+def rects_overlap(a, b):
+    return (a[0] < b[0] + b[2] and b[0] < a[0] + a[2]
+            and a[1] < b[1] + b[3] and b[1] < a[1] + a[3])
+
+
+def merge_rects(rects):
+    """Union overlapping (x, y, w, h) rects so no area is repainted twice."""
+    merged = []
+    for rect in rects:
+        while True:
+            for other in merged:
+                if rects_overlap(rect, other):
+                    merged.remove(other)
+                    x = min(rect[0], other[0])
+                    y = min(rect[1], other[1])
+                    rect = (x, y,
+                            max(rect[0] + rect[2], other[0] + other[2]) - x,
+                            max(rect[1] + rect[3], other[1] + other[3]) - y)
+                    break
+            else:
+                break
+        merged.append(rect)
+    return merged
+
+
+def board_scene():
+    """What the board screen shows: {key: (rect, state)}."""
+    scene = {("bar",): ((0, 0, SCREEN_WIDTH, UI_SPACE_HEIGHT), (turn % 2, ai_thinking()))}
+    for p in board_state:
+        scene["piece", id(p)] = (piece_bounds(p.location), (p.location, p.player, p.king))
+    if selected_piece:
+        for r, c in valid_moves:
+            x, y = board_to_pixel(r, c)
+            scene["move", r, c] = ((x - TILE_SIZE // 2, y - TILE_SIZE // 2,
+                                    TILE_SIZE, TILE_SIZE), True)
+        scene["selected",] = (piece_bounds(selected_piece.location), selected_piece.location)
+    for p in get_move_cache()["forced"]:
+        scene["forced", id(p)] = (piece_bounds(p.location), p.location)
+    return scene
+
+
+def dirty_regions(old, new):
+    """Merged rects to repaint to turn scene `old` into scene `new`."""
+    rects = []
+    for key, (rect, state) in new.items():
+        before = old.get(key)
+        if before != (rect, state):
+            rects.append(rect)
+            if before:
+                rects.append(before[0])
+    rects.extend(rect for key, (rect, _) in old.items() if key not in new)
+    return merge_rects(rects)
+
+
+def draw_highlights(area=None):
+    """Move, forced-piece and selection highlights (only those overlapping `area`)."""
+    def visible(rect):
+        return area is None or rects_overlap(rect, area)
+
+    # highlight valid moves
+    if selected_piece:
+        for r, c in valid_moves:
+            center = board_to_pixel(r, c)
+            if visible(piece_bounds(center)):
+                pygame.draw.circle(screen, (255, 255, 0), center, TILE_SIZE//6)
+
+    # highlight forced pieces
+    for p in get_move_cache()["forced"]:
+        if visible(piece_bounds(p.location)):
+            pygame.draw.circle(screen, (255, 255, 0),
+                               p.location, p.radius + 5, 3)
+
+    # highlight selected
+    if selected_piece and visible(piece_bounds(selected_piece.location)):
+        pygame.draw.circle(screen, (255, 0, 0),
+                           selected_piece.location, selected_piece.radius + 5, 3)
+
+
+def repaint(area):
+    """Redraw everything on the board screen inside `area` (x, y, w, h)."""
+    screen.set_clip(pygame.Rect(area))
+    draw_background(area)
+    for p in board_state:
+        if rects_overlap(piece_bounds(p.location), area):
+            p.draw_self()
+    if rects_overlap((0, 0, SCREEN_WIDTH, UI_SPACE_HEIGHT), area):
+        draw_ui_buttons()
+    draw_highlights(area)
+    screen.set_clip(None)
+
+
+def get_game_over_overlay():
+    """The translucent black Surface dimming the board, one per window size."""
+    global game_over_overlay
+    size = (SCREEN_WIDTH, SCREEN_HEIGHT)
+    if game_over_overlay is None or game_over_overlay[0] != size:
+        overlay = pygame.Surface(size)
+        overlay.set_alpha(180)
+        overlay.fill((0, 0, 0))
+        game_over_overlay = (size, overlay)
+    return game_over_overlay[1]
+
+
+def draw_full_frame():
+    screen.fill((0, 0, 0))
+
+    if login_active:
+        draw_login_screen()
+    elif start_menu_active:
+        draw_start_menu()
+    elif replay_select_active:
+        draw_replay_file_list()
+    elif replay_active:
+        draw_board()
+        draw_all_pieces()
+        draw_replay_controls()
+
+    else:
+        draw_background()
+        draw_all_pieces()
+        draw_ui_buttons()
+        draw_highlights()
+
+        # show settings menu on top
+        if settings_menu_active:
+            draw_settings_menu()
+
+        # game over
+        if game_over:
+            screen.blit(get_game_over_overlay(), (0, 0))
+
+            end_font = get_font(int(60 * UI_SCALE))
+            message = "Draw" if game_winner == "Draw" else f"{game_winner} Wins!"
+            text = render_text(end_font, f"Game Over — {message}", True, (255, 255, 255))
+            screen.blit(text, (SCREEN_WIDTH//2 - text.get_width()//2,
+                               SCREEN_HEIGHT//2 - text.get_height()//2))
+
+
+def draw_frame():
+    """Draw this frame: dirty rects on the plain board screen, else the whole window."""
+    global last_scene
+    render_stats["frames"] += 1
+    board_only = not (login_active or start_menu_active or replay_select_active
+                      or replay_active or settings_menu_active or game_over)
+    if not (DIRTY_RENDERING and board_only):
+        draw_full_frame()
+        pygame.display.flip()
+        last_scene = None
+        render_stats["full"] += 1
+        render_stats["pixels"] += SCREEN_WIDTH * SCREEN_HEIGHT
+        return
+
+    scene = board_scene()
+    if last_scene is None:
+        rects = [(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)]
+        render_stats["full"] += 1
+    else:
+        rects = dirty_regions(last_scene, scene)
+    last_scene = scene
+    for rect in rects:
+        repaint(rect)
+    if rects:
+        pygame.display.update([pygame.Rect(rect) for rect in rects])
+        render_stats["rects"] += len(rects)
+        render_stats["pixels"] += sum(w * h for _, _, w, h in rects)
+
+
+################################################
+# MAIN LOOP PACING (event-driven)
+################################################
+# Between events nothing on screen changes unless a piece is being
+# dragged or the AI is working, so the loop sleeps in pygame.event.wait()
+# instead of redrawing at a fixed 60 FPS, and draws a frame only when an
+# event or the AI changed something. Dragging, and the iteration right
+# after a change (the AI may start a search or ponder), run at the capped
+# FRAME_RATE; while the AI searches the loop wakes every AI_POLL_MS to
+# pick up its move; otherwise it wakes every IDLE_WAKE_MS regardless.
+
+FRAME_RATE = 60             # frame cap while dragging or settling after a change
+AI_POLL_MS = 50             # wake-up interval while the AI searches
+IDLE_WAKE_MS = 1000         # longest sleep with nothing happening
+loop_stats = {"iterations": 0, "sleeps": 0, "frames": 0}
+
+
+def next_events(changed):
+    """
+    The events for the next loop iteration. Sleeps until there are some
+    (or a timeout) unless the last iteration changed something or a piece
+    is being dragged.
+    """
+    loop_stats["iterations"] += 1
+    if changed or dragging:
+        clock.tick(FRAME_RATE)
+        return pygame.event.get()
+    loop_stats["sleeps"] += 1
+    event = pygame.event.wait(AI_POLL_MS if ai_thinking() else IDLE_WAKE_MS)
+    if event.type == pygame.NOEVENT:
+        return []
+    return [event] + pygame.event.get()
+
+
+def event_changes_frame(event):
+    """Whether handling `event` can change what is on screen."""
+    return event.type != pygame.MOUSEMOTION or dragging
+
+
+def update_ai():
+    """poll_ai_turn() outside the menus; True if it started, stopped or played anything."""
+    if login_active or start_menu_active or replay_select_active or replay_active:
+        return False
+    job, ponder, ply, over = ai_job, ponder_job, turn, game_over
+    poll_ai_turn()
+    return (ai_job is not job or ponder_job is not ponder
+            or turn != ply or game_over != over)
+
+
 running = True
 if __name__ == "__main__":
+    # Ensure the database exists before the login screen uses it
+    init_db()
+    # Fork the EXPERT worker pool while this is still the only thread
+    if AI_WORKERS > 1:
+        get_search_engine(AI_WORKERS, AI_TT_MB)
+    # Measure this machine's search speed once (cached) for the ladder,
+    # behind the first frames rather than before them
+    start_calibration()
+
+    events = []
+    changed = True              # draw the first frame
     while running:
-        clock.tick(60)
         mouse = pygame.mouse.get_pos()
 
-        for event in pygame.event.get():
+        for event in events:
+            if event_changes_frame(event):
+                changed = True
+
             if event.type == pygame.QUIT:
                 running = False
 
             if event.type == pygame.VIDEORESIZE:
                 scale_window(event.size)
 
+            if event.type == pygame.VIDEOEXPOSE:
+                invalidate_frame()      # the window was uncovered: repaint all of it
+
             # ---------- START MENU FIRST ----------
             if start_menu_active:
                 draw_start_menu()
@@ -1530,6 +2350,17 @@ if __name__ == "__main__":
                         player1_user = None
                         player2_user = "AI"
 
+                    elif menu_buttons["expert"].collidepoint(event.pos):
+                        pending_mode = "ai_expert"
+                        login_active = True
+                        start_menu_active = False
+                        login_message = ""
+                        login_username = ""
+                        login_password = ""
+                        login_stage = 1  # just one login (human)
+                        player1_user = None
+                        player2_user = "AI"
+
                     elif menu_buttons["replay"].collidepoint(event.pos):
                         start_menu_active = False
                         replay_select_active = True
@@ -1576,9 +2407,11 @@ if __name__ == "__main__":
 
                                 game_vs_ai = True
                                 if pending_mode == "ai_easy":
-                                    AI_DIFFICULTY = "EASY"
+                                    set_ai_level(EASY_LEVEL)
                                 elif pending_mode == "ai_hard":
-                                    AI_DIFFICULTY = "HARD"
+                                    set_ai_level(HARD_LEVEL)
+                                elif pending_mode == "ai_expert":
+                                    AI_DIFFICULTY = "EXPERT"
 
                                 reset_game()
 
@@ -1611,9 +2444,11 @@ if __name__ == "__main__":
 
                                 game_vs_ai = True
                                 if pending_mode == "ai_easy":
-                                    AI_DIFFICULTY = "EASY"
+                                    set_ai_level(EASY_LEVEL)
                                 elif pending_mode == "ai_hard":
-                                    AI_DIFFICULTY = "HARD"
+                                    set_ai_level(HARD_LEVEL)
+                                elif pending_mode == "ai_expert":
+                                    AI_DIFFICULTY = "EXPERT"
 
                                 reset_game()
 
@@ -1630,10 +2465,13 @@ if __name__ == "__main__":
                                 game_vs_ai = False
                             elif pending_mode == "ai_easy":
                                 game_vs_ai = True
-                                AI_DIFFICULTY = "EASY"
+                                set_ai_level(EASY_LEVEL)
                             elif pending_mode == "ai_hard":
                                 game_vs_ai = True
-                                AI_DIFFICULTY = "HARD"
+                                set_ai_level(HARD_LEVEL)
+                            elif pending_mode == "ai_expert":
+                                game_vs_ai = True
+                                AI_DIFFICULTY = "EXPERT"
 
                             reset_game()
 
@@ -1731,10 +2569,14 @@ if __name__ == "__main__":
                 if event.type == pygame.MOUSEBUTTONDOWN:
                     if menu_buttons["settings_close"].collidepoint(event.pos):
                         settings_menu_active = False
-                    elif menu_buttons["settings_easy"].collidepoint(event.pos):
-                        AI_DIFFICULTY = "EASY"
-                    elif menu_buttons["settings_hard"].collidepoint(event.pos):
-                        AI_DIFFICULTY = "HARD"
+                    elif menu_buttons["settings_level_down"].collidepoint(event.pos):
+                        set_ai_level(AI_LEVEL - 1)
+                    elif menu_buttons["settings_level_up"].collidepoint(event.pos):
+                        set_ai_level(AI_LEVEL + 1)
+                    elif menu_buttons["settings_level"].collidepoint(event.pos):
+                        set_ai_level(AI_LEVEL)
+                    elif menu_buttons["settings_expert"].collidepoint(event.pos):
+                        AI_DIFFICULTY = "EXPERT"
 
                 pygame.display.flip()
                 continue
@@ -1743,17 +2585,19 @@ if __name__ == "__main__":
             # NORMAL GAMEPLAY
             ########################################
 
-            btn_menu, btn_reset, btn_replay = draw_ui_buttons()
+            btn_menu, btn_reset, btn_replay = ui_button_rects()
 
             # Top buttons
             if event.type == pygame.MOUSEBUTTONDOWN:
                 if btn_menu.collidepoint(event.pos):
+                    cancel_ai_turn()
                     settings_menu_active = True
                     continue
                 if btn_reset.collidepoint(event.pos):
                     reset_game()
                     continue
                 if btn_replay.collidepoint(event.pos):
+                    cancel_ai_turn()
                     replay_select_active = True
                     continue
 
@@ -1766,19 +2610,17 @@ if __name__ == "__main__":
             ########################################
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 if not dragging:
-                    for p in board_state:
-                        if p.clicked(event.pos) and p.player == get_current_turn():
-                            forced = get_forced_jump_pieces(get_current_turn())
-                            if forced and p not in forced:
-                                break
-
+                    p = piece_at(*pixel_to_board(event.pos))
+                    ai_piece = game_vs_ai and p and p.player == AI_COLOR
+                    if p and p.player == get_current_turn() and not ai_piece:
+                        forced = get_move_cache()["forced"]
+                        if not forced or p in forced:
                             valid = get_valid_moves(p, only_jumps=bool(forced))
                             if valid:
                                 selected_piece = p
                                 valid_moves = valid
                                 dragging = True
                                 drag_origin = p.location
-                                break
 
             ########################################
             # DRAGGING A PIECE
@@ -1795,7 +2637,7 @@ if __name__ == "__main__":
                 if not selected_piece:
                     continue
 
-                sr, sc = pixel_to_board(drag_origin)
+                sr, sc = selected_piece.row, selected_piece.col
                 dr, dc = pixel_to_board(event.pos)
 
                 if (dr, dc) not in valid_moves:
@@ -1811,67 +2653,22 @@ if __name__ == "__main__":
                 selected_piece = None
                 valid_moves = []
 
-                # ---- AI RESPONSE TURN ----
-                if game_vs_ai and not game_over and get_current_turn() == AI_COLOR:
-                    if AI_DIFFICULTY == "EASY":
-                        ai = easy_AI(AI_COLOR)
-                    else:
-                        ai = hard_AI(AI_COLOR)
-                    apply_ai_move(ai)
+        # ---- AI TURN (searches in the background, applied when ready) ----
+        if update_ai():
+            changed = True
 
         ###############################################
-        # DRAW FRAME
+        # DRAW FRAME (only when something changed)
         ###############################################
-        screen.fill((0, 0, 0))
-
-        if login_active:
-            draw_login_screen()
-        elif start_menu_active:
-            draw_start_menu()
-        elif replay_select_active:
-            draw_replay_file_list()
-        elif replay_active:
-            draw_board()
-            draw_all_pieces()
-            draw_replay_controls()
+        if changed:
+            draw_frame()
+            loop_stats["frames"] += 1
 
-        else:
-            draw_board()
-            draw_all_pieces()
-            draw_ui_buttons()
-
-            # highlight valid moves
-            if selected_piece:
-                for r, c in valid_moves:
-                    pygame.draw.circle(screen, (255, 255, 0),
-                                       board_to_pixel(r, c), TILE_SIZE//6)
-
-            # highlight forced pieces
-            for p in get_forced_jump_pieces(get_current_turn()):
-                pygame.draw.circle(screen, (255, 255, 0),
-                                   p.location, p.radius + 5, 3)
-
-            # highlight selected
-            if selected_piece:
-                pygame.draw.circle(screen, (255, 0, 0),
-                                   selected_piece.location, selected_piece.radius + 5, 3)
-
-            # show settings menu on top
-            if settings_menu_active:
-                draw_settings_menu()
-
-            # game over
-            if game_over:
-                overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-                overlay.set_alpha(180)
-                overlay.fill((0, 0, 0))
-                screen.blit(overlay, (0, 0))
-
-                end_font = pygame.font.SysFont(None, int(60 * UI_SCALE))
-                text = end_font.render(f"Game Over — {game_winner} Wins!", True, (255, 255, 255))
-                screen.blit(text, (SCREEN_WIDTH//2 - text.get_width()//2,
-                                   SCREEN_HEIGHT//2 - text.get_height()//2))
-
-        pygame.display.flip()
+        # Sleep until the next event (see MAIN LOOP PACING)
+        events = next_events(changed)
+        changed = False
 
+    cancel_ai_turn()
+    close_search_engine()
+    save_sprite_cache()
     pygame.quit()
@@ -0,0 +1,526 @@
+# test_checkers.py
+# Tests for the headless rules package. No pygame mock needed.
+import random
+import subprocess
+import sys
+
+import pytest
+
+import checkers
+from checkers import WHITE, BLACK, Position, square_index as sq
+from checkers.perft import PERFT_POSITIONS, diagram_position, perft, divide
+
+
+class TestBitboardPosition:
+
+    def test_square_index_roundtrip(self):
+        for i in range(32):
+            r, c = checkers.square_coords(i)
+            assert (r + c) % 2 == 1
+            assert sq(r, c) == i
+
+    def test_initial_position_moves(self):
+        pos = Position.initial()
+        assert pos.count(WHITE) == 12
+        assert pos.count(BLACK) == 12
+        assert pos.jumpers(WHITE) == 0
+        # Only the front row can move: 4 pieces, 7 moves in total
+        assert bin(pos.movers(WHITE)).count("1") == 4
+        assert len(checkers.legal_moves(pos, WHITE)) == 7
+
+    def test_forced_jump_and_capture(self):
+        pos = Position.initial()
+        # Black man on d4 (row 4, col 3) in front of White's c3 / e3
+        pos.black |= 1 << sq(4, 3)
+        assert pos.jumpers(WHITE) == (1 << sq(5, 2)) | (1 << sq(5, 4))
+        assert pos.targets(sq(5, 2), only_jumps=True) == [sq(3, 4)]
+        assert all(abs(src - dst) in (7, 9) for src, dst in checkers.legal_moves(pos, WHITE))
+
+        captured = pos.move(sq(5, 2), sq(3, 4))
+        assert captured == sq(4, 3)
+        assert pos.color_at(sq(4, 3)) is None
+        assert pos.color_at(sq(3, 4)) == WHITE
+
+    def test_promotion_on_far_row(self):
+        pos = Position(white=1 << sq(1, 2), black=1 << sq(7, 0))
+        pos.move(sq(1, 2), sq(0, 1))
+        assert pos.is_king(sq(0, 1))
+        # A king keeps its crown when it moves off the back row
+        pos.move(sq(0, 1), sq(1, 0))
+        assert pos.is_king(sq(1, 0))
+        assert pos.kings == 1 << sq(1, 0)
+
+    def test_winner(self):
+        assert checkers.winner(Position.initial(), WHITE) is None
+        assert checkers.winner(Position(white=1), BLACK) == "White"
+        # Black man on a1's row cannot move down any further: no moves left
+        blocked = Position(white=1 << sq(0, 1), black=1 << sq(7, 0))
+        assert checkers.winner(blocked, BLACK) == "White"
+
+
+class TestMoveGeneration:
+
+    def test_crowning_ends_the_capture_chain(self):
+        # b6xd8 crowns; the new king may not go on to take e7
+        pos = Position(white=1 << sq(2, 1), black=(1 << sq(1, 2)) | (1 << sq(1, 4)))
+        move, = checkers.generate_moves(pos, WHITE)
+        assert move.path == (sq(2, 1), sq(0, 3))
+        assert move.captured == 1 << sq(1, 2)
+
+    def test_duplicate_chains_are_one_move(self):
+        # A king can go round a ring of four men either way
+        ring = [(3, 2), (3, 4), (5, 2), (5, 4)]
+        pos = Position(white=1 << sq(2, 3), black=sum(1 << sq(r, c) for r, c in ring),
+                       kings=1 << sq(2, 3))
+        move, = checkers.generate_moves(pos, WHITE)
+        assert move.src == move.dst == sq(2, 3)
+        assert move.captured == pos.black
+
+    def test_replay_validation_stops_at_illegal_move(self):
+        moves = ["c3-d4", "f6-e5", "d4xf6", "g7xe5", "e3-d4", "a1-b2"]
+        turns = checkers.replay_turns(moves)
+        assert [m.path for m in turns[2:4]] == [(sq(4, 3), sq(2, 5)), (sq(1, 6), sq(3, 4))]
+        assert len(turns) == 5          # a1-b2 is not a legal reply
+
+    def test_replay_saved_before_crowning_ended_the_turn(self):
+        # Black's a5xc3xe1 crowns on e1, and the old rule let it take f2 too
+        moves = ["c3-d4", "d6-e5", "g3-h4", "e5xc3", "d2xb4",
+                 "b6-a5", "e1-d2", "a5xc3", "c3xe1", "e1xg3"]
+        turns = checkers.replay_turns(moves)
+        assert turns[-1].path == (sq(3, 0), sq(5, 2), sq(7, 4))
+        old_turns = checkers.replay_turns(moves, crowning_ends_turn=False)
+        assert old_turns[-1].path == (sq(3, 0), sq(5, 2), sq(7, 4), sq(5, 6))
+        assert checkers.replay_hops(moves) == len(moves)
+
+
+class TestNotationAndReplay:
+
+    def test_move_notation_roundtrip(self):
+        assert checkers.format_move(5, 2, 4, 3, False) == "c3-d4"
+        assert checkers.format_move(5, 2, 3, 4, True) == "c3xe5"
+        assert checkers.parse_move_token("c3xe5") == (5, 2, 3, 4)
+
+    @pytest.mark.parametrize("entry", [
+        "a3-b4",
+        {"turn": 0, "piece_color": "W", "move": "a3-b4", "king": False},
+        {"start": [5, 0], "end": [4, 1]},
+    ])
+    def test_replay_entry_formats(self, entry):
+        pos = Position.initial()
+        assert checkers.apply_move_entry(pos, entry)
+        assert pos.color_at(sq(4, 1)) == WHITE
+        assert pos.color_at(sq(5, 0)) is None
+
+    def test_bad_replay_entry_is_skipped(self):
+        pos = Position.initial()
+        assert not checkers.apply_move_entry(pos, {"winner": "White"})
+        assert not checkers.apply_move_entry(pos, "d4-e5")     # empty source
+        assert pos == Position.initial()
+
+
+class TestAlphaBetaSearch:
+
+    def test_does_not_hang_a_piece(self):
+        # c3-d4 walks into e5xc3; c3-b4 and a1-b2 are safe
+        pos = Position(white=(1 << sq(5, 2)) | (1 << sq(7, 0)),
+                       black=(1 << sq(3, 4)) | (1 << sq(0, 7)))
+        info = checkers.AlphaBetaSearch().search(pos, WHITE, time_ms=2000, max_depth=4)
+        assert info["depth"] == 4
+        assert info["move"].path != (sq(5, 2), sq(4, 3))
+
+    def test_quiescence_sees_the_recapture_past_the_horizon(self):
+        # At depth 1 the reply e5xc3 is beyond the horizon unless the
+        # leaf's forced capture is searched
+        pos = Position(white=(1 << sq(5, 2)) | (1 << sq(7, 0)),
+                       black=(1 << sq(3, 4)) | (1 << sq(0, 7)))
+        hang = (sq(5, 2), sq(4, 3))
+        blind = checkers.AlphaBetaSearch(quiescence_nodes=0).search(pos, WHITE, max_depth=1)
+        info = checkers.AlphaBetaSearch().search(pos, WHITE, max_depth=1)
+        assert blind["move"].path == hang and blind["qnodes"] == 0
+        assert info["move"].path != hang and info["qnodes"] > 0
+
+    def test_takes_the_last_piece(self):
+        pos = Position(white=1 << sq(5, 2), black=1 << sq(4, 3))
+        info = checkers.AlphaBetaSearch().search(pos, WHITE, time_ms=1000)
+        assert info["move"].path == (sq(5, 2), sq(3, 4))
+
+    def test_respects_time_budget(self):
+        info = checkers.AlphaBetaSearch().search(Position.initial(), WHITE, time_ms=50)
+        assert info["move"] in checkers.generate_moves(Position.initial(), WHITE)
+        assert info["depth"] >= 1
+        assert info["time_ms"] < 500
+
+    def test_parallel_root_split_matches_serial_score(self):
+        from checkers.parallel import ParallelSearch
+        pos = Position.initial()
+        serial = checkers.AlphaBetaSearch(tt_mb=0).search(pos, WHITE, time_ms=10 ** 6,
+                                                          max_depth=4)
+        engine = ParallelSearch(workers=2, tt_mb=0)
+        try:
+            info = engine.search(pos, WHITE, time_ms=10 ** 6, max_depth=4)
+            again = engine.search(pos, WHITE, time_ms=10 ** 6, max_depth=4)
+        finally:
+            engine.close()
+        assert info["workers"] == 2
+        assert (info["depth"], info["score"]) == (serial["depth"], serial["score"])
+        assert again["score"] == info["score"]      # pool reused across searches
+
+    def test_move_ordering_same_score_fewer_nodes(self):
+        import bench
+        plain = ordered = 0
+        for pos, color in bench.search_positions(4):
+            a = checkers.AlphaBetaSearch(tt_mb=0, ordering=False).search(
+                pos, color, time_ms=10 ** 6, max_depth=5)
+            b = checkers.AlphaBetaSearch(tt_mb=0).search(pos, color, time_ms=10 ** 6, max_depth=5)
+            assert a["score"] == b["score"]
+            plain += a["nodes"]
+            ordered += b["nodes"]
+            assert 0 < b["ordering"]["first_move_cutoffs"] <= b["ordering"]["cutoffs"]
+        assert ordered < plain
+
+    def test_merge_compares_at_common_depth(self):
+        from checkers.parallel import merge_root_results
+        a = {"iterations": [(1, 10, "a1"), (2, 5, "a2"), (3, 50, "a3")]}
+        b = {"iterations": [(1, 0, "b1"), (2, 8, "b2")]}
+        assert merge_root_results([a, b]) == ("b2", 8, 2)
+        win = {"iterations": [(1, checkers.search.WIN_SCORE - 3, "w")]}
+        assert merge_root_results([a, b, win])[0] == "w"
+
+
+class TestDifficultyLadder:
+
+    def test_node_budget_caps_search_after_first_iteration(self):
+        info = checkers.AlphaBetaSearch().search(Position.initial(), WHITE, time_ms=10 ** 6,
+                                                 max_nodes=300)
+        assert info["depth"] >= 1 and info["nodes"] <= 300
+        # A budget smaller than depth 1 still gets a searched move
+        info = checkers.AlphaBetaSearch().search(Position.initial(), WHITE, max_nodes=1)
+        assert info["depth"] == 1
+
+    def test_levels_do_not_depend_on_time(self):
+        from checkers.players import LadderPlayer
+
+        def moves(time_ms):
+            player = LadderPlayer(seed=3, level=5, time_ms=time_ms)
+            player.new_game(3)
+            pos, color, played = Position.initial(), WHITE, []
+            for _ in range(8):
+                move = player.choose(pos, color)
+                pos.play(move.path)
+                played.append(move.path)
+                color = checkers.opponent(color)
+            return played
+
+        assert moves(5000) == moves(60000)
+
+    def test_calibration_is_cached_per_machine(self, tmp_path, monkeypatch):
+        from checkers import ladder
+        path = str(tmp_path / "calibration.json")
+        measured = []
+        monkeypatch.setattr(ladder, "measure_nodes_per_second",
+                            lambda: measured.append(1) or 25000.0)
+        assert ladder.calibrate(path) == 25000.0
+        assert ladder.calibrate(path) == 25000
+        assert len(measured) == 1
+        monkeypatch.setattr(ladder, "_machine", lambda: "elsewhere")
+        ladder.calibrate(path)
+        assert len(measured) == 2
+        assert ladder.level_time_ms(10, 40000) == 1000.0 * ladder.LEVELS[10][0] / 40000
+
+
+class TestMakeUnmake:
+
+    def test_random_sequences_restore_bit_identical(self):
+        rng = random.Random(11)
+        for _ in range(300):
+            pos, color = Position.initial(), WHITE
+            # Wander into a random middlegame/endgame first
+            for _ in range(rng.randrange(0, 80)):
+                moves = checkers.legal_moves(pos, color)
+                if not moves:
+                    break
+                pos.move(*rng.choice(moves))
+                color = checkers.opponent(color)
+
+            before = (pos.white, pos.black, pos.kings, pos.hash)
+            undo = []
+            for _ in range(rng.randrange(1, 40)):
+                moves = checkers.legal_moves(pos, color)
+                if not moves:
+                    break
+                move = rng.choice(moves)
+                undo.append((move, pos.make_move(*move)))
+                assert pos.hash == checkers.hash_masks(pos.white, pos.black, pos.kings)
+                color = checkers.opponent(color)
+            for (src, dst), token in reversed(undo):
+                pos.unmake_move(src, dst, token)
+            assert (pos.white, pos.black, pos.kings, pos.hash) == before
+
+    def test_unmake_promotion_and_king_capture(self):
+        # White man on d6 jumps the black king on c7 and promotes on b8
+        pos = Position(white=1 << sq(2, 3), black=1 << sq(1, 2), kings=1 << sq(1, 2))
+        before = pos.copy()
+        token = pos.make_move(sq(2, 3), sq(0, 1))
+        assert pos.is_king(sq(0, 1)) and pos.black == 0
+        pos.unmake_move(sq(2, 3), sq(0, 1), token)
+        assert pos == before and pos.hash == before.hash
+
+
+class TestHashingAndTranspositionTable:
+
+    def test_incremental_hash_matches_full_hash(self):
+        rng = random.Random(7)
+        for _ in range(50):
+            pos, color = Position.initial(), WHITE
+            for _ in range(120):
+                moves = checkers.legal_moves(pos, color)
+                if not moves:
+                    break
+                pos.move(*rng.choice(moves))
+                color = checkers.opponent(color)
+                assert pos.hash == checkers.hash_masks(pos.white, pos.black, pos.kings)
+
+    def test_store_probe_and_replacement(self):
+        from checkers.ttable import EXACT, LOWER
+        tt = checkers.TranspositionTable(size_mb=0.001)
+        key = 12345
+        tt.store(key, 6, -42, EXACT, (21, 17, 0x1234))
+        assert tt.probe(key) == (6, -42, EXACT, (21, 17, 0x1234))
+
+        # A shallower entry for another key in the same bucket goes to the
+        # always-replace slot and leaves the deep one alone
+        other = key + tt.buckets
+        tt.store(other, 2, 99, LOWER, None)
+        assert tt.probe(key) == (6, -42, EXACT, (21, 17, 0x1234))
+        assert tt.probe(other) == (2, 99, LOWER, None)
+        assert tt.fill() == 2 / tt.slots
+
+    def test_table_move_tells_same_ends_chains_apart(self):
+        from checkers.search import move_key, _tt_move_first
+        from checkers.ttable import EXACT
+        rows, color, _ = PERFT_POSITIONS["multi-jump"]
+        moves = checkers.generate_moves(diagram_position(rows), color)
+        # The king has pairs of chains from and to the same squares
+        ends = [(m.src, m.dst) for m in moves]
+        twins = [m for m in moves if ends.count((m.src, m.dst)) > 1]
+        assert len(twins) == 6
+        assert len({move_key(m) for m in twins}) == 6
+
+        tt = checkers.TranspositionTable(size_mb=0.001)
+        for move in twins:
+            tt.store(99, 3, 0, EXACT, move_key(move))
+            ordered = list(reversed(moves))
+            _tt_move_first(ordered, tt.probe(99)[3])
+            assert ordered[0] is move
+
+    def test_analysis_reused_between_moves(self):
+        engine = checkers.AlphaBetaSearch(tt_mb=4)
+        first = engine.search(Position.initial(), WHITE, time_ms=5000, max_depth=6)
+        again = engine.search(Position.initial(), WHITE, time_ms=5000, max_depth=6)
+        assert again["move"] == first["move"]
+        assert again["nodes"] < first["nodes"]
+        assert again["tt"]["hit_rate"] > 0
+
+
+class TestOpeningBook:
+
+    @staticmethod
+    def random_record(rng, winner):
+        """A replay record in save_game_record's format from random legal play."""
+        pos, color, moves = Position.initial(), WHITE, []
+        for _ in range(12):
+            legal = checkers.generate_moves(pos, color)
+            if not legal:
+                break
+            move = rng.choice(legal)
+            for src, dst in move.hops():
+                sr, sc = checkers.square_coords(src)
+                dr, dc = checkers.square_coords(dst)
+                moves.append({"move": checkers.format_move(sr, sc, dr, dc, bool(move.captured))})
+            pos.play(move.path)
+            color = checkers.opponent(color)
+        return {"moves": moves, "winner": winner}
+
+    def test_compile_and_probe(self, tmp_path):
+        from checkers import book
+        rng = random.Random(3)
+        records = [self.random_record(rng, rng.choice(["White", "Black"])) for _ in range(20)]
+        games = [(checkers.replay_turns(r["moves"]), r["winner"]) for r in records]
+        assert all(len(turns) == 12 for turns, _ in games)
+
+        path = str(tmp_path / "book.bin")
+        n = book.compile_book(games, path, max_plies=8)
+        opening = book.OpeningBook(path)
+        try:
+            assert opening.entries == n
+            white, black, draws = opening.probe(Position.initial(), WHITE)
+            assert (white + black, draws) == (20, 0)
+            move = opening.choose_move(Position.initial(), WHITE)
+            assert move in checkers.generate_moves(Position.initial(), WHITE)
+            assert opening.probe(Position(), BLACK) is None
+        finally:
+            opening.close()
+
+    def test_pdn_import(self):
+        from checkers import book
+        text = '[Event "x"]\n[Result "1-0"]\n1. 11-15 23-19 2. 8-11 22-17 {note} 1-0\n'
+        (turns, winner), = book.pdn_games(text)
+        assert winner == "White"
+        assert turns[0].path == (sq(5, 2), sq(4, 3))       # c3-d4
+        assert len(turns) == 4
+
+
+@pytest.fixture(scope="module")
+def tables(tmp_path_factory):
+    """A generated and packed two-piece tablebase."""
+    from checkers import tablebase
+    work = tmp_path_factory.mktemp("tb")
+    tablebase.generate(2, str(work / "slices"), log=lambda msg: None)
+    tablebase.pack(str(work / "slices"), str(work / "tb.bin"), 2)
+    tb = tablebase.Tablebase(str(work / "tb.bin"))
+    yield tablebase, tb, work
+    tb.close()
+
+
+class TestTablebase:
+
+    def test_legal_turns_play_out_multi_jumps(self):
+        pos = Position(white=1 << sq(7, 0), black=(1 << sq(6, 1)) | (1 << sq(4, 3)))
+        (move, child), = checkers.legal_turns(pos, WHITE)
+        assert move.path == (sq(7, 0), sq(5, 2), sq(3, 4))
+        assert not child.black
+
+    def test_values_agree_with_one_ply_lookahead(self, tables):
+        tablebase, tb, _ = tables
+        for sig in tablebase.slice_signatures(2):
+            for pos in tablebase.slice_positions(sig):
+                for color in (WHITE, BLACK):
+                    replies = [tb.probe(child, checkers.opponent(color))
+                               for _, child in checkers.rules.legal_turns(pos, color)]
+                    losses = [d for outcome, d in replies if outcome == tablebase.LOSS]
+                    if losses:
+                        expected = (tablebase.WIN, min(losses) + 1)
+                    elif all(outcome == tablebase.WIN for outcome, _ in replies):
+                        expected = (tablebase.LOSS, max([d for _, d in replies], default=-1) + 1)
+                    else:
+                        expected = (tablebase.DRAW, 0)
+                    assert tb.probe(pos, color) == expected
+
+    def test_resume_skips_solved_slices_and_search_uses_table(self, tables):
+        tablebase, tb, work = tables
+        logged = []
+        tablebase.generate(2, str(work / "slices"), log=logged.append)
+        assert logged == []
+
+        # King next to a man it can take: the table knows it wins at once
+        pos = Position(white=1 << sq(5, 2), black=1 << sq(4, 3), kings=1 << sq(5, 2))
+        assert tb.probe(pos, WHITE) == (tablebase.WIN, 1)
+        assert tb.best_turn(pos, WHITE).path == (sq(5, 2), sq(3, 4))
+        info = checkers.AlphaBetaSearch(tablebase=tb).search(pos, WHITE, time_ms=1000)
+        assert info["move"].path == (sq(5, 2), sq(3, 4))
+
+
+class TestBatchEvaluation:
+
+    def positions(self):
+        from checkers.players import RandomPlayer
+        from checkers.selfplay import play_game
+        rng = random.Random(5)
+        positions = []
+        for record in (play_game(RandomPlayer(), RandomPlayer(), seed=seed) for seed in range(3)):
+            pos = Position.initial()
+            for move in checkers.replay_turns(record["moves"]):
+                pos.play(move.path)
+                positions.append((pos.copy(), rng.choice((WHITE, BLACK))))
+        return positions
+
+    def test_piece_square_tables_match_evaluate(self):
+        from checkers.evaluate import WHITE_MAN_WEIGHTS, BLACK_MAN_WEIGHTS, KING_WEIGHTS
+        for pos, color in self.positions():
+            kings = pos.kings
+            score = sum(WHITE_MAN_WEIGHTS[s] for s in checkers.iter_squares(pos.white & ~kings))
+            score += sum(KING_WEIGHTS[s] for s in checkers.iter_squares(pos.white & kings))
+            score -= sum(BLACK_MAN_WEIGHTS[s] for s in checkers.iter_squares(pos.black & ~kings))
+            score -= sum(KING_WEIGHTS[s] for s in checkers.iter_squares(pos.black & kings))
+            assert (score if color == WHITE else -score) == checkers.evaluate(pos, color)
+
+    def test_batch_matches_scalar(self):
+        pytest.importorskip("numpy")
+        from checkers.batch_eval import evaluate_batch, game_scores
+        from checkers.players import RandomPlayer
+        from checkers.selfplay import play_game
+        positions = self.positions()
+        scores = evaluate_batch([p for p, _ in positions], [c for _, c in positions])
+        assert list(scores) == [checkers.evaluate(p, c) for p, c in positions]
+        assert list(evaluate_batch([Position.initial()], BLACK)) == [0]
+        assert len(evaluate_batch([], WHITE)) == 0
+
+        record = play_game(RandomPlayer(), RandomPlayer(), seed=9)
+        turns = checkers.replay_turns(record["moves"])
+        assert len(game_scores(turns)) == len(turns) + 1
+
+
+class TestPerft:
+
+    @pytest.mark.parametrize("name", sorted(PERFT_POSITIONS))
+    def test_known_counts(self, name):
+        rows, color, known = PERFT_POSITIONS[name]
+        pos = diagram_position(rows)
+        before = pos.copy()
+        for depth, expected in enumerate(known[:6], start=1):
+            assert perft(pos, color, depth) == expected
+        assert pos == before and pos.hash == before.hash
+
+    def test_divide_sums_to_perft(self):
+        rows, color, _ = PERFT_POSITIONS["multi-jump"]
+        pos = diagram_position(rows)
+        split = divide(pos, color, 4)
+        assert sum(n for _, n in split) == perft(pos, color, 4)
+        # The king's circular chain returns through its own square
+        assert any(move.path[0] in move.path[1:] for move, _ in split)
+
+
+class TestSelfPlay:
+
+    def test_records_replay_and_colours_alternate(self, tmp_path):
+        from checkers import players, selfplay
+        easy, hard = players.make_player("easy"), players.make_player("hard")
+        records, summary = selfplay.run_match(easy, hard, games=4, seed=7, max_plies=60)
+
+        assert [r["players"]["white"] for r in records] == ["easy", "hard", "easy", "hard"]
+        for name in ("easy", "hard"):
+            assert sum(summary["players"][name].values()) == 4
+        assert summary["average_plies"] == sum(map(selfplay.record_plies, records)) / 4
+
+        path = str(tmp_path / "replays.json")
+        checkers.replay.append_game_records(records, path)
+        for record in checkers.load_replay_list(path):
+            assert record["winner"] in ("White", "Black", "Draw")
+            assert set(record["moves"][0]) == {"turn", "piece_color", "move", "king"}
+            # Every recorded hop is legal and the game ends where the record says
+            assert len(checkers.replay_turns(record["moves"])) == selfplay.record_plies(record)
+
+    def test_same_seed_same_games(self):
+        from checkers import players, selfplay
+
+        def moves(seed):
+            records, _ = selfplay.run_match(players.make_player("easy"), players.make_player("easy"),
+                                            games=2, seed=seed, max_plies=40)
+            return [[m["move"] for m in r["moves"]] for r in records]
+
+        assert moves(3) == moves(3)
+        assert moves(3) != moves(4)
+
+    def test_make_player_spec(self):
+        from checkers import players
+        player = players.make_player("expert:time_ms=20,max_depth=2")
+        assert (player.time_ms, player.max_depth) == (20, 2)
+        with pytest.raises(ValueError):
+            players.make_player("nobody")
+
+
+def test_import_is_headless():
+    code = ("import sys, checkers; "
+            "bad = [m for m in ('pygame', 'sqlite3') if m in sys.modules]; "
+            "sys.exit(1 if bad else 0)")
+    assert subprocess.run([sys.executable, "-c", code]).returncode == 0
@@ -1,7 +1,9 @@
 # test_game.py
 import sys
 import json
+import time
 import pytest
+from collections import OrderedDict
 from unittest.mock import MagicMock, patch, mock_open
 
 # -----------------------------
@@ -10,6 +12,9 @@ from unittest.mock import MagicMock, patch, mock_open
 
 class MockPygame:
     RESIZABLE = 10
+    NOEVENT = 0
+    MOUSEMOTION = 4
+    USEREVENT = 24
     K_BACKSPACE = 8
     K_RETURN = 13
 
@@ -40,11 +45,16 @@ class MockPygame:
         def load(file):
             surf = MagicMock()
             surf.convert_alpha.return_value = surf
+            surf.get_size.return_value = (428, 507)
             return surf
 
     class transform:
         @staticmethod
-        def smoothscale(surface, size): return MagicMock()
+        def smoothscale(surface, size):
+            surf = MagicMock()
+            surf.get_size.return_value = size
+            surf.source = surface
+            return surf
 
     class time:
         @staticmethod
@@ -72,6 +82,13 @@ class MockPygame:
         def get():
             return []
 
+        @staticmethod
+        def post(event): pass
+
+        @staticmethod
+        def Event(type, **attrs):
+            return MagicMock(type=type, **attrs)
+
     @staticmethod
     def Rect(*args):
         rect = MagicMock()
@@ -214,6 +231,129 @@ class TestPenguinCheckers:
 
         assert game_module.turn == initial_turn + 1
 
+    def test_expert_ai_move_advances_turn(self, clean_board):
+        game_module.reset_game()
+        ai = game_module.expert_AI(self.WHITE, time_ms=50)
+
+        game_module.apply_ai_move(ai)
+
+        assert game_module.turn == 1
+        assert ai.last_info["depth"] >= 1
+
+    # --- Background AI worker ---
+    def test_background_ai_turn_and_cancel(self, clean_board):
+        with patch.object(game_module, "game_vs_ai", True), \
+             patch.object(game_module, "AI_DIFFICULTY", "EXPERT"), \
+             patch.object(game_module, "AI_COLOR", self.BLACK), \
+             patch.object(game_module, "AI_TIME_BUDGET_MS", 50):
+            game_module.reset_game()
+            game_module.execute_move(game_module.piece_at(5, 2), 5, 2, 4, 3)
+
+            # First poll starts the search and returns straight away
+            game_module.poll_ai_turn()
+            assert game_module.ai_thinking()
+            assert game_module.turn == 1
+
+            game_module.ai_job["thread"].join(5)
+            game_module.poll_ai_turn()
+            assert not game_module.ai_thinking()
+            assert game_module.turn == 2
+
+            # Reset mid-search cancels and drops the job
+            game_module.execute_move(game_module.piece_at(5, 0), 5, 0, 4, 1)
+            game_module.poll_ai_turn()
+            job = game_module.ai_job
+            game_module.reset_game()
+            assert job["stop"].is_set()
+            assert not game_module.ai_thinking()
+            assert game_module.turn == 0
+
+    def test_ponder_hit_miss_and_cancel(self, clean_board):
+        def wait_for_prediction():
+            job = game_module.ponder_job
+            for _ in range(500):
+                if job["predicted"] is not None:
+                    return job
+                time.sleep(0.01)
+            raise AssertionError("ponder never predicted a reply")
+
+        def play_white(choose):
+            moves = game_module.generate_moves(game_module.position, self.WHITE)
+            move = choose(moves)
+            for src, dst in move.hops():
+                sr, sc = game_module.square_coords(src)
+                game_module.execute_move(game_module.piece_at(sr, sc), sr, sc,
+                                         *game_module.square_coords(dst))
+
+        def leads_to(target, hit):
+            def choose(moves):
+                for move in moves:
+                    child = game_module.position.copy()
+                    child.play(move.path)
+                    if (child == target) == hit:
+                        return move
+            return choose
+
+        with patch.object(game_module, "game_vs_ai", True), \
+             patch.object(game_module, "AI_DIFFICULTY", "EXPERT"), \
+             patch.object(game_module, "AI_COLOR", self.BLACK), \
+             patch.object(game_module, "AI_TIME_BUDGET_MS", 50):
+            game_module.reset_game()
+            stats = dict(game_module.ponder_stats)
+
+            # Human to move: the AI ponders its guess at the reply. A
+            # different reply stops the ponder and searches afresh
+            game_module.poll_ai_turn()
+            job = wait_for_prediction()
+            play_white(leads_to(job["predicted"], hit=False))
+            game_module.poll_ai_turn()
+            assert job["stop"].is_set()
+            assert game_module.ai_job is not job and game_module.ai_thinking()
+            assert game_module.ponder_stats["misses"] == stats["misses"] + 1
+            game_module.ai_job["thread"].join(5)
+            game_module.poll_ai_turn()
+            assert game_module.turn == 2
+
+            # The predicted reply keeps the ponder running as the AI's search
+            game_module.poll_ai_turn()
+            job = wait_for_prediction()
+            time.sleep(0.1)             # longer than the AI's budget
+            play_white(leads_to(job["predicted"], hit=True))
+            game_module.poll_ai_turn()
+            assert game_module.ai_job is job
+            assert game_module.ponder_stats["hits"] == stats["hits"] + 1
+            game_module.poll_ai_turn()  # past its deadline: told to stop
+            job["thread"].join(5)
+            game_module.poll_ai_turn()
+            assert game_module.turn == 4
+
+            # Reset cancels a running ponder
+            game_module.poll_ai_turn()
+            job = game_module.ponder_job
+            game_module.reset_game()
+            assert job["stop"].is_set()
+            assert game_module.ponder_job is None
+
+    def test_ladder_level_plays_in_background(self, clean_board):
+        with patch.object(game_module, "game_vs_ai", True), \
+             patch.object(game_module, "AI_DIFFICULTY", "EXPERT"), \
+             patch.object(game_module, "AI_LEVEL", 2), \
+             patch.object(game_module, "AI_COLOR", self.BLACK), \
+             patch.object(game_module, "nodes_per_second", 40000):
+            game_module.set_ai_level(99)
+            assert (game_module.AI_DIFFICULTY, game_module.AI_LEVEL) == ("LEVEL", 10)
+            game_module.set_ai_level(1)
+            game_module.reset_game()
+            game_module.execute_move(game_module.piece_at(5, 2), 5, 2, 4, 3)
+
+            game_module.poll_ai_turn()
+            ai = game_module.get_ai_player()
+            assert isinstance(ai, game_module.ladder_AI) and ai.level == 1
+            game_module.ai_job["thread"].join(5)
+            game_module.poll_ai_turn()
+            assert game_module.turn == 2
+            assert ai.player.last_info["nodes"] <= game_module.LadderPlayer(level=1).max_nodes
+
     # --- Game Record Save (replays.json style) ---
     def test_save_game_record(self, mock_filesystem, clean_board):
         # Prepare at least one logged move
@@ -258,3 +398,291 @@ class TestPenguinCheckers:
         moved_piece = game_module.piece_at(to_row, to_col)
         assert moved_piece is not None
         assert moved_piece == white_piece_orig
+
+    def test_replay_keeps_old_mid_chain_crowning(self, clean_board):
+        # Saved when a man crowned mid-capture kept jumping: a5xc3xe1xg3
+        moves = ["c3-d4", "d6-e5", "g3-h4", "e5xc3", "d2xb4",
+                 "b6-a5", "e1-d2", "a5xc3", "c3xe1", "e1xg3"]
+        game_module.start_replay({"moves": moves, "winner": "Black"})
+        assert game_module.replay_moves == moves
+
+    # --- Square index ---
+    def test_piece_grid_tracks_moves(self, clean_board):
+        game_module.reset_game()
+        piece = game_module.piece_at(5, 2)          # c3
+        assert piece is not None
+
+        # Dragging moves the sprite, not the square it occupies
+        piece.update_location((1, 1))
+        assert game_module.piece_at(5, 2) is piece
+        assert game_module.get_valid_moves(piece) == [(4, 1), (4, 3)]
+
+        game_module.execute_move(piece, 5, 2, 4, 3)
+        assert game_module.piece_at(5, 2) is None
+        assert game_module.piece_at(4, 3) is piece
+        assert (piece.row, piece.col) == (4, 3)
+
+    def test_every_route_of_a_chain_is_clickable(self, clean_board):
+        game_module.reset_game()
+        # A king can go round a ring of four men either way
+        ring = [(3, 2), (3, 4), (5, 2), (5, 4)]
+        sq = game_module.square_index
+        game_module.position = game_module.Position(
+            white=1 << sq(2, 3), black=sum(1 << sq(r, c) for r, c in ring),
+            kings=1 << sq(2, 3))
+        game_module.clear_piece_grid()
+        king = game_module.Checker(location=game_module.board_to_pixel(2, 3), status="king",
+                                   player=self.WHITE, direction=-1)
+        game_module.place_piece(king, 2, 3)
+
+        assert len(game_module.generate_moves(game_module.position, self.WHITE)) == 1
+        assert sorted(game_module.get_valid_moves(king, only_jumps=True)) == [(4, 1), (4, 5)]
+
+    # --- Legal move cache ---
+    def test_move_cache_recomputed_once_per_ply(self, clean_board):
+        game_module.reset_game()
+        stats = game_module.move_cache_stats
+        before = stats["recomputes"]
+
+        # Many frames on the same position: one recompute
+        for _ in range(60):
+            game_module.get_move_cache()
+        assert stats["recomputes"] == before + 1
+        assert len(game_module.get_move_cache()["moves"]) == 7
+
+        # execute_move invalidates; check_game_over refills it for the new ply
+        piece = game_module.piece_at(5, 2)
+        game_module.execute_move(piece, 5, 2, 4, 3)
+        for _ in range(60):
+            cache = game_module.get_move_cache()
+        assert stats["recomputes"] == before + 2
+        assert cache["color"] == self.BLACK
+
+
+    # --- Dirty-rectangle renderer ---
+    def test_dirty_regions_follow_changes(self, clean_board):
+        game_module.reset_game()
+        scene = game_module.board_scene()
+        assert game_module.dirty_regions(scene, game_module.board_scene()) == []
+
+        # Dragging repaints the piece's old and new area, merged into one rect
+        piece = game_module.piece_at(5, 2)
+        old = game_module.piece_bounds(piece.location)
+        x, y = piece.location
+        piece.update_location((x + 10, y - 10))
+        rects = game_module.dirty_regions(scene, game_module.board_scene())
+        assert len(rects) == 1
+        rx, ry, rw, rh = rects[0]
+        assert rx == old[0] and ry == old[1] - 10
+        assert rw == old[2] + 10 and rh == old[3] + 10
+
+        # A move changes the turn (top bar) and two neighbouring squares
+        piece.update_location((x, y))
+        game_module.execute_move(piece, 5, 2, 4, 3)
+        rects = game_module.dirty_regions(scene, game_module.board_scene())
+        bar = (0, 0, game_module.SCREEN_WIDTH, game_module.UI_SPACE_HEIGHT)
+        assert bar in rects and len(rects) == 2
+        board = next(r for r in rects if r != bar)
+        for bounds in (old, game_module.piece_bounds(piece.location)):
+            assert game_module.merge_rects([board, bounds]) == [board]
+
+    # --- Pre-rendered board background ---
+    def test_board_background_rebuilt_only_on_resize(self, clean_board, monkeypatch):
+        for name in ("SCREEN_WIDTH", "SCREEN_HEIGHT", "TILE_SIZE", "BOARD_SIZE",
+                     "BOARD_OFFSET_X", "UI_SPACE_HEIGHT", "UI_SCALE", "MENU_SCALE", "screen"):
+            monkeypatch.setattr(game_module, name, getattr(game_module, name))
+        game_module.reset_game()
+        game_module.get_board_background()
+        builds = game_module.background_stats["builds"]
+
+        for _ in range(30):
+            game_module.draw_board()
+            game_module.draw_ui_buttons()
+            game_module.repaint((0, 0, 100, 100))
+        assert game_module.background_stats["builds"] == builds
+
+        game_module.scale_window((640, 700))
+        game_module.draw_board()
+        game_module.draw_board()
+        assert game_module.background_stats["builds"] == builds + 1
+        game_module.invalidate_board_background()
+
+    # --- Font and text caches ---
+    def test_font_and_text_caches(self, monkeypatch):
+        game_module.clear_text_caches()
+        stats = game_module.text_cache_stats
+        fonts, renders = stats["fonts"], stats["renders"]
+
+        font = game_module.get_font(36)
+        assert game_module.get_font(36) is font
+        label = game_module.render_text(font, "Menu", True, (255, 255, 255))
+        for _ in range(10):
+            assert game_module.render_text(font, "Menu", True, (255, 255, 255)) is label
+        assert (stats["fonts"], stats["renders"]) == (fonts + 1, renders + 1)
+
+        # Least recently used labels are dropped first
+        monkeypatch.setattr(game_module, "TEXT_CACHE_SIZE", 3)
+        for text in ("a", "b", "c", "a", "d"):
+            game_module.render_text(font, text, True, (0, 0, 0))
+        keys = [key[1] for key in game_module.text_cache]
+        assert keys == ["c", "a", "d"]
+
+        game_module.clear_text_caches()
+        assert game_module.get_font(36) is not font
+
+    # --- Penguin sprite cache ---
+    def test_sprite_mips_and_size_cache(self, monkeypatch):
+        monkeypatch.setattr(game_module, "SPRITE_CACHE_DIR", None)
+        levels = game_module.get_sprite_mips("black")
+        assert game_module.get_sprite_mips("black") is levels
+        assert [level.get_size() for level in levels] == \
+            [(428, 507), (214, 253), (107, 126), (53, 63)]
+
+        # Scaled from the smallest level at least as big as the sprite
+        assert game_module.scale_sprite("black", 90).source is levels[2]
+        assert game_module.scale_sprite("black", 200).source is levels[1]
+        assert game_module.scale_sprite("black", 600).source is levels[0]
+        assert game_module.scale_sprite("black", 20).source is levels[3]
+
+        game_module.sprite_cache.clear()
+        stats = game_module.sprite_stats
+        scaled = stats["scaled"]
+        sprites = game_module.get_penguin_sprites(70)
+        assert sprites["white_king"].get_size() == (70, 70)
+        for size in (60, 70, 80, 70):
+            game_module.get_penguin_sprites(size)
+        assert stats["scaled"] == scaled + 3 * 4
+        assert game_module.get_penguin_sprites(70) is sprites
+        assert list(game_module.sprite_cache) == [60, 80, 70]
+
+    def test_undecodable_sprites_fall_back_to_circles(self, monkeypatch):
+        def broken_load(file):
+            raise RuntimeError("unsupported image format")
+
+        monkeypatch.setattr(game_module.pygame, "error", RuntimeError, raising=False)
+        monkeypatch.setattr(game_module.pygame.image, "load", broken_load)
+        monkeypatch.setattr(game_module, "SPRITE_CACHE_DIR", None)
+        for name, value in (("sprite_hashes", dict(game_module.sprite_hashes)),
+                            ("sprite_mips", {}), ("sprite_cache", OrderedDict())):
+            monkeypatch.setattr(game_module, name, value)
+        for name in ("BLACK_PENGUIN", "WHITE_PENGUIN", "BLACK_PENGUIN_KING", "WHITE_PENGUIN_KING"):
+            monkeypatch.setattr(game_module, name, getattr(game_module, name))
+
+        game_module.rescale_penguin_images()
+        assert game_module.BLACK_PENGUIN is None and game_module.WHITE_PENGUIN_KING is None
+        assert game_module.sprite_hashes == {}
+        game_module.rescale_penguin_images()        # a later resize stays on circles
+        assert game_module.BLACK_PENGUIN is None
+
+    # --- Event-driven main loop ---
+    def test_loop_sleeps_unless_busy(self, clean_board, monkeypatch):
+        waits = []
+
+        def wait(timeout):
+            waits.append(timeout)
+            return MagicMock(type=MockPygame.NOEVENT)
+
+        monkeypatch.setattr(game_module.pygame.event, "wait", wait, raising=False)
+        game_module.reset_game()
+
+        # Idle: one long sleep, no events
+        assert game_module.next_events(False) == []
+        assert waits == [game_module.IDLE_WAKE_MS]
+
+        # Right after a change, or while dragging: capped frame rate, no sleep
+        game_module.next_events(True)
+        monkeypatch.setattr(game_module, "dragging", True)
+        game_module.next_events(False)
+        assert len(waits) == 1
+
+        # While the AI searches: short sleeps to pick up its move
+        monkeypatch.setattr(game_module, "dragging", False)
+        monkeypatch.setattr(game_module, "ai_job", {"stop": None})
+        game_module.next_events(False)
+        assert waits[-1] == game_module.AI_POLL_MS
+
+        # Mouse movement only matters while dragging
+        motion = MagicMock(type=MockPygame.MOUSEMOTION)
+        assert not game_module.event_changes_frame(motion)
+        assert game_module.event_changes_frame(MagicMock(type=MockPygame.event.MOUSEBUTTONDOWN))
+        monkeypatch.setattr(game_module, "dragging", True)
+        assert game_module.event_changes_frame(motion)
+
+    def test_update_ai_reports_moves(self, clean_board, monkeypatch):
+        monkeypatch.setattr(game_module, "game_vs_ai", True)
+        monkeypatch.setattr(game_module, "AI_DIFFICULTY", "EASY")
+        monkeypatch.setattr(game_module, "AI_PONDER", False)
+        for flag in ("login_active", "start_menu_active", "replay_select_active",
+                     "replay_active", "settings_menu_active"):
+            monkeypatch.setattr(game_module, flag, False)
+        game_module.reset_game()
+
+        # Human to move and nothing to ponder: nothing happens
+        assert not game_module.update_ai()
+        game_module.execute_move(game_module.piece_at(5, 2), 5, 2, 4, 3)
+        # The instant AI replies at once
+        assert game_module.update_ai()
+        assert game_module.turn == 2
+        assert not game_module.update_ai()
+
+        monkeypatch.setattr(game_module, "start_menu_active", True)
+        assert not game_module.update_ai()
+
+    def test_calibration_runs_in_background(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(game_module, "nodes_per_second", None)
+        monkeypatch.setattr(game_module, "calibration_thread", None)
+        monkeypatch.setattr(game_module, "AI_CALIBRATION_FILE", str(tmp_path / "cal.json"))
+        release = game_module.threading.Event()
+
+        def slow_calibrate(path):
+            release.wait(5)
+            return 12345.0
+
+        monkeypatch.setattr(game_module, "calibrate", slow_calibrate)
+        game_module.start_calibration()         # returns at once
+        assert game_module.calibration_thread.is_alive()
+        assert game_module.get_nodes_per_second() is None
+        release.set()
+        assert game_module.wait_nodes_per_second() == 12345.0
+        assert game_module.get_nodes_per_second() == 12345.0
+
+    def test_settings_menu_does_not_wait_for_calibration(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(game_module, "nodes_per_second", None)
+        monkeypatch.setattr(game_module, "calibration_thread", None)
+        monkeypatch.setattr(game_module, "AI_CALIBRATION_FILE", str(tmp_path / "cal.json"))
+        release = game_module.threading.Event()
+
+        def slow_calibrate(path):
+            release.wait(5)
+            return 12345.0
+
+        labels = []
+        render_text = game_module.render_text
+        monkeypatch.setattr(game_module, "calibrate", slow_calibrate)
+        monkeypatch.setattr(game_module, "render_text",
+                            lambda font, text, *args: labels.append(text) or render_text(font, text, *args))
+        try:
+            game_module.draw_settings_menu()    # first run: starts calibrating, returns at once
+            assert game_module.calibration_thread.is_alive()
+            assert "calibrating..." in labels
+        finally:
+            release.set()
+            game_module.calibration_thread.join()
+        labels.clear()
+        game_module.draw_settings_menu()
+        assert any(text.endswith("s per move") for text in labels)
+
+    def test_no_worker_pool_forked_beside_other_threads(self, monkeypatch):
+        monkeypatch.setattr(game_module, "search_engine", None)
+        monkeypatch.setattr(game_module, "search_engine_config", None)
+        release = game_module.threading.Event()
+        busy = game_module.threading.Thread(target=release.wait, args=(5,), daemon=True)
+        busy.start()
+        try:
+            engine = game_module.get_search_engine(2, 1)
+            assert isinstance(engine, game_module.AlphaBetaSearch)
+            assert game_module.get_search_engine(2, 1) is engine
+        finally:
+            release.set()
+            busy.join()
+            game_module.close_search_engine()